@@ -1,13 +1,63 @@
 from django.contrib import admin
+from django.db import transaction
+from .cache import bump_catalogue_version, invalidate_all_plants
 from .models import Plant, PlantLink, Nursery
 
 short_description = "Duplicate selected items"
 
+def _m2m_columns(model, name):
+    """
+    Return (through model, column for `model`, column for the other side)
+    for a forward or reverse many-to-many relation on `model`.
+    """
+    field = model._meta.get_field(name)
+    if field.many_to_many and not field.auto_created:
+        m2m, own, other = field, field.m2m_field_name(), field.m2m_reverse_field_name()
+    else:
+        # reverse side, e.g. Plant.links -> PlantLink.plant
+        m2m = field.field
+        own, other = m2m.m2m_reverse_field_name(), m2m.m2m_field_name()
+    through = m2m.remote_field.through
+    return (
+        through,
+        through._meta.get_field(own).attname,
+        through._meta.get_field(other).attname,
+    )
+
+def duplicate_objects(queryset, label_field, m2m_names=()):
+    """
+    Copy every object in `queryset` with one `bulk_create`, prefixing
+    `label_field` with "[COPY]", and copy the many-to-many links named in
+    `m2m_names` with one select + one insert per relation.
+
+    Returns the list of new objects.
+    """
+    model = queryset.model
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    originals = list(queryset)
+    copies = []
+    for obj in originals:
+        copy = model(**{field.attname: getattr(obj, field.attname) for field in fields})
+        setattr(copy, label_field, f"[COPY] {getattr(obj, label_field)}")
+        copies.append(copy)
+
+    with transaction.atomic():
+        model.objects.bulk_create(copies)
+        copy_pk = {obj.pk: copy.pk for obj, copy in zip(originals, copies)}
+        for name in m2m_names:
+            through, own, other = _m2m_columns(model, name)
+            rows = through.objects.filter(**{f'{own}__in': copy_pk}).values_list(own, other)
+            through.objects.bulk_create(
+                through(**{own: copy_pk[own_pk], other: other_pk}) for own_pk, other_pk in rows
+            )
+    return copies
+
 def duplicate_selected_plant(modeladmin, request, queryset):
-    for obj in queryset:
-        obj.pk = None  # Set primary key to None to create a new object
-        obj.name_common = f"[COPY] {obj.name_common}"
-        obj.save()
+    # Profile.plants is a user's own collection, so copies are not added to it
+    copies = duplicate_objects(queryset, 'name_common', ['links', 'nursery'])
+    # bulk_create skips post_save, so tell every worker to rebuild its indexes
+    bump_catalogue_version()
+    modeladmin.message_user(request, f"Duplicated {len(copies)} plant(s).")
 
 duplicate_selected_plant.short_description = short_description
 
@@ -15,10 +65,10 @@ class PlantAdmin(admin.ModelAdmin):
     actions = [duplicate_selected_plant]
 
 def duplicate_selected_link(modeladmin, request, queryset):
-    for obj in queryset:
-        obj.pk = None  # Set primary key to None to create a new object
-        obj.title = f"[COPY] {obj.title}"
-        obj.save()
+    copies = duplicate_objects(queryset, 'title', ['plant'])
+    # the copies now show up on their plants' pages
+    invalidate_all_plants()
+    modeladmin.message_user(request, f"Duplicated {len(copies)} link(s).")
 
 duplicate_selected_link.short_description = short_description
 
@@ -26,18 +76,17 @@ class PlantLinkAdmin(admin.ModelAdmin):
     actions = [duplicate_selected_link]
 
 def duplicate_selected_nursery(modeladmin, request, queryset):
-    for obj in queryset:
-        obj.pk = None  # Set primary key to None to create a new object
-        obj.title = f"[COPY] {obj.title}"
-        obj.save()
+    copies = duplicate_objects(queryset, 'name', ['plants'])
+    invalidate_all_plants()
+    modeladmin.message_user(request, f"Duplicated {len(copies)} nurseries.")
 
 duplicate_selected_nursery.short_description = short_description
 
 class NurseryAdmin(admin.ModelAdmin):
-    actions = [duplicate_selected_link]
+    actions = [duplicate_selected_nursery]
 
 # Register your models here.
 
 admin.site.register(Plant, PlantAdmin)
 admin.site.register(PlantLink, PlantLinkAdmin)
-admin.site.register(Nursery, NurseryAdmin)
\ No newline at end of file
+admin.site.register(Nursery, NurseryAdmin)
@@ -0,0 +1,124 @@
+"""
+Version-stamped cache of rendered plant detail fragments.
+
+Plant data changes rarely and is read constantly, so `PlantDetailView`
+renders the plant-specific part of the page once and serves it from the
+`plant_pages` cache (locmem, file-based or any other Django backend, see
+`CACHES` in config/settings.py) until the plant changes.
+
+Keys carry two version stamps instead of being deleted:
+    - a per-plant version, bumped by the signal receivers in `signals.py`
+      when the plant, its links or its nurseries change
+    - a catalogue-wide generation, bumped by bulk operations (imports,
+      admin duplicates) that bypass signals
+Old entries are never read again and simply age out of the backend.
+
+The stamps live in their own `plant_versions` cache, which never expires or
+culls entries, so evicting fragments cannot reset the counters they are
+checked against. A counter that is missing anyway (a cleared or restarted
+backend) is seeded from the clock instead of 0, so it never repeats a value
+a fragment or index was stamped with before.
+
+The same store holds the catalogue version: a counter bumped on every
+plant write (see `signals.py`) and by bulk operations. The in-process
+indexes (`search.py`, `traits.py`, `name_cache.py`) remember the version
+they were built at and rebuild when it moves, so a write in one worker
+process reaches the others. That needs a backend shared between the
+workers (file-based, memcached, redis); with the default locmem backend
+every worker only sees its own writes, which the `Plants.W001` deploy check
+(see `checks.py`) warns about.
+"""
+
+import time
+
+from django.core.cache import caches
+
+CACHE_ALIAS = 'plant_pages'
+VERSION_CACHE_ALIAS = 'plant_versions'
+GENERATION_KEY = 'plants:generation'
+CATALOGUE_KEY = 'plants:catalogue'
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _versions():
+    return caches[VERSION_CACHE_ALIAS]
+
+
+def _read_versions(*keys):
+    """Return the counters for `keys` (a list), seeding any that are missing."""
+    versions = _versions()
+    found = versions.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        seed = time.time_ns()
+        for key in missing:
+            # add() keeps a value another process seeded first
+            versions.add(key, seed, timeout=None)
+        found.update(versions.get_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+def _version_key(pk):
+    return f'plants:{pk}:version'
+
+
+def _fragment_key(pk, generation, version):
+    return f'plants:{pk}:detail:g{generation}:v{version}'
+
+
+def get_stamps(pk):
+    """
+    Return the (generation, version) stamps plant `pk` is cached under.
+
+    Read them before loading the plant and pass the same stamps to
+    `set_detail_fragment`: a save during rendering then bumps the version
+    past them, so the possibly stale fragment is never served.
+    """
+    return tuple(_read_versions(GENERATION_KEY, _version_key(pk)))
+
+
+def get_detail_fragment(pk, stamps=None):
+    """Return the cached detail fragment for plant `pk`, or None."""
+    return _cache().get(_fragment_key(pk, *(stamps or get_stamps(pk))))
+
+
+def set_detail_fragment(pk, html, stamps):
+    """Cache a fragment rendered from data read after `get_stamps(pk)`."""
+    _cache().set(_fragment_key(pk, *stamps), html)
+
+
+def _bump(key):
+    versions = _versions()
+    # add() is a no-op when the key exists, so incr() always has a value
+    versions.add(key, time.time_ns(), timeout=None)
+    try:
+        return versions.incr(key)
+    except ValueError:
+        # cleared between add() and incr()
+        seed = time.time_ns()
+        versions.set(key, seed, timeout=None)
+        return seed
+
+
+def invalidate_plants(pks):
+    """Make the cached fragments for the given plant pks stale."""
+    for pk in set(pks):
+        _bump(_version_key(pk))
+
+
+def invalidate_all_plants():
+    """Make every cached plant fragment stale, e.g. after a bulk import."""
+    _bump(GENERATION_KEY)
+
+
+def catalogue_version():
+    """Return the shared catalogue version."""
+    return _read_versions(CATALOGUE_KEY)[0]
+
+
+def bump_catalogue_version():
+    """Tell every worker that plant rows changed; returns the new version."""
+    return _bump(CATALOGUE_KEY)
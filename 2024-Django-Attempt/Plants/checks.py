@@ -0,0 +1,37 @@
+"""
+System checks for settings the Plants app relies on.
+"""
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from .cache import VERSION_CACHE_ALIAS
+
+# backends whose data is private to one process
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_version_cache(app_configs, **kwargs):
+    """
+    Warn (under `manage.py check --deploy`) when the catalogue version is not
+    shared between worker processes.
+
+    The in-process search/trait/name indexes only see another worker's writes
+    through the `plant_versions` cache (see cache.py). A process-local backend
+    is fine under `runserver`, but with several production workers each one
+    would keep serving its own stale indexes.
+    """
+    backend = settings.CACHES.get(VERSION_CACHE_ALIAS, {}).get('BACKEND')
+    if backend not in PROCESS_LOCAL_BACKENDS:
+        return []
+    return [Warning(
+        f"CACHES[{VERSION_CACHE_ALIAS!r}] uses {backend}, which is private to "
+        "each process, so plant indexes go stale when more than one worker runs.",
+        hint="Set PLANT_VERSION_CACHE_BACKEND to a shared backend (file-based, "
+             "memcached, redis) or run a single worker process.",
+        id='Plants.W001',
+    )]
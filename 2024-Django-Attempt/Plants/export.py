@@ -0,0 +1,142 @@
+"""
+Streaming export of the plant catalogue (Plant, PlantLink, Nursery).
+
+`manage.py dumpdata` builds the whole dataset in memory as one JSON array.
+These generators read each table with `iterator(chunk_size=...)` and merge
+in the many-to-many links from the through tables as they go, so memory
+stays flat however many plants and links exist.
+
+NDJSON output uses the same `{"model", "pk", "fields"}` records as Django's
+"jsonl" serializer, so it can be loaded back with `manage.py loaddata`.
+CSV output is one model per file, with many-to-many pks joined by ';'.
+"""
+
+import csv
+from itertools import groupby
+from operator import itemgetter
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Nursery, Plant, PlantLink
+from .serializers import PlantSerializer
+
+# model key -> (model, name of its many-to-many field or None)
+EXPORT_MODELS = {
+    'plant': (Plant, None),
+    'plantlink': (PlantLink, 'plant'),
+    'nursery': (Nursery, 'plants'),
+}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def _m2m_groups(model, m2m_name, chunk_size):
+    """Yield (owner pk, [target pks]) from a through table, in owner pk order."""
+    field = model._meta.get_field(m2m_name)
+    through = field.remote_field.through
+    owner = through._meta.get_field(field.m2m_field_name()).attname
+    target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+    rows = (
+        through.objects.order_by(owner, target)
+        .values_list(owner, target)
+        .iterator(chunk_size=chunk_size)
+    )
+    for owner_pk, group in groupby(rows, key=itemgetter(0)):
+        yield owner_pk, [target_pk for _, target_pk in group]
+
+
+def iter_records(model_key, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield (pk, fields) for every row of one export model, in pk order.
+
+    `fields` matches the `fields` of Django's serializers, including the
+    model's many-to-many field as a list of pks.
+    """
+    model, m2m_name = EXPORT_MODELS[model_key]
+    rows = (
+        PlantSerializer(model).values(model.objects.order_by('pk'), 'pk')
+        .iterator(chunk_size=chunk_size)
+    )
+    if m2m_name is None:
+        for row in rows:
+            yield row.pop('pk'), row
+        return
+
+    # both sides are ordered by owner pk, so a merge join keeps one group in memory
+    groups = _m2m_groups(model, m2m_name, chunk_size)
+    pending = next(groups, None)
+    for row in rows:
+        pk = row.pop('pk')
+        while pending is not None and pending[0] < pk:
+            pending = next(groups, None)
+        if pending is not None and pending[0] == pk:
+            row[m2m_name] = pending[1]
+            pending = next(groups, None)
+        else:
+            row[m2m_name] = []
+        yield pk, row
+
+
+def _batched(lines, size):
+    """Join `lines` into strings of up to `size` lines to cut per-chunk overhead."""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def iter_ndjson(model_keys=tuple(EXPORT_MODELS), chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield NDJSON text chunks for the given export models."""
+    def lines():
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        for model_key in model_keys:
+            label = EXPORT_MODELS[model_key][0]._meta.label_lower
+            for pk, fields in iter_records(model_key, chunk_size):
+                record = {'model': label, 'pk': pk, 'fields': fields}
+                yield encoder.encode(record) + '\n'
+    return _batched(lines(), chunk_size)
+
+
+class _Echo:
+    """File-like object whose `write` hands the CSV line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(model_key, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield CSV text chunks for one export model, header row first."""
+    model, m2m_name = EXPORT_MODELS[model_key]
+    field_names = PlantSerializer(model).field_names
+    writer = csv.writer(_Echo())
+
+    def lines():
+        yield writer.writerow(['pk', *field_names, *([m2m_name] if m2m_name else [])])
+        for pk, fields in iter_records(model_key, chunk_size):
+            row = [pk, *(fields[name] for name in field_names)]
+            if m2m_name:
+                row.append(';'.join(map(str, fields[m2m_name])))
+            yield writer.writerow(row)
+    return _batched(lines(), chunk_size)
+
+
+def iter_export(export_format, model_key=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Dispatch to `iter_ndjson`/`iter_csv`.
+
+    Raises:
+        ValueError: For an unknown format or model, or CSV without a model.
+    """
+    if model_key is not None and model_key not in EXPORT_MODELS:
+        raise ValueError(f"Unknown export model: {model_key!r}")
+    if export_format == 'ndjson':
+        return iter_ndjson((model_key,) if model_key else tuple(EXPORT_MODELS), chunk_size)
+    if export_format == 'csv':
+        if model_key is None:
+            raise ValueError("CSV export needs a model: " + ', '.join(EXPORT_MODELS))
+        return iter_csv(model_key, chunk_size)
+    raise ValueError(f"Unknown export format: {export_format!r}")
@@ -0,0 +1,443 @@
+"""
+Bulk import of the plant catalogue from gardening.xlsx, fixtures and exports.
+
+Loading through per-object `save()` or `loaddata` costs a transaction and
+several queries per row. This pipeline instead:
+
+- streams rows from .xlsx (openpyxl read-only mode), .csv, .json fixtures
+  (like data.json) or .ndjson/.jsonl exports from `export_catalogue`
+- normalizes legacy field names, hardiness zone codes, choice labels and
+  spreadsheet-style booleans/numbers, reporting bad rows instead of failing
+- writes each batch with one `bulk_create` for new rows and one upserting
+  `bulk_create(update_conflicts=True)` for existing rows, in a single
+  transaction
+- replaces `PlantLink.plant` / `Nursery.plants` links with set-based
+  through-table inserts
+
+Rows carrying a `pk` are matched on it; rows without one are matched on the
+model's natural key (see `NATURAL_KEYS`).
+"""
+
+import csv
+import json
+
+from django.db import models, transaction
+
+from .cache import bump_catalogue_version, invalidate_all_plants
+from .export import EXPORT_MODELS
+from .models import Plant
+from .zones import zone_ordinal
+
+DEFAULT_BATCH_SIZE = 1000
+
+# fields renamed by earlier migrations, plus the original experiment's names
+FIELD_ALIASES = {
+    'height': 'height_min',
+    'spacing': 'spacing_min',
+    'attracts_butterflies': 'is_butterfly_attractor',
+    'deadhead_suggested': 'is_deadhead_suggested',
+    'drought_tolerant': 'is_drought_tolerant',
+    'earth_kind': 'is_earth_kind',
+    'good_for_border': 'is_good_for_border',
+    'good_for_container': 'is_good_for_container',
+    'good_for_landscape': 'is_good_for_landscape',
+    'good_for_rock_garden': 'is_good_for_rock_garden',
+    'heat_tolerant': 'is_heat_tolerant',
+    'pollinator_friendly': 'is_pollinator_friendly',
+    'common_name': 'name_common',
+    'scientific_name': 'name_scientific',
+    'hardiness_zone_start': 'hardiness_zone_low',
+    'hardiness_zone_end': 'hardiness_zone_high',
+}
+
+# how rows without a pk are matched to existing rows
+NATURAL_KEYS = {
+    'plant': ('name_common', 'name_scientific'),
+    'plantlink': ('url', 'title'),
+    'nursery': ('name',),
+}
+
+# spreadsheet sheet / fixture model label -> export model key
+SHEET_MODELS = {'plants': 'plant', 'plant_urls': 'plantlink', 'nurseries': 'nursery'}
+FIXTURE_MODELS = {
+    model._meta.label_lower.lower(): key for key, (model, _) in EXPORT_MODELS.items()
+}
+
+TRUE_STRINGS = {'1', 'true', 't', 'yes', 'y', 'x'}
+FALSE_STRINGS = {'', '0', 'false', 'f', 'no', 'n'}
+
+
+class ImportReport:
+    """Counts and row errors collected while importing one model."""
+
+    def __init__(self, model_key):
+        self.model_key = model_key
+        self.created = 0
+        self.updated = 0
+        self.links = 0
+        self.errors = []
+
+    def __str__(self):
+        return (
+            f"{self.model_key}: {self.created} created, {self.updated} updated, "
+            f"{self.links} links, {len(self.errors)} skipped"
+        )
+
+
+# ===========================================================================
+# readers - each yields (model key, row dict) without loading the whole file
+# ===========================================================================
+
+def read_xlsx(path, sheets=None):
+    """Yield (model key, row) from the catalogue sheets of an .xlsx workbook."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet_name, model_key in SHEET_MODELS.items():
+            if sheet_name not in workbook.sheetnames or (sheets and sheet_name not in sheets):
+                continue
+            rows = workbook[sheet_name].iter_rows(values_only=True)
+            header = next(rows, None)
+            if not header or not any(header):
+                continue
+            header = [str(name).strip() if name is not None else None for name in header]
+            for values in rows:
+                if any(value is not None for value in values):
+                    yield model_key, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def read_csv(path, model_key):
+    """Yield (model key, row) from a CSV file such as `export_catalogue` writes."""
+    with open(path, newline='', encoding='utf-8') as csv_file:
+        for row in csv.DictReader(csv_file):
+            yield model_key, row
+
+
+def _fixture_record(record):
+    model_key = FIXTURE_MODELS.get(record.get('model', '').lower())
+    if model_key is None:
+        return None
+    return model_key, {'pk': record.get('pk'), **record.get('fields', {})}
+
+
+def read_ndjson(path):
+    """Yield (model key, row) from an NDJSON / jsonl export."""
+    with open(path, encoding='utf-8') as ndjson_file:
+        for line in ndjson_file:
+            if line.strip():
+                item = _fixture_record(json.loads(line))
+                if item is not None:
+                    yield item
+
+
+def read_json_fixture(path, read_size=1 << 16):
+    """
+    Yield (model key, row) from a `dumpdata` JSON array such as data.json.
+
+    The array is decoded one object at a time, so only the current object
+    and one read buffer are held in memory. Non-catalogue models are skipped.
+
+    Raises:
+        ValueError: Straight away (not on the first row) if the file does not
+            start with a JSON array.
+    """
+    json_file = open(path, encoding='utf-8')
+    try:
+        head = json_file.read(read_size)
+        if not head.lstrip().startswith('['):
+            raise ValueError(f"{path} is not a JSON array")
+    except BaseException:
+        json_file.close()
+        raise
+    return _iter_json_array(json_file, head, read_size)
+
+
+def _iter_json_array(json_file, buffer, read_size):
+    decoder = json.JSONDecoder()
+    with json_file:
+        chunk, pos = buffer, 0
+        while True:
+            while True:
+                # skip whitespace, the opening '[' and separating commas
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n,[]':
+                    pos += 1
+                if pos >= len(buffer):
+                    break
+                try:
+                    record, pos = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if not chunk:
+                        raise
+                    break
+                item = _fixture_record(record)
+                if item is not None:
+                    yield item
+            if not chunk:
+                return
+            chunk = json_file.read(read_size)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+
+def read_any(path, model_key=None, sheets=None):
+    """Pick a reader from the file extension."""
+    suffix = str(path).rsplit('.', 1)[-1].lower()
+    if suffix == 'xlsx':
+        return read_xlsx(path, sheets)
+    if suffix == 'json':
+        return read_json_fixture(path)
+    if suffix in ('ndjson', 'jsonl'):
+        return read_ndjson(path)
+    if suffix == 'csv':
+        if model_key not in EXPORT_MODELS:
+            raise ValueError("CSV import needs a model: " + ', '.join(EXPORT_MODELS))
+        return read_csv(path, model_key)
+    raise ValueError(f"Unsupported import file: {path}")
+
+
+# ===========================================================================
+# normalization
+# ===========================================================================
+
+class RowNormalizer:
+    """
+    Converts raw row values for one model into field values `bulk_create` accepts.
+
+    Lookup tables (field types, choice labels) are built once per model.
+    """
+
+    def __init__(self, model_key):
+        self.model, self.m2m_name = EXPORT_MODELS[model_key]
+        self.fields = {
+            field.name: field for field in self.model._meta.local_fields
+            if field.editable and not field.primary_key
+        }
+        self.choices = {}
+        for name, field in self.fields.items():
+            if field.choices:
+                lookup = {}
+                for code, label in field.choices:
+                    lookup[str(code).lower()] = code
+                    lookup[str(label).lower()] = code
+                self.choices[name] = lookup
+
+    def normalize(self, row):
+        """
+        Return (pk or None, field values, m2m pks or None) for one raw row.
+
+        Raises:
+            ValueError: If a value cannot be converted for its field.
+        """
+        pk, values, m2m = None, {}, None
+        for raw_name, value in row.items():
+            if raw_name is None:
+                continue
+            name = FIELD_ALIASES.get(raw_name.strip().lower(), raw_name.strip().lower())
+            if name in ('pk', 'id'):
+                pk = int(value) if value not in (None, '') else None
+            elif name == self.m2m_name:
+                m2m = self.normalize_pks(value)
+            elif name in self.fields:
+                value = self.normalize_value(name, value)
+                if value is not None:
+                    values[name] = value
+        return pk, values, m2m
+
+    def normalize_value(self, name, value):
+        field = self.fields[name]
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or (value == '' and not isinstance(field, (models.CharField, models.TextField))):
+            return None
+        if name in ('hardiness_zone_low', 'hardiness_zone_high'):
+            return self.normalize_zone(name, value)
+        if name in self.choices:
+            try:
+                return self.choices[name][str(value).lower()]
+            except KeyError:
+                raise ValueError(f"{name}: invalid choice {value!r}") from None
+        if isinstance(field, models.BooleanField):
+            if isinstance(value, bool):
+                return value
+            text = str(value).lower()
+            if text in TRUE_STRINGS:
+                return True
+            if text in FALSE_STRINGS:
+                return False
+            raise ValueError(f"{name}: invalid boolean {value!r}")
+        if isinstance(field, models.IntegerField):
+            try:
+                number = int(float(value))
+            except (TypeError, ValueError):
+                raise ValueError(f"{name}: invalid number {value!r}") from None
+            if number < 0:
+                raise ValueError(f"{name}: must not be negative")
+            return number
+        return str(value)
+
+    def normalize_zone(self, name, value):
+        """Accept '8b', '8B', a full choice label, or a bare zone number."""
+        if isinstance(value, (int, float)) or str(value).isdigit():
+            # bare numbers (the original experiment's INTEGER columns) cover the whole zone
+            value = f"{int(float(value))}{'a' if name == 'hardiness_zone_low' else 'b'}"
+        code = self.choices[name].get(str(value).lower())
+        if code is None:
+            raise ValueError(f"{name}: invalid hardiness zone {value!r}")
+        zone_ordinal(code)
+        return code
+
+    @staticmethod
+    def normalize_pks(value):
+        if value in (None, ''):
+            return []
+        if isinstance(value, (list, tuple)):
+            return [int(pk) for pk in value]
+        if isinstance(value, (int, float)):
+            return [int(value)]
+        return [int(pk) for pk in str(value).replace(',', ';').split(';') if pk.strip()]
+
+
+# ===========================================================================
+# writer
+# ===========================================================================
+
+class CatalogueImporter:
+    """
+    Writes normalized rows in batches with bulk queries.
+
+    Usage:
+        importer = CatalogueImporter()
+        reports = importer.import_rows(read_any('files/gardening.xlsx'))
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE):
+        self.batch_size = batch_size
+
+    def import_rows(self, items):
+        """
+        Import (model key, row) pairs, e.g. from `read_any`.
+
+        Consecutive rows for the same model are written together, so plants
+        should come before the links and nurseries that point at them.
+        Returns {model key: ImportReport}.
+        """
+        reports = {}
+        normalizers = {}
+        batch, batch_key = [], None
+        try:
+            for number, (model_key, row) in enumerate(items, start=1):
+                if model_key != batch_key or len(batch) >= self.batch_size:
+                    if batch:
+                        self.write_batch(batch_key, batch, reports[batch_key])
+                    batch, batch_key = [], model_key
+                if model_key not in normalizers:
+                    normalizers[model_key] = RowNormalizer(model_key)
+                    reports[model_key] = ImportReport(model_key)
+                try:
+                    batch.append(normalizers[model_key].normalize(row))
+                except ValueError as err:
+                    reports[model_key].errors.append((number, str(err)))
+            if batch:
+                self.write_batch(batch_key, batch, reports[batch_key])
+        finally:
+            # bulk queries skip post_save: every worker rebuilds its in-memory
+            # indexes and page fragments when these versions move
+            bump_catalogue_version()
+            invalidate_all_plants()
+        return reports
+
+    def write_batch(self, model_key, batch, report):
+        model, m2m_name = EXPORT_MODELS[model_key]
+        key_fields = NATURAL_KEYS[model_key]
+        with transaction.atomic():
+            existing = self.match_existing(model_key, batch)
+            # rows are keyed so a repeated row within one batch replaces the earlier one
+            to_create, to_update, m2m_rows = {}, {}, {}
+            for (pk, values, m2m), match in zip(batch, existing):
+                obj = model(pk=match or pk, **values)
+                if match is not None:
+                    key = ('pk', match)
+                    # only the columns this row supplies are written
+                    to_update[key] = (obj, frozenset(values))
+                else:
+                    if model is Plant:
+                        for name, value in Plant.derive_fields(vars(obj)).items():
+                            setattr(obj, name, value)
+                    key = pk if pk is not None else tuple(values.get(name, '') for name in key_fields)
+                    to_create[key] = obj
+                if m2m is not None:
+                    m2m_rows[key] = (obj, m2m)
+                else:
+                    m2m_rows.pop(key, None)
+
+            if to_create:
+                model.objects.bulk_create(list(to_create.values()), batch_size=self.batch_size)
+            # one upsert per set of supplied columns, so a row that omits a
+            # column never overwrites it with the model default
+            by_fields = {}
+            for obj, fields in to_update.values():
+                by_fields.setdefault(fields, []).append(obj)
+            for fields, objs in by_fields.items():
+                if not fields:
+                    continue
+                # INSERT ... ON CONFLICT DO UPDATE is far cheaper than bulk_update's CASE chains
+                model.objects.bulk_create(
+                    objs, batch_size=self.batch_size, update_conflicts=True,
+                    unique_fields=['pk'], update_fields=sorted(fields),
+                )
+            if to_update and model is Plant:
+                # partial rows cannot derive trait/zone columns on their own
+                updated_pks = [obj.pk for obj, _ in to_update.values()]
+                Plant.objects.filter(pk__in=updated_pks).sync_derived_fields()
+            if m2m_rows:
+                # created objects have their pks now that bulk_create has run
+                report.links += self.replace_links(model, m2m_name, list(m2m_rows.values()))
+        report.created += len(to_create)
+        report.updated += len(to_update)
+
+    def match_existing(self, model_key, batch):
+        """Return the existing pk (or None) for each row, in one query per batch."""
+        model = EXPORT_MODELS[model_key][0]
+        pks = [pk for pk, _, _ in batch if pk is not None]
+        known_pks = set(model.objects.filter(pk__in=pks).values_list('pk', flat=True)) if pks else set()
+
+        key_fields = NATURAL_KEYS[model_key]
+        keyed = [tuple(values.get(name, '') for name in key_fields) for pk, values, _ in batch if pk is None]
+        known_keys = {}
+        if keyed:
+            first = {key[0] for key in keyed}
+            rows = model.objects.filter(**{f'{key_fields[0]}__in': first}).values_list('pk', *key_fields)
+            known_keys = {tuple(row[1:]): row[0] for row in rows}
+
+        matches = []
+        for pk, values, _ in batch:
+            if pk is not None:
+                matches.append(pk if pk in known_pks else None)
+            else:
+                matches.append(known_keys.get(tuple(values.get(name, '') for name in key_fields)))
+        return matches
+
+    @staticmethod
+    def replace_links(model, m2m_name, m2m_rows):
+        """Replace the many-to-many links of each owner with set-based queries."""
+        field = model._meta.get_field(m2m_name)
+        through = field.remote_field.through
+        owner = through._meta.get_field(field.m2m_field_name()).attname
+        target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+
+        wanted = {pk for _, pks in m2m_rows for pk in pks}
+        existing_targets = set(
+            field.related_model.objects.filter(pk__in=wanted).values_list('pk', flat=True)
+        )
+        through.objects.filter(**{f'{owner}__in': [obj.pk for obj, _ in m2m_rows]}).delete()
+        links = [
+            through(**{owner: obj.pk, target: pk})
+            for obj, pks in m2m_rows
+            for pk in dict.fromkeys(pks)
+            if pk in existing_targets
+        ]
+        through.objects.bulk_create(links, ignore_conflicts=True)
+        return len(links)
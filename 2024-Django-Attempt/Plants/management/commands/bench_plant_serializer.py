@@ -0,0 +1,73 @@
+"""
+Compare the per-page cost of `PlantSerializer` against Django's serializer.
+
+    python manage.py bench_plant_serializer --plants 5000 --page-size 100
+
+Sample plants are created inside a transaction that is rolled back, so the
+benchmark leaves the database untouched.
+"""
+
+import json
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.core.serializers import serialize
+from django.db import transaction
+
+from Plants.models import Plant
+from Plants.serializers import plant_serializer
+
+
+def serialize_round_trip(queryset):
+    """The previous `get_paginated_context` path: encode, decode, re-encode."""
+    page = [obj['fields'] for obj in json.loads(serialize("json", queryset))]
+    return json.dumps(page)
+
+
+def serialize_fast(queryset):
+    """`PlantSerializer` path: read values, encode once."""
+    return json.dumps(plant_serializer.serialize(queryset))
+
+
+class Command(BaseCommand):
+    help = "Benchmark plant page serialization (CPU time and peak allocations)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--plants', type=int, default=2000)
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            Plant.objects.bulk_create(
+                Plant(name_common=f'Bench plant {i:06d}', description='x' * 200)
+                for i in range(options['plants'])
+            )
+            page = Plant.objects.order_by('name_common', 'pk')[:options['page_size']]
+
+            slow, fast = serialize_round_trip(page), serialize_fast(page)
+            if json.loads(slow) != json.loads(fast):
+                self.stderr.write("Serializer output differs from serialize('json')")
+
+            for label, func in (('serialize+loads', serialize_round_trip),
+                                ('PlantSerializer', serialize_fast)):
+                cpu, peak = self.measure(func, page, options['repeat'])
+                self.stdout.write(
+                    f"{label:<16} {cpu * 1000:8.3f} ms CPU/page  {peak / 1024:8.1f} KiB peak"
+                )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def measure(func, queryset, repeat):
+        # evaluate a fresh clone each time so queryset caching does not help
+        start = time.process_time()
+        for _ in range(repeat):
+            func(queryset.all())
+        cpu = (time.process_time() - start) / repeat
+
+        tracemalloc.start()
+        func(queryset.all())
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return cpu, peak
@@ -0,0 +1,115 @@
+"""
+Compare SQLite's default settings with the `SQLITE_PRAGMAS` profile under
+concurrent readers and writers.
+
+    python manage.py bench_sqlite --writers 2 --readers 4 --seconds 3
+
+Each profile gets a fresh scratch database in a temporary directory, so the
+benchmark leaves the project database untouched. Every worker thread opens
+its own connection; writers commit one row per transaction and readers run
+point lookups and a range count, like plant pages do.
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from Plants.sqlite import get_pragmas, pragma_statements
+
+SCHEMA = 'CREATE TABLE plant (id INTEGER PRIMARY KEY, name TEXT, description TEXT)'
+SEED_ROWS = 10000
+
+
+def connect(path, statements):
+    conn = sqlite3.connect(path, timeout=5, isolation_level=None,
+                           check_same_thread=False)
+    for statement in statements:
+        conn.execute(statement)
+    return conn
+
+
+def writer(path, statements, stop, counts):
+    conn = connect(path, statements)
+    while not stop.is_set():
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('INSERT INTO plant (name, description) VALUES (?, ?)',
+                         ('Bench plant', 'x' * 200))
+            conn.execute('COMMIT')
+            counts['writes'] += 1
+        except sqlite3.OperationalError:
+            counts['errors'] += 1
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+    conn.close()
+
+
+def reader(path, statements, stop, counts):
+    conn = connect(path, statements)
+    rng = random.Random()
+    while not stop.is_set():
+        try:
+            low = rng.randint(1, SEED_ROWS)
+            conn.execute('SELECT * FROM plant WHERE id = ?', (low,)).fetchone()
+            conn.execute('SELECT COUNT(*) FROM plant WHERE id BETWEEN ? AND ?',
+                         (low, low + 100)).fetchone()
+            counts['reads'] += 1
+        except sqlite3.OperationalError:
+            counts['errors'] += 1
+    conn.close()
+
+
+def run_profile(statements, writers, readers, seconds):
+    """Return {'writes', 'reads', 'errors'} per second for one profile."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bench.sqlite3')
+        conn = connect(path, statements)
+        conn.execute(SCHEMA)
+        conn.execute('BEGIN')
+        conn.executemany('INSERT INTO plant (name, description) VALUES (?, ?)',
+                         (('Seed plant', 'x' * 200) for _ in range(SEED_ROWS)))
+        conn.execute('COMMIT')
+        conn.close()
+
+        stop = threading.Event()
+        # one dict per thread, so the counters need no lock
+        counts = [{'writes': 0, 'reads': 0, 'errors': 0}
+                  for _ in range(writers + readers)]
+        threads = [
+            threading.Thread(target=writer if i < writers else reader,
+                             args=(path, statements, stop, counts[i]))
+            for i in range(writers + readers)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return {key: sum(c[key] for c in counts) / seconds
+            for key in ('writes', 'reads', 'errors')}
+
+
+class Command(BaseCommand):
+    help = "Benchmark concurrent SQLite throughput: defaults vs SQLITE_PRAGMAS."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--seconds', type=float, default=3)
+
+    def handle(self, *args, **options):
+        profiles = (('defaults', []),
+                    ('SQLITE_PRAGMAS', pragma_statements(get_pragmas())))
+        for label, statements in profiles:
+            result = run_profile(statements, options['writers'],
+                                 options['readers'], options['seconds'])
+            self.stdout.write(
+                f"{label:<16} {result['writes']:10.0f} writes/s "
+                f"{result['reads']:10.0f} reads/s {result['errors']:6.0f} errors/s"
+            )
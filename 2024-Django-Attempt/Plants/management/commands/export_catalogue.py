@@ -0,0 +1,34 @@
+"""
+Stream the plant catalogue to a file or stdout without loading it in memory.
+
+    python manage.py export_catalogue --format ndjson -o catalogue.ndjson
+    python manage.py export_catalogue --format csv --model plant -o plants.csv
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Plants.export import DEFAULT_CHUNK_SIZE, EXPORT_MODELS, iter_export
+
+
+class Command(BaseCommand):
+    help = "Export Plant/PlantLink/Nursery as NDJSON or CSV, streaming in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+        parser.add_argument('--model', choices=list(EXPORT_MODELS))
+        parser.add_argument('-o', '--output', help="File to write (default: stdout).")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            chunks = iter_export(options['format'], options['model'], options['chunk_size'])
+        except ValueError as err:
+            raise CommandError(err)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as out:
+                out.writelines(chunks)
+        else:
+            sys.stdout.writelines(chunks)
@@ -0,0 +1,44 @@
+"""
+Bulk-load the plant catalogue from a spreadsheet, fixture or export.
+
+    python manage.py import_catalogue files/gardening.xlsx
+    python manage.py import_catalogue data.json
+    python manage.py import_catalogue plants.csv --model plant
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from Plants.export import EXPORT_MODELS
+from Plants.importer import DEFAULT_BATCH_SIZE, CatalogueImporter, read_any
+
+
+class Command(BaseCommand):
+    help = "Import Plant/PlantLink/Nursery rows with batched bulk queries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help=".xlsx, .json fixture, .ndjson/.jsonl or .csv file")
+        parser.add_argument('--model', choices=list(EXPORT_MODELS), help="Model for CSV files.")
+        parser.add_argument('--sheet', action='append', dest='sheets',
+                            help="Only import this .xlsx sheet (repeatable).")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            rows = read_any(options['path'], options['model'], options['sheets'])
+            # readers decode lazily: a file that turns out to be malformed
+            # half-way through rolls back the batches already written
+            with transaction.atomic():
+                reports = CatalogueImporter(options['batch_size']).import_rows(rows)
+        except ValueError as err:
+            raise CommandError(err)
+        elapsed = time.perf_counter() - start
+
+        for report in reports.values():
+            self.stdout.write(str(report))
+            for row_number, error in report.errors:
+                self.stderr.write(f"  row {row_number}: {error}")
+        self.stdout.write(f"Finished in {elapsed:.2f}s")
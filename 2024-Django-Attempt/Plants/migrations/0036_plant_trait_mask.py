@@ -0,0 +1,52 @@
+from django.db import migrations, models
+
+# Frozen copy of Plants.traits.TRAIT_FIELDS as of this migration: the bit
+# positions it backfills must not follow later edits to the app code.
+TRAIT_FIELDS = [
+    'is_hybrid',
+    'is_deadhead_suggested',
+    'is_good_for_border',
+    'is_good_for_container',
+    'is_good_for_landscape',
+    'is_good_for_rock_garden',
+    'is_good_for_shrubs',
+    'is_butterfly_attractor',
+    'is_pollinator_friendly',
+    'is_deer_resistant',
+    'is_mosquito_repellent',
+    'is_rabbit_resistant',
+    'is_drought_tolerant',
+    'is_heat_tolerant',
+    'is_earth_kind',
+    'is_waterwise',
+    'is_organic',
+    'is_non_gmo',
+]
+
+
+def trait_mask_from_values(values):
+    return sum(1 << bit for bit, name in enumerate(TRAIT_FIELDS) if values[name])
+
+
+def backfill_trait_mask(apps, schema_editor):
+    Plant = apps.get_model('Plants', 'Plant')
+    plants = []
+    for row in Plant.objects.values('pk', *TRAIT_FIELDS).iterator():
+        plants.append(Plant(pk=row['pk'], trait_mask=trait_mask_from_values(row)))
+    Plant.objects.bulk_update(plants, ['trait_mask'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Plants', '0035_alter_plant_plant_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plant',
+            name='trait_mask',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_trait_mask, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+from django.db import migrations, models
+
+
+def zone_ordinal(code):
+    """
+    Zone code -> ordinal as defined when this migration was written (kept
+    here so later edits to Plants.zones do not change it): '1a' -> 1,
+    '1b' -> 2, ... '13b' -> 26; 'na', blank and unknown codes -> None.
+    """
+    if not code or len(code) < 2:
+        return None
+    number, half = code[:-1], code[-1:].lower()
+    if not number.isdigit() or half not in ('a', 'b') or not 1 <= int(number) <= 13:
+        return None
+    return int(number) * 2 - (1 if half == 'a' else 0)
+
+
+def backfill_zone_ordinals(apps, schema_editor):
+    Plant = apps.get_model('Plants', 'Plant')
+    plants = []
+    rows = Plant.objects.values('pk', 'hardiness_zone_low', 'hardiness_zone_high')
+    for row in rows.iterator():
+        plants.append(Plant(
+            pk=row['pk'],
+            hardiness_zone_low_ord=zone_ordinal(row['hardiness_zone_low']),
+            hardiness_zone_high_ord=zone_ordinal(row['hardiness_zone_high']),
+        ))
+    Plant.objects.bulk_update(
+        plants, ['hardiness_zone_low_ord', 'hardiness_zone_high_ord'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Plants', '0036_plant_trait_mask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='plant',
+            name='hardiness_zone_high_ord',
+            field=models.PositiveSmallIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='plant',
+            name='hardiness_zone_low_ord',
+            field=models.PositiveSmallIntegerField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='plant',
+            index=models.Index(
+                fields=['hardiness_zone_low_ord', 'hardiness_zone_high_ord'],
+                name='plant_zone_range_idx',
+            ),
+        ),
+        migrations.RunPython(backfill_zone_ordinals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.1.2 on 2026-10-18 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Plants', '0037_plant_hardiness_zone_ordinals'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='plant',
+            index=models.Index(
+                fields=['name_common', 'id'], name='plant_name_keyset_idx'
+            ),
+        ),
+    ]
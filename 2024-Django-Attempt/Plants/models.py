@@ -1,6 +1,10 @@
 from django.db import models
+from django.db.models import F
 from django.contrib.auth.models import User
 
+from .traits import TRAIT_FIELDS, trait_mask_for, trait_mask_from_values
+from .zones import zone_ordinal
+
 # class Resource(models.Model):
 #     author = models.CharField(max_length=50)
 #     url = models.URLField(blank=True)
@@ -17,6 +21,80 @@ class Nursery(models.Model):
     def __str__(self):
         return self.name
 
+class PlantQuerySet(models.QuerySet):
+    def filter_any(self, *traits):
+        """Plants that have at least one of the given `is_*` traits (OR2.1)."""
+        mask = trait_mask_for(traits)
+        return self.alias(
+            trait_match=F('trait_mask').bitand(mask)
+        ).filter(trait_match__gt=0)
+
+    def filter_exact(self, *traits):
+        """Plants that have every one of the given `is_*` traits (OR2.2)."""
+        mask = trait_mask_for(traits)
+        return self.alias(
+            trait_match=F('trait_mask').bitand(mask)
+        ).filter(trait_match=mask)
+
+    def with_related(self):
+        """
+        Prefetch plan for pages that show a plant's links and nurseries:
+        two extra queries in total, however many plants are listed.
+        """
+        return self.prefetch_related(
+            models.Prefetch('links', queryset=PlantLink.objects.only('title', 'url', 'type')),
+            models.Prefetch('nursery_set', queryset=Nursery.objects.only('name', 'url')),
+        )
+
+    @staticmethod
+    def _zone_ordinals(*zones):
+        """
+        Return the ordinals of `zones` for a range query.
+
+        Raises:
+            ValueError: If a zone is not a zone code like '8b' ('na' and blank
+                mean "not provided" and cannot be queried).
+        """
+        ordinals = [zone_ordinal(zone) for zone in zones]
+        for zone, ordinal in zip(zones, ordinals):
+            if ordinal is None:
+                raise ValueError(f"Cannot filter by hardiness zone {zone!r}")
+        return ordinals
+
+    def survives_in(self, zone):
+        """Plants whose hardiness range includes `zone` (e.g. '8b')."""
+        ordinal, = self._zone_ordinals(zone)
+        return self.filter(
+            hardiness_zone_low_ord__lte=ordinal,
+            hardiness_zone_high_ord__gte=ordinal,
+        )
+
+    def overlaps_zones(self, low, high):
+        """Plants whose hardiness range overlaps `low`..`high` (inclusive)."""
+        low_ord, high_ord = self._zone_ordinals(low, high)
+        if low_ord > high_ord:
+            low_ord, high_ord = high_ord, low_ord
+        return self.filter(
+            hardiness_zone_low_ord__lte=high_ord,
+            hardiness_zone_high_ord__gte=low_ord,
+        )
+
+    def sync_derived_fields(self):
+        """
+        Recompute `Plant.DERIVED_FIELDS` for every plant in the queryset.
+
+        Needed after `update()`/`bulk_update()`/`loaddata`, which bypass
+        `Plant.save()`. Returns the number of rows that were out of date.
+        """
+        stale = []
+        rows = self.values('pk', *Plant.DERIVED_FIELDS, *Plant.DERIVED_FROM)
+        for row in rows.iterator():
+            derived = Plant.derive_fields(row)
+            if any(row[name] != value for name, value in derived.items()):
+                stale.append(Plant(pk=row['pk'], **derived))
+        Plant.objects.bulk_update(stale, Plant.DERIVED_FIELDS, batch_size=500)
+        return len(stale)
+
 # Create your models here.
 class Plant(models.Model):
     EXPOSURE_CHOICES = [
@@ -102,6 +180,57 @@ class Plant(models.Model):
     germination_days = models.PositiveSmallIntegerField(default=0)
     maturity_days = models.PositiveSmallIntegerField(default=0)
     # links = models.ManyToManyField('PlantLink', blank=True)
+    # one bit per entry in TRAIT_FIELDS, kept in sync by save()
+    trait_mask = models.PositiveIntegerField(default=0, db_index=True, editable=False)
+    # sortable hardiness_zone_low/high, kept in sync by save(); None for 'na'
+    hardiness_zone_low_ord = models.PositiveSmallIntegerField(null=True, editable=False)
+    hardiness_zone_high_ord = models.PositiveSmallIntegerField(null=True, editable=False)
+
+    TRAIT_FIELDS = TRAIT_FIELDS
+    DERIVED_FIELDS = ['trait_mask', 'hardiness_zone_low_ord', 'hardiness_zone_high_ord']
+    DERIVED_FROM = [*TRAIT_FIELDS, 'hardiness_zone_low', 'hardiness_zone_high']
+
+    objects = PlantQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['hardiness_zone_low_ord', 'hardiness_zone_high_ord'],
+                name='plant_zone_range_idx',
+            ),
+            # keyset pagination order used by PlantListView
+            models.Index(fields=['name_common', 'id'], name='plant_name_keyset_idx'),
+        ]
+
+    @staticmethod
+    def derive_fields(values):
+        """Return `DERIVED_FIELDS` computed from a mapping of field values."""
+        return {
+            'trait_mask': trait_mask_from_values(values),
+            'hardiness_zone_low_ord': zone_ordinal(values.get('hardiness_zone_low')),
+            'hardiness_zone_high_ord': zone_ordinal(values.get('hardiness_zone_high')),
+        }
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        deferred = self.get_deferred_fields()
+        if update_fields is not None:
+            written = set(update_fields)
+        elif deferred and not self._state.adding:
+            # Django only writes the loaded fields of a deferred instance
+            written = {field.attname for field in self._meta.concrete_fields} - deferred
+        else:
+            written = None
+        if written is None or written & set(self.DERIVED_FROM):
+            # the derived fields need every source, not just the loaded ones
+            missing = deferred & set(self.DERIVED_FROM)
+            if missing:
+                self.refresh_from_db(fields=missing)
+            for name, value in self.derive_fields(vars(self)).items():
+                setattr(self, name, value)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *self.DERIVED_FIELDS}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         if self.name_scientific:
@@ -141,6 +270,8 @@ class PlantLink(models.Model):
         ('ot', 'Other'),
         ('yt', 'YouTube'),
     ]
+    # precomputed so __str__ does not rescan LINK_TYPE_CHOICES on every call
+    LINK_TYPE_LABELS = dict(LINK_TYPE_CHOICES)
 
     title = models.CharField(max_length=75)
     url = models.URLField()
@@ -157,10 +288,9 @@ class PlantLink(models.Model):
         """
         ordering = ['type', 'title']
 
+    @property
+    def type_label(self):
+        return self.LINK_TYPE_LABELS.get(self.type, self.type)
+
     def __str__(self):
-        type = [item for item in self.LINK_TYPE_CHOICES 
-                if item[0] == self.type][0][1]
-        if not self.plant:
-            return f'{type} ({self.plant}):\t"{self.title}"'
-        else:
-            return f'{type}:\t"{self.title}"'
+        return f'{self.type_label}:\t"{self.title}"'
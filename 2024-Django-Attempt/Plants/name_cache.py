@@ -0,0 +1,181 @@
+"""
+In-process read-through LRU cache for plant lookups by name.
+
+Batch imports, companion lists and profile pages resolve many plants by
+`name_scientific` or `name_common`. `plant_id_for_name` and
+`plant_for_name` answer repeated lookups from a size-bounded LRU cache and
+only query the database on a miss. Names that match no plant are not
+cached: a plant can gain that name through writes no receiver sees (e.g.
+`bulk_create`), and a cached miss would then hide it.
+
+Entries are dropped by the receivers in `signals.py` when a plant is saved or
+deleted (under its new names and under whatever names pointed at it), and
+the whole cache is dropped when the shared catalogue version (see
+`cache.py`) moves for any other reason: bulk operations that bypass signals
+(imports, admin duplicates) or writes made by another worker process. When
+several plants share a name, the lowest pk wins.
+"""
+
+import threading
+from collections import OrderedDict
+
+from .cache import catalogue_version
+
+NAME_FIELDS = ('name_scientific', 'name_common')
+DEFAULT_MAX_SIZE = 2048
+
+
+class NameCache:
+    """
+    Thread-safe LRU mapping of keys to values loaded on a miss.
+
+    A write that invalidates entries while a value is being loaded also
+    discards that value, so a lookup racing a save never caches stale data.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._keys_by_pk = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, load):
+        """
+        Return the cached value for `key`, or `load()` it and cache it.
+
+        `load` returns (pk, value); pk records which plant the entry depends
+        on for `invalidate`. A pk of None means nothing matched, and is
+        returned without being cached.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][1]
+            self.misses += 1
+            generation = self._generation
+        pk, value = load()
+        if pk is None:
+            return value
+        with self._lock:
+            if generation == self._generation:
+                self._put(key, pk, value)
+        return value
+
+    def _put(self, key, pk, value):
+        self._entries[key] = (pk, value)
+        self._entries.move_to_end(key)
+        self._keys_by_pk.setdefault(pk, set()).add(key)
+        while len(self._entries) > self.max_size:
+            old_key, (old_pk, _) = self._entries.popitem(last=False)
+            self._discard_pk_key(old_pk, old_key)
+
+    def _discard_pk_key(self, pk, key):
+        keys = self._keys_by_pk.get(pk)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_pk[pk]
+
+    def invalidate(self, keys=(), pk=None):
+        """Drop `keys` and every entry that resolved to plant `pk`."""
+        with self._lock:
+            self._generation += 1
+            doomed = set(keys)
+            if pk is not None:
+                doomed |= self._keys_by_pk.get(pk, set())
+            for key in doomed:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self._discard_pk_key(entry[0], key)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._keys_by_pk.clear()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'max_size': self.max_size,
+        }
+
+
+_name_cache = NameCache()
+# catalogue version the entries were loaded at
+_name_version = None
+
+
+def get_name_cache():
+    """Return the process-wide `NameCache` (for stats and tests)."""
+    return _name_cache
+
+
+def _synced_cache():
+    """Return the cache, cleared first if the catalogue version has moved."""
+    global _name_version
+    version = catalogue_version()
+    if version != _name_version:
+        _name_cache.clear()
+        _name_version = version
+    return _name_cache
+
+
+def _lookup(field, name):
+    from .models import Plant
+    if field not in NAME_FIELDS:
+        raise ValueError(f"Plants are looked up by {NAME_FIELDS}, not {field!r}")
+    return Plant.objects.filter(**{field: name}).order_by('pk')
+
+
+def plant_id_for_name(name, field='name_scientific'):
+    """Return the pk of the plant called `name` in `field`, or None."""
+    def load():
+        pk = _lookup(field, name).values_list('pk', flat=True).first()
+        return pk, pk
+    return _synced_cache().get(('id', field, name), load)
+
+
+def plant_for_name(name, field='name_scientific'):
+    """Return the field values (a new dict) of the plant called `name`, or None."""
+    def load():
+        row = _lookup(field, name).values().first()
+        return (row['id'], row) if row else (None, None)
+    row = _synced_cache().get(('row', field, name), load)
+    return dict(row) if row else None
+
+
+def invalidate_plant_names(plant):
+    """
+    Drop the entries for `plant`'s names and any that resolved to it, after
+    this process saved or deleted it (and bumped the catalogue version).
+    """
+    global _name_version
+    keys = [
+        (kind, field, getattr(plant, field))
+        for kind in ('id', 'row')
+        for field in NAME_FIELDS
+    ]
+    _name_cache.invalidate(keys, pk=plant.pk)
+    version = catalogue_version()
+    if _name_version is not None and version == _name_version + 1:
+        # only our own write moved the version; the rest is still current
+        _name_version = version
+    else:
+        clear_name_cache()
+
+
+def clear_name_cache():
+    """Drop every entry."""
+    global _name_version
+    _name_cache.clear()
+    _name_version = None
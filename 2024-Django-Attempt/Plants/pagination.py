@@ -0,0 +1,105 @@
+"""
+Keyset (cursor) pagination for plant listings.
+
+Django's `Paginator` does OFFSET/LIMIT plus a `count()` per request, so deep
+pages get linearly slower. Keyset pagination instead remembers the sort key
+of the last row it returned and asks for rows after it, which the
+(name_common, id) index answers at the same cost on every page.
+
+Cursors are opaque to clients: url-safe base64 of the boundary row's key
+values plus the direction to read in. Key values must be strings or integers
+(the text and integer columns plant listings are ordered by), so a crafted
+cursor cannot smuggle other JSON types into the query.
+"""
+
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+
+
+def encode_cursor(values, direction):
+    """Return an opaque cursor for a row's key `values` and a direction."""
+    payload = json.dumps([direction, *values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Return (direction, values) for a cursor made by `encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed, or its direction is not
+            'next'/'prev' or a key value is not a str or int.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, *values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
+    if direction not in ('next', 'prev') or not all(
+        isinstance(value, (str, int)) and not isinstance(value, bool)
+        for value in values
+    ):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return direction, values
+
+
+def _after(keys, values, lookup):
+    """Q for rows strictly after `values` in `keys` order (`lookup` gt/lt)."""
+    condition = Q()
+    for i, key in enumerate(keys):
+        step = Q(**{f'{key}__{lookup}': values[i]})
+        for prior, value in zip(keys[:i], values):
+            step &= Q(**{prior: value})
+        condition |= step
+    return condition
+
+
+def keyset_page(queryset, keys, cursor=None, limit=20):
+    """
+    Return one page of `queryset` ordered by `keys` (ascending).
+
+    Args:
+        queryset: Queryset (of models or `.values()` dicts) to paginate; its
+            own ordering is replaced.
+        keys: Field names that uniquely order the rows, e.g. ('name_common', 'pk').
+        cursor: Cursor from a previous page's `next`/`prev`, or None for page one.
+        limit: Rows per page.
+
+    Returns:
+        dict: `objects` (list of rows), `next` and `prev` cursors (or None).
+    """
+    keys = list(keys)
+    direction, values = decode_cursor(cursor) if cursor else ('next', None)
+    if values is not None and len(values) != len(keys):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+    if direction == 'next':
+        ordered = queryset.order_by(*keys)
+        if values is not None:
+            ordered = ordered.filter(_after(keys, values, 'gt'))
+    else:
+        ordered = queryset.order_by(*[f'-{key}' for key in keys])
+        ordered = ordered.filter(_after(keys, values, 'lt'))
+
+    # one extra row tells us whether there is another page in this direction
+    rows = list(ordered[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == 'prev':
+        rows.reverse()
+
+    def key_of(row):
+        if isinstance(row, dict):
+            return [row[key] for key in keys]
+        return [getattr(row, key) for key in keys]
+
+    has_next = has_more if direction == 'next' else values is not None
+    has_prev = has_more if direction == 'prev' else values is not None
+    return {
+        'objects': rows,
+        'next': encode_cursor(key_of(rows[-1]), 'next') if rows and has_next else None,
+        'prev': encode_cursor(key_of(rows[0]), 'prev') if rows and has_prev else None,
+    }
@@ -0,0 +1,175 @@
+"""
+In-process trigram index for plant name search (OR1.2, plant_search_by_name).
+
+Every plant's `name_common`, `name_scientific` and `description` are split
+into padded character trigrams (the same scheme as PostgreSQL's pg_trgm), and
+each trigram points at the set of plants containing it. A query only touches
+the postings for its own trigrams, so substring and typo-tolerant lookups do
+not scan the catalogue or ship it to the browser.
+
+The index is built on first use and kept current by the receivers in
+`signals.py`; writes made by other worker processes are picked up through
+the shared catalogue version (see `cache.py`).
+"""
+
+import re
+from collections import Counter, defaultdict
+
+from .cache import catalogue_version
+
+SEARCH_FIELDS = ['name_common', 'name_scientific', 'description']
+
+# name matches outrank description matches with the same trigram overlap
+FIELD_WEIGHTS = {'name_common': 1.0, 'name_scientific': 0.9, 'description': 0.5}
+
+# share of the query's trigrams a field must contain to count as a fuzzy match
+DEFAULT_THRESHOLD = 0.5
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def normalize(text):
+    """Lower-case `text` and collapse everything but word characters."""
+    return ' '.join(_WORD_RE.findall((text or '').lower()))
+
+
+def trigrams(text):
+    """Return the set of padded trigrams for every word in `text`."""
+    grams = set()
+    for word in normalize(text).split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """
+    Inverted index of trigram -> plant pks over `SEARCH_FIELDS`.
+
+    Attributes:
+        postings (dict): (field, trigram) -> set of plant pks.
+        documents (dict): pk -> {field: normalized text} used for ranking.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(set)
+        self.documents = {}
+
+    @classmethod
+    def from_queryset(cls, queryset):
+        """Build an index from a `Plant` queryset without loading models."""
+        index = cls()
+        for row in queryset.values('pk', *SEARCH_FIELDS).iterator():
+            index.add(row['pk'], row)
+        return index
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add(self, pk, values):
+        """Index (or re-index) one plant from a mapping of field values."""
+        self.remove(pk)
+        document = {}
+        for field in SEARCH_FIELDS:
+            text = values.get(field) or ''
+            document[field] = normalize(text)
+            for gram in trigrams(text):
+                self.postings[(field, gram)].add(pk)
+        self.documents[pk] = document
+
+    def remove(self, pk):
+        """Drop one plant from the index; unknown pks are ignored."""
+        document = self.documents.pop(pk, None)
+        if document is None:
+            return
+        for field, text in document.items():
+            for gram in trigrams(text):
+                key = (field, gram)
+                self.postings[key].discard(pk)
+                if not self.postings[key]:
+                    del self.postings[key]
+
+    def search(self, query, limit=20, threshold=DEFAULT_THRESHOLD):
+        """
+        Return up to `limit` plant pks matching `query`, best match first.
+
+        A field matches when it contains `query` as a substring, or when it
+        shares at least `threshold` of the query's trigrams (typo tolerance).
+        """
+        needle = normalize(query)
+        query_grams = trigrams(needle)
+        if not query_grams:
+            return []
+
+        scores = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            hits = Counter()
+            for gram in query_grams:
+                hits.update(self.postings.get((field, gram), ()))
+            for pk, count in hits.items():
+                overlap = count / len(query_grams)
+                if needle in self.documents[pk][field]:
+                    overlap += 1
+                elif overlap < threshold:
+                    continue
+                scores[pk] = max(scores.get(pk, 0), overlap * weight)
+
+        ranked = sorted(scores, key=lambda pk: (-scores[pk], pk))
+        return ranked[:limit]
+
+
+_search_index = None
+_search_version = None
+
+
+def get_search_index():
+    """
+    Return the process-wide `TrigramIndex`, building it on first use and
+    rebuilding it when the shared catalogue version has moved.
+    """
+    global _search_index, _search_version
+    version = catalogue_version()
+    if _search_index is None or version != _search_version:
+        from .models import Plant
+        _search_index = TrigramIndex.from_queryset(Plant.objects.all())
+        _search_version = version
+    return _search_index
+
+
+def _follow_own_write():
+    """
+    Return True if the index is built and only misses this process's latest
+    write (which already bumped the catalogue version), and adopt that
+    version. Otherwise another worker wrote too, so drop the index.
+
+    The +1 test is only sound when every worker bumps the same counter, i.e.
+    `plant_versions` is a shared backend (see checks.py); with locmem each
+    process counts its own writes and never sees the others'.
+    """
+    global _search_version
+    if _search_index is None:
+        return False
+    version = catalogue_version()
+    if _search_version is not None and version == _search_version + 1:
+        _search_version = version
+        return True
+    clear_search_index()
+    return False
+
+
+def index_plant(plant):
+    """Re-index one saved plant if the index has already been built."""
+    if _follow_own_write():
+        _search_index.add(plant.pk, vars(plant))
+
+
+def unindex_plant(pk):
+    """Remove one plant from the index if it has already been built."""
+    if _follow_own_write():
+        _search_index.remove(pk)
+
+
+def clear_search_index():
+    """Drop the cached `TrigramIndex` so the next lookup rebuilds it."""
+    global _search_index, _search_version
+    _search_index = _search_version = None
@@ -0,0 +1,80 @@
+"""
+Signal receivers that keep derived plant data in sync with the database.
+"""
+
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .cache import bump_catalogue_version, invalidate_plants
+from .models import Nursery, Plant, PlantLink
+from .name_cache import invalidate_plant_names
+from .search import index_plant, unindex_plant
+from .sqlite import apply_pragmas
+from .traits import clear_trait_index
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    apply_pragmas(connection)
+
+
+# must stay the first Plant receiver: the in-process indexes below compare
+# their version with the one bumped here
+@receiver([post_save, post_delete], sender=Plant)
+def bump_plant_catalogue(sender, **kwargs):
+    bump_catalogue_version()
+
+
+@receiver([post_save, post_delete], sender=Plant)
+def invalidate_trait_index(sender, **kwargs):
+    clear_trait_index()
+
+
+@receiver(post_save, sender=Plant)
+def update_search_index(sender, instance, **kwargs):
+    index_plant(instance)
+
+
+@receiver([post_save, post_delete], sender=Plant)
+def invalidate_name_cache(sender, instance, **kwargs):
+    invalidate_plant_names(instance)
+
+
+@receiver(post_delete, sender=Plant)
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_plant(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Plant)
+def invalidate_plant_page(sender, instance, **kwargs):
+    invalidate_plants([instance.pk])
+
+
+@receiver(post_save, sender=PlantLink)
+@receiver(pre_delete, sender=PlantLink)
+def invalidate_link_plant_pages(sender, instance, **kwargs):
+    if instance.pk is not None:
+        invalidate_plants(instance.plant.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Nursery)
+@receiver(pre_delete, sender=Nursery)
+def invalidate_nursery_plant_pages(sender, instance, **kwargs):
+    if instance.pk is not None:
+        invalidate_plants(instance.plants.values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=PlantLink.plant.through)
+@receiver(m2m_changed, sender=Nursery.plants.through)
+def invalidate_linked_plant_pages(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        # instance is the Plant whose links / nurseries changed
+        invalidate_plants([instance.pk])
+    elif action == 'pre_clear':
+        related = instance.plant if isinstance(instance, PlantLink) else instance.plants
+        invalidate_plants(related.values_list('pk', flat=True))
+    else:
+        invalidate_plants(pk_set)
@@ -0,0 +1,66 @@
+"""
+SQLite performance profile applied to every new database connection.
+
+Out of the box SQLite uses a rollback journal and synchronous=FULL, so every
+commit fsyncs twice and a writer blocks all readers. `SQLITE_PRAGMAS` in
+config/settings.py switches to:
+    - journal_mode=WAL: readers keep reading while one writer commits
+    - synchronous=NORMAL: fsync at checkpoints only (safe with WAL; a power
+      loss can drop the last commits but not corrupt the database)
+    - mmap_size, cache_size, temp_store: fewer read syscalls and no temp files
+    - busy_timeout: writers wait for the lock instead of failing at once
+
+`apply_pragmas` runs from a `connection_created` receiver in `signals.py`.
+`python manage.py bench_sqlite` compares the profile with SQLite's defaults
+under concurrent readers and writers.
+"""
+
+from django.conf import settings
+
+# pragmas the profile may set, and whether their value is a keyword
+ALLOWED_PRAGMAS = {
+    'journal_mode': True,
+    'synchronous': True,
+    'temp_store': True,
+    'mmap_size': False,
+    'cache_size': False,
+    'busy_timeout': False,
+    'wal_autocheckpoint': False,
+}
+
+
+def get_pragmas():
+    return getattr(settings, 'SQLITE_PRAGMAS', {})
+
+
+def pragma_statements(pragmas):
+    """
+    Return the `PRAGMA name = value` statements for `pragmas`.
+
+    Raises:
+        ValueError: If a pragma is not in ALLOWED_PRAGMAS or its value is not
+            a plain keyword / integer (PRAGMA values cannot be parameters).
+    """
+    statements = []
+    for name, value in pragmas.items():
+        if name not in ALLOWED_PRAGMAS:
+            raise ValueError(f"Unsupported SQLite pragma: {name!r}")
+        if ALLOWED_PRAGMAS[name]:
+            valid = isinstance(value, str) and value.isalpha()
+        else:
+            valid = isinstance(value, int) and not isinstance(value, bool)
+        if not valid:
+            raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+        statements.append(f'PRAGMA {name} = {value}')
+    return statements
+
+
+def apply_pragmas(connection):
+    """Run the profile on a new Django connection, if it is SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    statements = pragma_statements(get_pragmas())
+    if statements:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
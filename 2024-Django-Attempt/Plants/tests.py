@@ -1,3 +1,690 @@
-from django.test import TestCase
+import base64
+import csv
+import io
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.core.serializers import deserialize, serialize
+from django.db import connection, models
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .admin import duplicate_objects
+from .cache import bump_catalogue_version, invalidate_all_plants
+from .checks import check_version_cache
+from .export import iter_export
+from .importer import CatalogueImporter, read_json_fixture
+from .models import Nursery, Plant, PlantLink
+from .name_cache import (
+    NameCache, clear_name_cache, get_name_cache, plant_for_name, plant_id_for_name,
+)
+from .pagination import decode_cursor, encode_cursor
+from .search import clear_search_index, get_search_index
+from .serializers import plant_serializer
+from .sqlite import pragma_statements
+from .traits import TRAIT_FIELDS, TraitIndex, get_trait_index, trait_mask_for
+from .zones import zone_code, zone_ordinal
 
 # Create your tests here.
+
+
+def make_plant(name, **kwargs):
+    kwargs.setdefault('description', '')
+    return Plant.objects.create(name_common=name, **kwargs)
+
+
+class PlantTraitMaskTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hybrid = make_plant('Hybrid', is_hybrid=True)
+        cls.organic = make_plant('Organic', is_organic=True, is_non_gmo=True)
+        cls.both = make_plant('Both', is_hybrid=True, is_organic=True)
+        cls.plain = make_plant('Plain')
+
+    def test_trait_fields_cover_every_boolean_field(self):
+        booleans = [
+            field.name for field in Plant._meta.get_fields()
+            if isinstance(field, models.BooleanField)
+        ]
+        self.assertCountEqual(booleans, TRAIT_FIELDS)
+
+    def test_save_keeps_mask_in_sync(self):
+        self.plain.is_waterwise = True
+        self.plain.save(update_fields=['is_waterwise'])
+        self.plain.refresh_from_db()
+        self.assertEqual(self.plain.trait_mask, trait_mask_for(['is_waterwise']))
+
+    def test_deferred_save_keeps_derived_fields(self):
+        plant = Plant.objects.only('name_common').get(pk=self.both.pk)
+        plant.name_common = 'Renamed'
+        plant.save()
+        plant = Plant.objects.only('is_organic').get(pk=self.both.pk)
+        plant.is_organic = False
+        plant.save()
+        plant = Plant.objects.get(pk=self.both.pk)
+        self.assertEqual(plant.name_common, 'Renamed')
+        self.assertEqual(plant.trait_mask, trait_mask_for(['is_hybrid']))
+        self.assertEqual(plant.hardiness_zone_low_ord, zone_ordinal('8b'))
+
+    def test_update_fields_without_sources_skip_derived_fields(self):
+        Plant.objects.filter(pk=self.hybrid.pk).update(trait_mask=0)
+        self.hybrid.name_common = 'Renamed'
+        self.hybrid.save(update_fields=['name_common'])
+        self.hybrid.refresh_from_db()
+        self.assertEqual(self.hybrid.trait_mask, 0)
+
+    def test_filter_any(self):
+        found = Plant.objects.filter_any('is_hybrid', 'is_non_gmo')
+        self.assertCountEqual(found, [self.hybrid, self.organic, self.both])
+
+    def test_filter_exact(self):
+        found = Plant.objects.filter_exact('is_hybrid', 'is_organic')
+        self.assertCountEqual(found, [self.both])
+
+    def test_unknown_trait(self):
+        with self.assertRaises(ValueError):
+            Plant.objects.filter_any('is_purple')
+
+    def test_sync_derived_fields_after_update(self):
+        Plant.objects.filter(pk=self.plain.pk).update(is_heat_tolerant=True)
+        self.assertEqual(Plant.objects.all().sync_derived_fields(), 1)
+        self.assertCountEqual(
+            Plant.objects.filter_exact('is_heat_tolerant'), [self.plain]
+        )
+
+    def test_trait_index_matches_queryset(self):
+        index = TraitIndex.from_queryset(Plant.objects.all())
+        self.assertCountEqual(
+            index.match_any('is_hybrid', 'is_non_gmo'),
+            [self.hybrid.pk, self.organic.pk, self.both.pk],
+        )
+        self.assertCountEqual(
+            index.match_all('is_hybrid', 'is_organic'), [self.both.pk]
+        )
+
+    def test_trait_index_rebuilt_after_save(self):
+        self.assertEqual(len(get_trait_index()), 4)
+        make_plant('Fifth')
+        self.assertEqual(len(get_trait_index()), 5)
+
+
+class PlantHardinessZoneTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.cold = make_plant('Cold', hardiness_zone_low='3a', hardiness_zone_high='6b')
+        cls.warm = make_plant('Warm', hardiness_zone_low='8a', hardiness_zone_high='10b')
+        cls.wide = make_plant('Wide', hardiness_zone_low='5a', hardiness_zone_high='11a')
+        cls.unknown = make_plant('Unknown', hardiness_zone_low='na', hardiness_zone_high='na')
+
+    def test_zone_ordinal_sorts_numerically(self):
+        self.assertLess(zone_ordinal('8b'), zone_ordinal('10a'))
+        self.assertEqual(zone_ordinal('1a'), 1)
+        self.assertEqual(zone_ordinal('13b'), 26)
+        self.assertIsNone(zone_ordinal('na'))
+        for code, _ in Plant.HARDINESS_ZONES:
+            self.assertEqual(zone_code(zone_ordinal(code)), code)
+
+    def test_invalid_zone(self):
+        with self.assertRaises(ValueError):
+            zone_ordinal('14a')
+
+    def test_survives_in(self):
+        self.assertCountEqual(Plant.objects.survives_in('10a'), [self.warm, self.wide])
+        self.assertCountEqual(Plant.objects.survives_in('6b'), [self.cold, self.wide])
+
+    def test_overlaps_zones(self):
+        self.assertCountEqual(
+            Plant.objects.overlaps_zones('6a', '8a'), [self.cold, self.warm, self.wide]
+        )
+        self.assertCountEqual(Plant.objects.overlaps_zones('12a', '11b'), [])
+
+    def test_unknown_zones_rejected(self):
+        for zone in ('na', '', '14a'):
+            with self.subTest(zone=zone):
+                with self.assertRaises(ValueError):
+                    Plant.objects.survives_in(zone)
+                with self.assertRaises(ValueError):
+                    Plant.objects.overlaps_zones(zone, '8b')
+
+    def test_unknown_zones_are_bad_requests(self):
+        for query in ('zone=na', 'zones=na', 'zones=na-8b', 'zones=8b-na', 'zones=-8b'):
+            with self.subTest(query=query):
+                response = self.client.get(reverse('plants') + '?format=json&' + query)
+                self.assertEqual(response.status_code, 400)
+
+
+class PlantSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.rose = make_plant('China Rose', name_scientific='Rosa chinensis')
+        cls.blanket = make_plant(
+            'Blanket Flower', name_scientific='Gaillardia aristata',
+            description='Drought tolerant perennial with red petals.',
+        )
+        cls.mint = make_plant('Mint', description='Spreads fast; keep it in a pot.')
+
+    def setUp(self):
+        clear_search_index()
+
+    def test_substring_match(self):
+        self.assertEqual(get_search_index().search('ose'), [self.rose.pk])
+        self.assertEqual(get_search_index().search('gaillard'), [self.blanket.pk])
+
+    def test_typo_tolerant_match(self):
+        self.assertEqual(get_search_index().search('blanket flwoer'), [self.blanket.pk])
+
+    def test_name_outranks_description(self):
+        red = make_plant('Red Maple')
+        self.assertEqual(get_search_index().search('red'), [red.pk, self.blanket.pk])
+
+    def test_index_follows_saves_and_deletes(self):
+        index = get_search_index()
+        self.mint.name_common = 'Peppermint'
+        self.mint.save()
+        self.assertEqual(index.search('pepper'), [self.mint.pk])
+        self.mint.delete()
+        self.assertEqual(index.search('pepper'), [])
+        self.assertEqual(len(index), 2)
+
+    def test_search_view(self):
+        response = self.client.get(reverse('plant-search'), {'q': 'rosa'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [
+            {'pk': self.rose.pk, 'name_common': 'China Rose', 'name_scientific': 'Rosa chinensis',
+             'url': reverse('plant-detail', args=[self.rose.pk])},
+        ])
+
+
+class PlantListPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # duplicate names make pk the tie-breaker
+        cls.plants = [make_plant(name) for name in ['Basil', 'Aster', 'Basil', 'Dill', 'Chive']]
+        cls.ordered = sorted(cls.plants, key=lambda plant: (plant.name_common, plant.pk))
+
+    def get_page(self, **params):
+        response = self.client.get(reverse('plants'), {'format': 'json', **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cursor_pages_walk_forward_and_back(self):
+        seen = []
+        page = self.get_page(limit=2)
+        pages = [page]
+        while page['pagination']['next']:
+            page = self.get_page(limit=2, cursor=page['pagination']['next'])
+            pages.append(page)
+        for page in pages:
+            seen.extend(row['name_common'] for row in page['data'])
+        self.assertEqual(seen, [plant.name_common for plant in self.ordered])
+        self.assertEqual(len(pages), 3)
+        self.assertFalse(pages[0]['pagination']['has_prev'])
+
+        back = self.get_page(limit=2, cursor=pages[-1]['pagination']['prev'])
+        self.assertEqual(back['data'], pages[1]['data'])
+        back = self.get_page(limit=2, cursor=back['pagination']['prev'])
+        self.assertEqual(back['data'], pages[0]['data'])
+        self.assertIsNone(back['pagination']['prev'])
+
+    def test_total_is_optional(self):
+        self.assertIsNone(self.get_page()['pagination']['total'])
+        self.assertEqual(self.get_page(total='1')['pagination']['total'], 5)
+
+    def test_offset_mode(self):
+        page = self.get_page(page=2, limit=2)
+        self.assertEqual(
+            [row['name_common'] for row in page['data']],
+            [plant.name_common for plant in self.ordered[2:4]],
+        )
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('plants'), {'format': 'json', 'cursor': 'nope'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_with_wrong_value_types(self):
+        payloads = (['next', {}, {}], ['prev', 'Basil', [1]], ['next', 'Basil', None], ['next', 'Basil', True])
+        for payload in payloads:
+            cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+            with self.subTest(payload=payload):
+                response = self.client.get(reverse('plants'), {'format': 'json', 'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+
+    def test_limit_below_one_is_rejected(self):
+        for limit in ('0', '-1'):
+            for extra in ({}, {'page': 1}):
+                with self.subTest(limit=limit, **extra):
+                    response = self.client.get(
+                        reverse('plants'), {'format': 'json', 'limit': limit, **extra}
+                    )
+                    self.assertEqual(response.status_code, 400)
+        for limit in ('0', '-1'):
+            with self.subTest(search_limit=limit):
+                response = self.client.get(reverse('plant-search'), {'q': 'basil', 'limit': limit})
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(self.get_page(limit=1000)['data']), 5)
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor(['Basil', 3], 'prev')
+        self.assertEqual(decode_cursor(cursor), ('prev', ['Basil', 3]))
+
+
+class PlantSerializerTests(TestCase):
+    def test_matches_django_serializer(self):
+        make_plant('Aster', is_hybrid=True, hardiness_zone_low='5a', height_max=12)
+        make_plant('Basil', description='Sweet.', exposure='pd')
+        queryset = Plant.objects.order_by('pk')
+        expected = [obj['fields'] for obj in json.loads(serialize('json', queryset))]
+        self.assertEqual(json.loads(json.dumps(plant_serializer.serialize(queryset))), expected)
+
+
+class CatalogueExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.aster = make_plant('Aster')
+        cls.basil = make_plant('Basil')
+        cls.link = PlantLink.objects.create(title='Guide', url='https://example.com', type='bl')
+        cls.link.plant.set([cls.aster, cls.basil])
+        cls.bare_link = PlantLink.objects.create(title='Bare', url='https://example.com', type='ot')
+        cls.nursery = Nursery.objects.create(name='Local')
+        cls.nursery.plants.set([cls.basil])
+
+    def test_ndjson_round_trips_through_jsonl_deserializer(self):
+        text = ''.join(iter_export('ndjson', chunk_size=2))
+        self.assertEqual(len(text.splitlines()), 5)
+        objects = {
+            (obj.object._meta.model_name, obj.object.pk): obj
+            for obj in deserialize('jsonl', text)
+        }
+        link = objects[('plantlink', self.link.pk)]
+        self.assertCountEqual(link.m2m_data['plant'], [self.aster.pk, self.basil.pk])
+        self.assertEqual(objects[('plantlink', self.bare_link.pk)].m2m_data['plant'], [])
+        self.assertEqual(objects[('nursery', self.nursery.pk)].m2m_data['plants'], [self.basil.pk])
+        self.assertEqual(objects[('plant', self.aster.pk)].object.name_common, 'Aster')
+
+    def test_csv_export(self):
+        rows = list(csv.DictReader(''.join(iter_export('csv', 'plantlink')).splitlines()))
+        self.assertEqual([row['title'] for row in rows], ['Guide', 'Bare'])
+        self.assertEqual(rows[0]['plant'], f'{self.aster.pk};{self.basil.pk}')
+
+    def test_csv_needs_model(self):
+        with self.assertRaises(ValueError):
+            iter_export('csv')
+
+    def test_export_view_is_staff_only(self):
+        url = reverse('plant-export', args=['ndjson'])
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(url, {'model': 'nursery'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        record = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(record['fields']['plants'], [self.basil.pk])
+
+
+class CatalogueImportTests(TestCase):
+    def import_rows(self, rows, batch_size=2):
+        return CatalogueImporter(batch_size=batch_size).import_rows(rows)
+
+    def test_imports_data_json_fixture(self):
+        fixture = settings.BASE_DIR / 'data.json'
+        reports = self.import_rows(read_json_fixture(fixture, read_size=512))
+        self.assertEqual(reports['plant'].created, 5)
+        self.assertEqual(reports['plantlink'].created, 6)
+        self.assertEqual(PlantLink.objects.get(pk=2).plant.get().name_scientific, 'Gaillardia aristata')
+        aster = Plant.objects.get(pk=8)
+        self.assertEqual(aster.hardiness_zone_low_ord, zone_ordinal('3a'))
+
+    def write_fixture(self, text):
+        tmp_dir = self.enterContext(tempfile.TemporaryDirectory())
+        path = Path(tmp_dir) / 'fixture.json'
+        path.write_text(text, encoding='utf-8')
+        return path
+
+    def test_non_array_fixture_fails_before_reading_rows(self):
+        with self.assertRaisesMessage(ValueError, 'is not a JSON array'):
+            read_json_fixture(self.write_fixture('{"model": "Plants.plant"}'))
+
+    def test_malformed_fixture_is_a_command_error_and_imports_nothing(self):
+        plant = {'model': 'Plants.plant', 'pk': 1, 'fields': {'name_common': 'Mint'}}
+        path = self.write_fixture(json.dumps([plant, plant]).replace('}, {', '}, {"oops', 1))
+        with self.assertRaises(CommandError):
+            call_command('import_catalogue', str(path), '--batch-size', '1', stdout=io.StringIO())
+        self.assertFalse(Plant.objects.filter(name_common='Mint').exists())
+
+    def test_reimport_updates_instead_of_duplicating(self):
+        rows = [
+            ('plant', {'common_name': 'Mint', 'scientific_name': 'Mentha', 'earth_kind': 'yes',
+                       'hardiness_zone_start': 5, 'hardiness_zone_end': 9}),
+            ('plant', {'common_name': 'Dill', 'plant_type': 'Annual', 'height': '24.0'}),
+            ('plant', {'common_name': 'Sage', 'hardiness_zone_low': 'Purple'}),
+        ]
+        first = self.import_rows(rows)['plant']
+        self.assertEqual((first.created, first.updated), (2, 0))
+        self.assertEqual(first.errors, [(3, "hardiness_zone_low: invalid hardiness zone 'Purple'")])
+
+        mint = Plant.objects.get(name_common='Mint')
+        self.assertTrue(mint.is_earth_kind)
+        self.assertEqual((mint.hardiness_zone_low, mint.hardiness_zone_high), ('5a', '9b'))
+        self.assertEqual(mint.trait_mask, trait_mask_for(['is_earth_kind']))
+        self.assertEqual(Plant.objects.get(name_common='Dill').plant_type, 'an')
+
+        second = self.import_rows([
+            ('plant', {'name_common': 'Mint', 'name_scientific': 'Mentha', 'is_waterwise': True}),
+        ])['plant']
+        self.assertEqual((second.created, second.updated), (0, 1))
+        self.assertEqual(
+            Plant.objects.get(name_common='Mint').trait_mask,
+            trait_mask_for(['is_earth_kind', 'is_waterwise']),
+        )
+
+    def test_links_are_replaced_as_a_set(self):
+        aster, basil = make_plant('Aster'), make_plant('Basil')
+        nursery = Nursery.objects.create(name='Local')
+        nursery.plants.set([aster])
+        report = self.import_rows([('nursery', {'name': 'Local', 'plants': f'{basil.pk};999'})])['nursery']
+        self.assertEqual((report.updated, report.links), (1, 1))
+        self.assertEqual(list(nursery.plants.all()), [basil])
+
+    def test_updates_only_write_supplied_columns(self):
+        make_plant('Mint', plant_type='pe', description='Spreads.')
+        make_plant('Dill', plant_type='an', description='Feathery.')
+        report = self.import_rows([
+            ('plant', {'name_common': 'Mint', 'description': 'Spreads fast.'}),
+            ('plant', {'name_common': 'Dill', 'plant_type': 'Biennial'}),
+        ])['plant']
+        self.assertEqual(report.updated, 2)
+        mint, dill = Plant.objects.get(name_common='Mint'), Plant.objects.get(name_common='Dill')
+        self.assertEqual((mint.plant_type, mint.description), ('pe', 'Spreads fast.'))
+        self.assertEqual((dill.plant_type, dill.description), ('bi', 'Feathery.'))
+
+    def test_repeated_new_row_keeps_links_of_the_last_one(self):
+        aster, basil = make_plant('Aster'), make_plant('Basil')
+        report = self.import_rows([
+            ('nursery', {'name': 'Local', 'plants': f'{aster.pk}'}),
+            ('nursery', {'name': 'Local', 'plants': f'{basil.pk}'}),
+        ])['nursery']
+        self.assertEqual((report.created, report.links), (1, 1))
+        self.assertEqual(list(Nursery.objects.get(name='Local').plants.all()), [basil])
+
+
+class AdminDuplicateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.plants = [make_plant(f'Plant {i}', is_hybrid=True) for i in range(20)]
+        cls.link = PlantLink.objects.create(title='Guide', url='https://example.com', type='bl')
+        cls.link.plant.set(cls.plants[:2])
+        cls.nursery = Nursery.objects.create(name='Local')
+        cls.nursery.plants.set(cls.plants[:1])
+
+    def test_plant_copies_keep_links_in_constant_queries(self):
+        with self.assertNumQueries(8):
+            # select + savepoint + insert + (select, insert) per relation + release
+            copies = duplicate_objects(Plant.objects.all(), 'name_common', ['links', 'nursery'])
+        self.assertEqual(len(copies), 20)
+        copy = Plant.objects.get(name_common='[COPY] Plant 0')
+        self.assertTrue(copy.is_hybrid)
+        self.assertEqual(list(copy.links.all()), [self.link])
+        self.assertEqual(list(copy.nursery_set.all()), [self.nursery])
+        self.assertEqual(self.link.plant.count(), 4)
+
+    def test_nursery_copy_keeps_plants(self):
+        copy, = duplicate_objects(Nursery.objects.all(), 'name', ['plants'])
+        self.assertEqual(copy.name, '[COPY] Local')
+        self.assertEqual(list(copy.plants.all()), self.plants[:1])
+
+
+class PlantDetailCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.plant = make_plant('Aster', description='Purple daisies.')
+        cls.link = PlantLink.objects.create(title='Guide', url='https://example.com', type='bl')
+
+    def setUp(self):
+        caches['plant_pages'].clear()
+        self.url = reverse('plant-detail', args=[self.plant.pk])
+
+    def test_second_hit_skips_the_database(self):
+        self.assertContains(self.client.get(self.url), 'Purple daisies.')
+        with self.assertNumQueries(0):
+            self.assertContains(self.client.get(self.url), 'Purple daisies.')
+
+    def test_missing_plant_is_404(self):
+        self.assertEqual(self.client.get(reverse('plant-detail', args=[999])).status_code, 404)
+
+    def test_save_during_render_is_not_cached(self):
+        from . import views
+        render = views.render_to_string
+
+        def render_then_edit(*args, **kwargs):
+            html = render(*args, **kwargs)
+            # another request edits the plant while this one renders
+            plant = Plant.objects.get(pk=self.plant.pk)
+            plant.description = 'Blue daisies.'
+            plant.save()
+            return html
+
+        with mock.patch.object(views, 'render_to_string', render_then_edit):
+            self.assertContains(self.client.get(self.url), 'Purple daisies.')
+        self.assertContains(self.client.get(self.url), 'Blue daisies.')
+
+    def test_plant_save_invalidates(self):
+        self.client.get(self.url)
+        self.plant.description = 'Blue daisies.'
+        self.plant.save()
+        self.assertContains(self.client.get(self.url), 'Blue daisies.')
+
+    def test_link_changes_invalidate(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        version = caches['plant_versions'].get(f'plants:{self.plant.pk}:version')
+        self.link.plant.add(self.plant)
+        self.link.title = 'Better guide'
+        self.link.save()
+        self.plant.links.clear()
+        self.assertEqual(caches['plant_versions'].get(f'plants:{self.plant.pk}:version'), version + 3)
+
+    def test_lost_counters_do_not_revive_old_fragments(self):
+        self.client.get(self.url)
+        Plant.objects.filter(pk=self.plant.pk).update(description='Bulk daisies.')
+        # the counters are gone (backend restarted or cleared) but the fragment is not
+        caches['plant_versions'].clear()
+        self.assertContains(self.client.get(self.url), 'Bulk daisies.')
+
+    def test_bulk_invalidation(self):
+        self.client.get(self.url)
+        Plant.objects.filter(pk=self.plant.pk).update(description='Bulk daisies.')
+        invalidate_all_plants()
+        self.assertContains(self.client.get(self.url), 'Bulk daisies.')
+
+
+class QueryCountGuardMixin:
+    """
+    Fails a test when a page's query count grows with the number of rows,
+    i.e. when a template or view has picked up an N+1 query.
+    """
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def assertQueryCountConstant(self, url, add_rows, rows=3):
+        add_rows(rows)
+        caches['plant_pages'].clear()
+        few = self.count_queries(url)
+        add_rows(rows * 3)
+        caches['plant_pages'].clear()
+        many = self.count_queries(url)
+        self.assertEqual(
+            few, many, f"{url} ran {few} queries with {rows} rows but {many} with {rows * 4}"
+        )
+
+
+class PlantQueryCountTests(QueryCountGuardMixin, TestCase):
+    def add_plants(self, count):
+        for i in range(count):
+            plant = make_plant(f'Plant {Plant.objects.count()}')
+            link = PlantLink.objects.create(title=f'Guide {i}', url='https://example.com', type='bl')
+            link.plant.add(plant)
+            Nursery.objects.create(name=f'Nursery {i}').plants.add(plant)
+
+    def test_plant_list(self):
+        self.assertQueryCountConstant(reverse('plants'), self.add_plants)
+
+    def test_plant_list_json(self):
+        self.assertQueryCountConstant(reverse('plants') + '?format=json', self.add_plants)
+
+    def test_plant_detail(self):
+        plant = make_plant('Aster')
+        url = reverse('plant-detail', args=[plant.pk])
+
+        def add_links(count):
+            for i in range(count):
+                PlantLink.objects.create(title=f'Guide {i}', url='https://example.com', type='bl').plant.add(plant)
+                Nursery.objects.create(name=f'Nursery {i}').plants.add(plant)
+
+        self.assertQueryCountConstant(url, add_links)
+        self.assertContains(self.client.get(url), 'Blog:  <a href="https://example.com">Guide 0</a>')
+
+    def test_link_str_uses_label(self):
+        link = PlantLink(title='Guide', type='mg')
+        self.assertEqual(str(link), 'Master Gardener:\t"Guide"')
+
+
+class SQLitePragmaTests(TestCase):
+    def test_profile_applied_to_connection(self):
+        with connection.cursor() as cursor:
+            values = {}
+            for name in ('synchronous', 'temp_store', 'busy_timeout', 'cache_size'):
+                cursor.execute(f'PRAGMA {name}')
+                values[name] = cursor.fetchone()[0]
+        expected = {
+            'synchronous': 1,  # NORMAL
+            'temp_store': 2,  # MEMORY
+            'busy_timeout': settings.SQLITE_PRAGMAS['busy_timeout'],
+            'cache_size': settings.SQLITE_PRAGMAS['cache_size'],
+        }
+        self.assertEqual(values, expected)
+
+    def test_pragma_statements_rejects_unknown_and_unsafe_values(self):
+        self.assertEqual(pragma_statements({'journal_mode': 'wal', 'mmap_size': 0}),
+                         ['PRAGMA journal_mode = wal', 'PRAGMA mmap_size = 0'])
+        for pragmas in ({'writable_schema': 1}, {'journal_mode': 'wal; DROP'},
+                        {'busy_timeout': '5000'}):
+            with self.assertRaises(ValueError):
+                pragma_statements(pragmas)
+
+
+class PlantNameCacheTests(TestCase):
+    def setUp(self):
+        clear_name_cache()
+        self.cache = get_name_cache()
+        self.rose = make_plant('China Rose', name_scientific='Rosa chinensis')
+
+    def test_read_through_hits_and_misses(self):
+        start = self.cache.stats()
+        with self.assertNumQueries(2):
+            for _ in range(3):
+                self.assertEqual(plant_id_for_name('Rosa chinensis'), self.rose.pk)
+                self.assertEqual(plant_for_name('China Rose', field='name_common')['id'],
+                                 self.rose.pk)
+        stats = self.cache.stats()
+        self.assertEqual(stats['misses'] - start['misses'], 2)
+        self.assertEqual(stats['hits'] - start['hits'], 4)
+
+    def test_save_and_delete_invalidate(self):
+        self.assertIsNone(plant_id_for_name('Aster alpinus'))
+        aster = make_plant('Alpine Aster', name_scientific='Aster alpinus')
+        self.assertEqual(plant_id_for_name('Aster alpinus'), aster.pk)
+
+        plant_id_for_name('Rosa chinensis')
+        self.rose.name_scientific = 'Rosa indica'
+        self.rose.save()
+        self.assertIsNone(plant_id_for_name('Rosa chinensis'))
+        self.assertEqual(plant_for_name('Rosa indica')['name_common'], 'China Rose')
+
+        aster.delete()
+        self.assertIsNone(plant_id_for_name('Aster alpinus'))
+
+    def test_lru_eviction(self):
+        cache = NameCache(max_size=2)
+        for pk, key in enumerate(('a', 'b', 'a', 'c'), start=1):
+            cache.get(key, lambda: (pk, key.upper()))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get('a', lambda: (9, 'reloaded')), 'A')
+        self.assertEqual(cache.get('b', lambda: (9, 'reloaded')), 'reloaded')
+
+    def test_insert_after_miss_is_found(self):
+        self.assertIsNone(plant_id_for_name('Aster alpinus'))
+        self.assertIsNone(plant_for_name('Aster alpinus'))
+        # bulk_create sends no post_save, so no receiver drops the names
+        aster, = Plant.objects.bulk_create([
+            Plant(name_common='Alpine Aster', name_scientific='Aster alpinus', description='')
+        ])
+        self.assertEqual(plant_id_for_name('Aster alpinus'), aster.pk)
+        self.assertEqual(plant_for_name('Aster alpinus')['id'], aster.pk)
+
+    def test_invalidation_during_load_is_not_cached(self):
+        cache = NameCache()
+
+        def load():
+            cache.invalidate(['k'])  # a concurrent save
+            return 1, 'stale'
+
+        self.assertEqual(cache.get('k', load), 'stale')
+        self.assertEqual(len(cache), 0)
+
+
+class CrossWorkerInvalidationTests(TestCase):
+    """Another worker's write only reaches this one through the catalogue version."""
+
+    def setUp(self):
+        caches['plant_pages'].clear()
+        self.rose = make_plant('China Rose', name_scientific='Rosa chinensis', is_hybrid=True)
+
+    def other_worker_renames(self):
+        # update() skips this process's signals, like a write in another worker
+        Plant.objects.filter(pk=self.rose.pk).update(
+            name_common='Tea Rose', name_scientific='Rosa odorata', trait_mask=0,
+        )
+        bump_catalogue_version()
+
+    def test_indexes_rebuild_when_version_moves(self):
+        self.assertEqual(get_search_index().search('china rose'), [self.rose.pk])
+        self.assertEqual(list(get_trait_index().match_any('is_hybrid')), [self.rose.pk])
+        self.assertEqual(plant_id_for_name('Rosa chinensis'), self.rose.pk)
+
+        self.other_worker_renames()
+        self.assertEqual(get_search_index().search('tea rose'), [self.rose.pk])
+        self.assertEqual(list(get_trait_index().match_any('is_hybrid')), [])
+        self.assertIsNone(plant_id_for_name('Rosa chinensis'))
+        self.assertEqual(plant_id_for_name('Rosa odorata'), self.rose.pk)
+
+    def test_own_writes_update_the_index_in_place(self):
+        index = get_search_index()
+        aster = make_plant('Aster')
+        self.assertIs(get_search_index(), index)
+        self.assertEqual(index.search('aster'), [aster.pk])
+
+
+class VersionCacheCheckTests(SimpleTestCase):
+    def caches_with(self, backend):
+        return {**settings.CACHES, 'plant_versions': {'BACKEND': backend}}
+
+    def test_process_local_backend_warns(self):
+        local = self.caches_with('django.core.cache.backends.locmem.LocMemCache')
+        with override_settings(CACHES=local):
+            self.assertEqual([w.id for w in check_version_cache(None)], ['Plants.W001'])
+
+    def test_shared_backend_passes(self):
+        shared = self.caches_with('django.core.cache.backends.filebased.FileBasedCache')
+        with override_settings(CACHES=shared):
+            self.assertEqual(check_version_cache(None), [])
@@ -0,0 +1,132 @@
+"""
+Bitmask encoding of the boolean `is_*` traits on `Plant`.
+
+Every trait gets one bit in `Plant.trait_mask`, so the "filter_any" (OR2.1)
+and "filter_exact" (OR2.2) requirements become a single bitwise test instead
+of a chain of OR/AND clauses over unindexed columns.
+
+`TraitIndex` keeps the same masks in a pair of numpy arrays so combined trait
+searches across the whole catalogue can be answered without a query.
+"""
+
+import numpy as np
+
+from .cache import catalogue_version
+
+# Bit positions are stored in the database - only ever append to this list.
+TRAIT_FIELDS = [
+    'is_hybrid',
+    'is_deadhead_suggested',
+    'is_good_for_border',
+    'is_good_for_container',
+    'is_good_for_landscape',
+    'is_good_for_rock_garden',
+    'is_good_for_shrubs',
+    'is_butterfly_attractor',
+    'is_pollinator_friendly',
+    'is_deer_resistant',
+    'is_mosquito_repellent',
+    'is_rabbit_resistant',
+    'is_drought_tolerant',
+    'is_heat_tolerant',
+    'is_earth_kind',
+    'is_waterwise',
+    'is_organic',
+    'is_non_gmo',
+]
+
+TRAIT_BITS = {name: 1 << bit for bit, name in enumerate(TRAIT_FIELDS)}
+
+
+def trait_mask_for(traits):
+    """
+    Return the combined bitmask for an iterable of trait field names.
+
+    Raises:
+        ValueError: If any name is not one of `TRAIT_FIELDS`.
+    """
+    mask = 0
+    for trait in traits:
+        try:
+            mask |= TRAIT_BITS[trait]
+        except KeyError:
+            raise ValueError(f"Unknown plant trait: {trait!r}") from None
+    return mask
+
+
+def trait_mask_from_values(values):
+    """
+    Return the bitmask for a mapping of trait field name -> bool.
+
+    Works for model instances (via `vars()`) as well as `.values()` rows.
+    """
+    mask = 0
+    for trait, bit in TRAIT_BITS.items():
+        if values.get(trait):
+            mask |= bit
+    return mask
+
+
+def traits_from_mask(mask):
+    """Return the list of trait field names set in `mask`."""
+    return [trait for trait, bit in TRAIT_BITS.items() if mask & bit]
+
+
+class TraitIndex:
+    """
+    In-memory, array-backed index of plant primary keys and their trait masks.
+
+    Attributes:
+        pks (ndarray): Plant primary keys, in the order they were loaded.
+        masks (ndarray): `trait_mask` for the plant at the same position.
+    """
+
+    def __init__(self, pks, masks):
+        self.pks = np.asarray(pks, dtype=np.int64)
+        self.masks = np.asarray(masks, dtype=np.uint32)
+
+    @classmethod
+    def from_queryset(cls, queryset):
+        """Build an index from a `Plant` queryset in a single query."""
+        rows = list(queryset.values_list('pk', 'trait_mask'))
+        if not rows:
+            return cls([], [])
+        pks, masks = zip(*rows)
+        return cls(pks, masks)
+
+    def __len__(self):
+        return len(self.pks)
+
+    def match_any(self, *traits):
+        """Return the pks of plants that have at least one of `traits`."""
+        mask = trait_mask_for(traits)
+        return self.pks[(self.masks & mask) != 0]
+
+    def match_all(self, *traits):
+        """Return the pks of plants that have every one of `traits`."""
+        mask = trait_mask_for(traits)
+        return self.pks[(self.masks & mask) == mask]
+
+
+_trait_index = None
+_trait_version = None
+
+
+def get_trait_index():
+    """
+    Return the process-wide `TraitIndex`, building it on first use and
+    rebuilding it when the shared catalogue version has moved.
+    """
+    global _trait_index, _trait_version
+    version = catalogue_version()
+    if _trait_index is None or version != _trait_version:
+        from .models import Plant
+        _trait_index = TraitIndex.from_queryset(Plant.objects.all())
+        _trait_version = version
+    return _trait_index
+
+
+def clear_trait_index():
+    """Drop the cached `TraitIndex` so the next lookup rebuilds it."""
+    global _trait_index, _trait_version
+    _trait_index = _trait_version = None
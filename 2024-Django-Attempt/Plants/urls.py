@@ -1,6 +1,6 @@
 from django.urls import path
 
-from Plants.views import PlantListView, PlantDetailView #, HomeView  #, plants
+from Plants.views import PlantListView, PlantDetailView, PlantSearchView, PlantExportView #, HomeView  #, plants
 
 urlpatterns = [
     # path('', HomeView.as_view(), name='home'),
@@ -10,4 +10,6 @@ urlpatterns = [
     
     # path('<int:pk>/', PlantDetailView.as_view(), name='plant-detail'),
     path('<int:pk>/', PlantDetailView, name='plant-detail'),
+    path('search/', PlantSearchView, name='plant-search'),
+    path('export.<str:export_format>', PlantExportView, name='plant-export'),
 ]
@@ -1,13 +1,23 @@
 from django.shortcuts import render, get_object_or_404
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.http import JsonResponse, StreamingHttpResponse
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import BadRequest
 # from django.shortcuts import HttpResponse
 
-import json
+import hashlib
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.core.serializers import serialize
 
 from django.views.generic import ListView, DetailView#, TemplateView
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
+from .cache import get_detail_fragment, get_stamps, set_detail_fragment
+from .export import iter_export
 from .models import Plant
+from .pagination import keyset_page
+from .serializers import plant_serializer
+from .search import get_search_index
 
 # Create your views here.
 # class HomeView(TemplateView):
@@ -17,12 +27,82 @@ from .models import Plant
 #     # return HttpResponse("<h1>This is plant index temp page</h1>")
 #     return render(request, 'plants/index.html', {})
 
+def parse_limit(request, default, maximum):
+    """
+    Return ?limit= as an int, capped at `maximum`.
+
+    Raises:
+        BadRequest: If limit is not an integer or is below 1.
+    """
+    try:
+        limit = int(request.GET.get('limit', default))
+    except ValueError:
+        raise BadRequest('limit must be an integer')
+    if limit < 1:
+        raise BadRequest('limit must be at least 1')
+    return min(limit, maximum)
+
 class PlantListView(ListView):
     model = Plant
-    template_name = 'plants/plant_list.html'
+    template_name = 'Plants/plant_list.html'
     context_object_name = 'plant_list'
-    ordering = ['name_common']
-    
+    # (name_common, pk) is unique, so it doubles as the keyset cursor
+    ordering = ['name_common', 'pk']
+    page_limit = 20
+    max_page_limit = 100
+    count_cache_timeout = 60
+
+    def get(self, request, *args, **kwargs):
+        """
+        Render the plant list, or return a page of JSON with ?format=json.
+
+        JSON query parameters:
+            cursor  STR opaque `next`/`prev` cursor from a previous response
+            page    INT use OFFSET pagination instead of cursors
+            limit   INT rows per page, 1 to 100 (default 20)
+            total   BOOL include the (cached) total row count
+        """
+        if request.GET.get('format') != 'json':
+            return super().get(request, *args, **kwargs)
+
+        queryset = self.get_queryset()
+        limit = parse_limit(request, self.page_limit, self.max_page_limit)
+        if 'page' in request.GET:
+            context = self.get_paginated_context(queryset, request.GET['page'], limit)
+        else:
+            with_total = request.GET.get('total', '').lower() in ('true', '1', 'yes')
+            context = self.get_cursor_context(
+                queryset, request.GET.get('cursor'), limit, with_total=with_total
+            )
+        return JsonResponse({
+            'data': context['data'],
+            'pagination': context['pagination'],
+        })
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # ?any=is_hybrid,is_waterwise (OR2.1) / ?all=is_organic,is_non_gmo (OR2.2)
+        any_traits = self.request.GET.get('any')
+        all_traits = self.request.GET.get('all')
+        # ?zone=8b (survives in 8b) / ?zones=7a-9b (range overlaps 7a..9b)
+        zone = self.request.GET.get('zone')
+        zones = self.request.GET.get('zones')
+        try:
+            if any_traits:
+                queryset = queryset.filter_any(*any_traits.split(','))
+            if all_traits:
+                queryset = queryset.filter_exact(*all_traits.split(','))
+            if zone:
+                queryset = queryset.survives_in(zone)
+            if zones:
+                low, _, high = zones.partition('-')
+                queryset = queryset.overlaps_zones(low, high or low)
+        except ValueError as err:
+            raise BadRequest(err)
+        if self.request.GET.get('format') != 'json':
+            # the HTML list shows each plant's links; JSON pages read .values()
+            queryset = queryset.with_related()
+        return queryset
 
     def get_paginated_context(self, queryset, page, limit):
         if not page:
@@ -30,10 +110,9 @@ class PlantListView(ListView):
         if limit:
             self.paginate_by = limit
         
-        paginator = Paginator(queryset, self.page_limit)
+        paginator = Paginator(plant_serializer.values(queryset), limit or self.page_limit)
         page_obj = paginator.get_page(page)
-        serialized_page = serialize("json", page_obj.object_list)
-        serialized_page = [obj['fields'] for obj in json.loads(serialized_page)]
+        serialized_page = list(page_obj.object_list)
 
         return {
             "data": serialized_page,
@@ -49,6 +128,42 @@ class PlantListView(ListView):
             'serialized_page': serialized_page
         }
 
+    def get_cursor_context(self, queryset, cursor, limit, with_total=False):
+        """
+        Keyset-paginated counterpart of `get_paginated_context`.
+
+        Every page costs one indexed range scan; the total is only counted
+        when asked for, and then cached for `count_cache_timeout` seconds.
+        """
+        limit = limit or self.page_limit
+        try:
+            page = keyset_page(
+                plant_serializer.values(queryset, 'pk'), self.ordering, cursor, limit
+            )
+        except ValueError as err:
+            raise BadRequest(err)
+        serialized_page = plant_serializer.strip(page['objects'], 'pk')
+
+        return {
+            "data": serialized_page,
+            "pagination": {
+                "cursor": cursor,
+                "limit": limit,
+                "next": page['next'],
+                "prev": page['prev'],
+                "has_next": page['next'] is not None,
+                "has_prev": page['prev'] is not None,
+                "total": self.get_cached_count(queryset) if with_total else None,
+            },
+            'serialized_page': serialized_page
+        }
+
+    def get_cached_count(self, queryset):
+        query_hash = hashlib.sha256(str(queryset.query).encode()).hexdigest()
+        return cache.get_or_set(
+            f'plants:count:{query_hash}', queryset.count, self.count_cache_timeout
+        )
+
     # def get_context_data(self, **kwargs):
     #     context = super().get_context_data(**kwargs)
     #     context['page_range'] = self.get_page_range(context['paginator'], context['page_obj'])
@@ -61,11 +176,66 @@ class PlantListView(ListView):
     #     return range(start_index + 1, end_index + 1)
 
 def PlantDetailView(request, pk):
-    plant = get_object_or_404(Plant, pk=pk)
+    # the plant part of the page is shared by every visitor, so it is cached;
+    # the surrounding layout is per-request (it shows the logged-in user)
+    # stamps are read before the plant, so an edit while rendering makes
+    # this fragment stale instead of storing old HTML under the new stamps
+    stamps = get_stamps(pk)
+    plant_detail = get_detail_fragment(pk, stamps)
+    if plant_detail is None:
+        plant = get_object_or_404(Plant.objects.with_related(), pk=pk)
+        plant_detail = render_to_string('Plants/_plant_detail.html', {'plant': plant})
+        set_detail_fragment(pk, plant_detail, stamps)
     context = {
-        'plant': plant
+        'plant_detail': mark_safe(plant_detail)
     }
-    return render(request, 'plants/plant_detail.html', context)
+    return render(request, 'Plants/plant_detail.html', context)
+
+def PlantSearchView(request):
+    """
+    JSON search over plant names and descriptions (OR1.2).
+
+    Query parameters:
+        q       STR partial / misspelled search term
+        limit   INT max results to return, 1 to 100 (default 20)
+
+    Each result carries the plant's pk, names and detail page `url`.
+    """
+    query = request.GET.get('q', '')
+    limit = parse_limit(request, 20, 100)
+
+    pks = get_search_index().search(query, limit=limit)
+    rows = Plant.objects.filter(pk__in=pks).values('pk', 'name_common', 'name_scientific')
+    by_pk = {row['pk']: row for row in rows}
+    for row in by_pk.values():
+        row['url'] = reverse('plant-detail', args=[row['pk']])
+    return JsonResponse({
+        'query': query,
+        'results': [by_pk[pk] for pk in pks if pk in by_pk],
+    })
+
+EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+@staff_member_required
+def PlantExportView(request, export_format):
+    """
+    Stream the catalogue as NDJSON (all models) or CSV (one model).
+
+    Query parameters:
+        model   STR plant / plantlink / nursery (required for CSV)
+    """
+    model_key = request.GET.get('model')
+    try:
+        chunks = iter_export(export_format, model_key)
+    except ValueError as err:
+        raise BadRequest(err)
+    response = StreamingHttpResponse(chunks, content_type=EXPORT_CONTENT_TYPES[export_format])
+    file_name = f"{model_key or 'catalogue'}.{export_format}"
+    response['Content-Disposition'] = f'attachment; filename="{file_name}"'
+    return response
 
 # class PlantDetailView(DetailView):
 #     model = Plant
@@ -0,0 +1,33 @@
+"""
+Ordinal encoding of USDA hardiness zone codes.
+
+`Plant.hardiness_zone_low`/`hardiness_zone_high` store codes like '8b' and
+'10a', which do not sort as strings ('10a' < '8b'). Each code maps to an
+integer that does: '1a' -> 1, '1b' -> 2, ... '13b' -> 26. 'na' (not
+provided) maps to None.
+"""
+
+ZONE_NOT_PROVIDED = 'na'
+
+
+def zone_ordinal(code):
+    """
+    Return the ordinal for a hardiness zone code, or None for 'na'/blank.
+
+    Raises:
+        ValueError: If `code` is not a zone code like '8b'.
+    """
+    if not code or code == ZONE_NOT_PROVIDED:
+        return None
+    number, half = code[:-1], code[-1:].lower()
+    if not number.isdigit() or half not in ('a', 'b') or not 1 <= int(number) <= 13:
+        raise ValueError(f"Invalid hardiness zone: {code!r}")
+    return int(number) * 2 - (1 if half == 'a' else 0)
+
+
+def zone_code(ordinal):
+    """Return the zone code for an ordinal produced by `zone_ordinal`."""
+    if ordinal is None:
+        return ZONE_NOT_PROVIDED
+    number, half = divmod(ordinal + 1, 2)
+    return f"{number}{'b' if half else 'a'}"
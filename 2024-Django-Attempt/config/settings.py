@@ -97,9 +97,59 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # keep connections open between requests instead of reconnecting
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# SQLite performance profile, run on every new connection (see Plants/sqlite.py).
+# Set SQLITE_PRAGMAS = {} to keep SQLite's defaults.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'wal'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'normal'),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': -64 * 1024,  # negative = KiB, i.e. 64 MiB per connection
+    'temp_store': 'memory',
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+}
+
+
+# Caches
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# 'plant_pages' holds rendered plant detail fragments; 'plant_versions' holds
+# the counters they are stamped with and the catalogue version the in-process
+# search/trait/name indexes follow (see Plants/cache.py). The counters must
+# never be evicted, so that alias has no timeout and does not cull.
+# Use PLANT_CACHE_BACKEND / PLANT_VERSION_CACHE_BACKEND (e.g.
+# django.core.cache.backends.filebased.FileBasedCache with
+# PLANT_CACHE_LOCATION / PLANT_VERSION_CACHE_LOCATION=/some/dir) to share them
+# between worker processes; with the default locmem backend, run a single
+# worker process.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'plant_pages': {
+        'BACKEND': os.environ.get(
+            'PLANT_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('PLANT_CACHE_LOCATION', 'plant-pages'),
+        'TIMEOUT': int(os.environ.get('PLANT_CACHE_TIMEOUT', 60 * 60)),
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'plant_versions': {
+        'BACKEND': os.environ.get(
+            'PLANT_VERSION_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('PLANT_VERSION_CACHE_LOCATION', 'plant-versions'),
+        'TIMEOUT': None,
+        # one small counter per plant; high enough that the backend never culls
+        'OPTIONS': {'MAX_ENTRIES': sys.maxsize},
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
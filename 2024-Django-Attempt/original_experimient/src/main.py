@@ -19,13 +19,66 @@
 # The database should be able to display all information on a particular plant
 # The database should be able to display all plants of a particular type
 
+import datetime
+import itertools
 import sqlite3
-import pandas as pd
+from collections import OrderedDict
 
-from sql_setup import SQL_SETUP_DICT, PLANT_TYPES
+from sql_setup import MIGRATIONS, SCHEMA_VERSION, SQL_SETUP_DICT
 
 DB_PATH = 'gardening.db'
 
+# Performance profile run on every new connection (see connect):
+# WAL lets readers work while a writer commits, synchronous=NORMAL only
+# fsyncs at checkpoints, and mmap/cache/temp_store avoid extra disk reads.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # negative = KiB, i.e. 64 MiB
+    'temp_store': 'memory',
+    'busy_timeout': 5000,
+}
+
+# Pragmas connect() may set, and whether their value is a keyword (else an
+# integer); the same whitelist as Plants/sqlite.py in the Django project
+ALLOWED_PRAGMAS = {
+    'journal_mode': True,
+    'synchronous': True,
+    'temp_store': True,
+    'mmap_size': False,
+    'cache_size': False,
+    'busy_timeout': False,
+    'wal_autocheckpoint': False,
+}
+
+def pragma_statements(pragmas):
+    """
+    Return the `PRAGMA name = value` statements for `pragmas`.
+
+    Args:
+        pragmas: A dict of PRAGMA name -> value.
+
+    Returns:
+        A list of SQL statements.
+
+    Raises:
+        ValueError: If a pragma is not in ALLOWED_PRAGMAS or its value is not
+            a plain keyword / integer (PRAGMA values cannot be parameters).
+    """
+    statements = []
+    for name, value in pragmas.items():
+        if name not in ALLOWED_PRAGMAS:
+            raise ValueError(f"Unsupported SQLite pragma: {name!r}")
+        if ALLOWED_PRAGMAS[name]:
+            valid = isinstance(value, str) and value.isalpha()
+        else:
+            valid = isinstance(value, int) and not isinstance(value, bool)
+        if not valid:
+            raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
 def create_table_from_str(conn, table_str):
     """
     Create a table in the database using the provided SQL string.
@@ -43,44 +96,175 @@ def create_table_from_str(conn, table_str):
     except sqlite3.Error as e:
         print(f"Error creating table: {e}")
 
-def insert_into_plants_table(conn, plant_data):
+PLANT_COLUMNS = (
+    'plant_type_id',
+    'scientific_name',
+    'common_name',
+    'description',
+    'germination_days_start',
+    'germination_days_end',
+    'germination_temp_start',
+    'germination_temp_end',
+    'hardiness_zone_start',
+    'hardiness_zone_end',
+    'days_to_harvest',
+    'days_to_maturation',
+    'created_on',
+    'created_by',
+)
+# columns an upsert leaves alone on an existing plant
+KEEP_ON_UPDATE = ('scientific_name', 'created_on', 'created_by')
+ON_CONFLICT = {
+    'skip': 'DO NOTHING',
+    'update': 'DO UPDATE SET ' + ', '.join(
+        f'{column}=excluded.{column}'
+        for column in PLANT_COLUMNS if column not in KEEP_ON_UPDATE
+    ),
+}
+INSERT_PLANTS_SQL = (
+    f"INSERT INTO plants ({', '.join(PLANT_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(PLANT_COLUMNS))}) "
+    'ON CONFLICT(scientific_name) {action}'
+)
+
+
+def insert_plants(conn, plants, on_conflict='skip', batch_size=1000,
+                  name_cache=None):
+    """
+    Insert many plants into the plants table.
+
+    Each batch is sent with one executemany and committed as one
+    transaction, instead of a SELECT, an INSERT and a commit per plant.
+    Duplicates are resolved by the unique index on scientific_name.
+    Changes already pending on `conn` are committed first.
+
+    Args:
+        conn: The SQLite database connection object.
+        plants: An iterable of tuples in PLANT_COLUMNS order.
+        on_conflict: 'skip' keeps the existing plant, 'update' overwrites
+            it with the new data (except its name and created_on/by).
+        batch_size: The number of plants per transaction.
+        name_cache: A PlantNameCache. With 'skip', plants it already
+            knows are skipped without being sent; the names of written
+            plants are invalidated in it.
+
+    Returns:
+        A dict with the number of plants 'inserted', 'updated' and
+        'skipped'.
+    """
+    if on_conflict not in ON_CONFLICT:
+        raise ValueError(f"on_conflict must be one of {list(ON_CONFLICT)}")
+    sql = INSERT_PLANTS_SQL.format(action=ON_CONFLICT[on_conflict])
+    report = {'inserted': 0, 'updated': 0, 'skipped': 0}
+    plants = iter(plants)
+    while True:
+        batch = list(itertools.islice(plants, batch_size))
+        if not batch:
+            return report
+        if name_cache is not None and on_conflict == 'skip':
+            unknown = [plant for plant in batch if plant[1] not in name_cache]
+            report['skipped'] += len(batch) - len(unknown)
+            batch = unknown
+            if not batch:
+                continue
+        if conn.in_transaction:
+            conn.commit()
+        # take the write lock up front, so no other writer's rows can land
+        # between reading max_id and counting the rows above it
+        conn.execute('BEGIN IMMEDIATE')
+        with conn:  # commits the batch, or rolls it back on an error
+            # ids are AUTOINCREMENT, so new rows are the ones above max_id
+            max_id = conn.execute('SELECT MAX(id) FROM plants').fetchone()[0]
+            conn.executemany(sql, batch)
+            inserted = conn.execute(
+                'SELECT COUNT(*) FROM plants WHERE id > ?', (max_id or 0,)
+            ).fetchone()[0]
+        if name_cache is not None:
+            name_cache.invalidate(plant[1] for plant in batch)
+        report['inserted'] += inserted
+        if on_conflict == 'update':
+            report['updated'] += len(batch) - inserted
+        else:
+            report['skipped'] += len(batch) - inserted
+
+
+class PlantNameCache:
+    """
+    Size-bounded LRU read-through cache of plant lookups by scientific name.
+
+    Repeated lookups are answered from memory and only a miss queries the
+    (indexed) plants table. Only plants that exist are cached, so a name
+    inserted later is never hidden by a cached "not found"; pass the cache
+    to insert_plants (or call invalidate) when plants are updated.
+
+    Args:
+        conn: The SQLite database connection object.
+        max_size: The number of names kept before the least recently used
+            one is evicted.
+    """
+
+    def __init__(self, conn, max_size=1024):
+        self.conn = conn
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._rows = OrderedDict()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, scientific_name):
+        """Whether `scientific_name` is cached (so known to exist)."""
+        return scientific_name in self._rows
+
+    def get_plant(self, scientific_name):
+        """Return the plants row for `scientific_name` as a tuple, or None."""
+        if scientific_name in self._rows:
+            self._rows.move_to_end(scientific_name)
+            self.hits += 1
+            return self._rows[scientific_name]
+        self.misses += 1
+        row = self.conn.execute(
+            'SELECT * FROM plants WHERE scientific_name = ?', (scientific_name,)
+        ).fetchone()
+        if row is not None:
+            self._rows[scientific_name] = row
+            if len(self._rows) > self.max_size:
+                self._rows.popitem(last=False)
+        return row
+
+    def get_plant_id(self, scientific_name):
+        """Return the id of the plant with `scientific_name`, or None."""
+        row = self.get_plant(scientific_name)
+        return row[0] if row else None
+
+    def invalidate(self, scientific_names):
+        for scientific_name in scientific_names:
+            self._rows.pop(scientific_name, None)
+
+    def clear(self):
+        self._rows.clear()
+
+
+def insert_into_plants_table(conn, plant_data, name_cache=None):
     """
     Insert plant data into the plants table.
 
     Args:
         conn: The SQLite database connection object.
         plant_data: A tuple containing the plant data.
+        name_cache: A PlantNameCache answering the duplicate check for
+            plants looked up or inserted before.
 
     Returns:
         None
     """
-    # check if the plant scientific name already exists in the database
-    c = conn.cursor()
-    c.execute("SELECT scientific_name FROM plants WHERE scientific_name=?", (plant_data[1],))
-    existing_plant = c.fetchone()
-    if existing_plant:
-        print(f"Plant with scientific name '{plant_data[1]}' already exists in the database.")
+    if name_cache is not None and name_cache.get_plant_id(plant_data[1]):
+        report = {'skipped': 1}
     else:
-        c = conn.cursor()
-        c.execute('''INSERT INTO plants (
-                  plant_type_id, 
-                  scientific_name, 
-                  common_name, 
-                  description, 
-                  germination_days_start, 
-                  germination_days_end, 
-                  germination_temp_start, 
-                  germination_temp_end, 
-                  hardiness_zone_start, 
-                  hardiness_zone_end, 
-                  days_to_harvest, 
-                  days_to_maturation, 
-                  created_on, 
-                  created_by
-                  ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)''',
-                  plant_data
-                )
-        conn.commit()
+        report = insert_plants(conn, [plant_data], name_cache=name_cache)
+    if report['skipped']:
+        print(f"Plant with scientific name '{plant_data[1]}' already exists in the database.")
 
 # Function to show all tables in the database
 def get_table_names(conn):
@@ -99,62 +283,185 @@ def get_table_names(conn):
     table_names = [table[0] for table in tables]
     return table_names
 
-# Create a database
-def create_database(path_to_db: str):
+def connect(path_to_db: str, pragmas=None):
     """
-    Creates a new SQLite database named 'gardening.db',
-    connects to the SQLite database, creates the 
-    required tables for the gardening app, and commits
-    the changes before closing the connection.
+    Open a connection to the database with the performance profile applied.
+
+    Args:
+        path_to_db: The path to the SQLite database file.
+        pragmas: A dict of PRAGMA name -> value, SQLITE_PRAGMAS by default.
+
+    Returns:
+        The SQLite database connection object.
+
+    Raises:
+        ValueError: If a pragma is unknown or has an invalid value, see
+            pragma_statements.
     """
+    # validated before connecting, so a bad profile leaves no open connection
+    statements = pragma_statements(SQLITE_PRAGMAS if pragmas is None else pragmas)
     conn = sqlite3.connect(path_to_db)
+    for statement in statements:
+        conn.execute(statement)
+    return conn
+
+def migrate(conn, from_version=0):
+    """
+    Bring the schema from `from_version` up to SCHEMA_VERSION.
+
+    Each migration runs in its own transaction together with the
+    `PRAGMA user_version` bump, so a failed step leaves the database at
+    the last complete version.
+
+    Args:
+        conn: The SQLite database connection object.
+        from_version: The database's current PRAGMA user_version.
+
+    Returns:
+        The new schema version.
+    """
+    for version in range(from_version + 1, SCHEMA_VERSION + 1):
+        # DDL does not open a transaction implicitly, so start one
+        conn.execute('BEGIN')
+        with conn:
+            for key in MIGRATIONS[version - 1]:
+                conn.execute(SQL_SETUP_DICT[key])
+            conn.execute(f'PRAGMA user_version = {version}')
+    return SCHEMA_VERSION
 
-    # Check if expected tables are already created and make them if not
-    table_names = get_table_names(conn)
-    if table_names == []:
-        if 'plant_types' not in table_names:
-            create_table_from_str(conn, SQL_SETUP_DICT['plant_types'])
-            conn.executemany('INSERT INTO plant_types (type, created_on, created_by) VALUES (?, ?, ?)', PLANT_TYPES)
-        if 'plant_urls' not in table_names:
-            create_table_from_str(conn, SQL_SETUP_DICT['plant_urls'])
-        if 'plants' not in table_names:
-            create_table_from_str(conn, SQL_SETUP_DICT['plants'])
-    
-        conn.commit()
-        print("Database created successfully.")
+# Create a database
+def create_database(path_to_db: str, pragmas=None):
+    """
+    Creates or opens the SQLite database at `path_to_db` and
+    migrates its schema to SCHEMA_VERSION (see MIGRATIONS in
+    sql_setup.py). An up-to-date database costs one
+    PRAGMA user_version read.
+    The connection uses the SQLITE_PRAGMAS profile unless
+    `pragmas` is given.
+    """
+    conn = connect(path_to_db, pragmas)
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    if version < SCHEMA_VERSION:
+        migrate(conn, version)
+        print(f"Database schema migrated to version {SCHEMA_VERSION}.")
     # conn.close()
     return conn
 
-# Function that shows all data in tables using pandas
-def show_table_data(conn):
+def quote_identifier(name):
+    """Quote a table or column name for SQLite (double quotes, escaped)."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+class TableInspector:
     """
-    Show all data in the tables in the database using pandas.
+    Stream the tables of a database without loading them into memory.
+
+    The schema (table names and their columns) is read once and cached;
+    call refresh_schema() after creating or altering tables. Rows are
+    paged with fetchmany, and pandas is only imported by to_dataframe().
 
     Args:
         conn: The SQLite database connection object.
+        page_size: The number of rows fetched per round trip.
+    """
+
+    def __init__(self, conn, page_size=500):
+        self.conn = conn
+        self.page_size = page_size
+        self._schema = None
+
+    @property
+    def schema(self):
+        """A dict of table name -> list of column names."""
+        if self._schema is None:
+            self._schema = {
+                table_name: [
+                    row[1] for row in self.conn.execute(
+                        f"PRAGMA table_info({quote_identifier(table_name)})"
+                    )
+                ]
+                for table_name in get_table_names(self.conn)
+            }
+        return self._schema
+
+    def refresh_schema(self):
+        self._schema = None
+
+    def _select(self, table_name, suffix='', params=()):
+        # Only tables from the schema are queried, to prevent SQL injection
+        if table_name not in self.schema:
+            raise ValueError(f"Unknown table: {table_name}")
+        return self.conn.execute(
+            f"SELECT * FROM {quote_identifier(table_name)} {suffix}", params
+        )
+
+    def iter_rows(self, table_name):
+        """Yield every row of a table, fetching page_size rows at a time."""
+        cursor = self._select(table_name)
+        while True:
+            rows = cursor.fetchmany(self.page_size)
+            if not rows:
+                return
+            yield from rows
+
+    def count(self, table_name):
+        self._select(table_name, 'LIMIT 0')  # validates the name
+        query = f"SELECT COUNT(*) FROM {quote_identifier(table_name)}"
+        return self.conn.execute(query).fetchone()[0]
+
+    def head(self, table_name, n=5):
+        return self._select(table_name, 'LIMIT ?', (n,)).fetchall()
+
+    def tail(self, table_name, n=5):
+        rows = self._select(table_name, 'ORDER BY rowid DESC LIMIT ?', (n,))
+        return rows.fetchall()[::-1]
+
+    def to_dataframe(self, table_name):
+        """Return a whole table as a pandas DataFrame (imports pandas)."""
+        import pandas as pd
+
+        rows = self.iter_rows(table_name)
+        return pd.DataFrame(rows, columns=self.schema[table_name])
+
+    def show(self, table_name, head=None, tail=None):
+        """
+        Print a table: all rows, or only the first `head` and/or the last
+        `tail` rows (with the number of rows skipped in between).
+        """
+        print(f"Table: {table_name}")
+        print('\t'.join(self.schema[table_name]))
+        if head is None and tail is None:
+            rows = self.iter_rows(table_name)
+        else:
+            total = self.count(table_name)
+            head = min(head or 0, total)
+            tail = min(tail or 0, total - head)
+            rows = self.head(table_name, head) if head else []
+            if total > head + tail:
+                rows.append((f"... {total - head - tail} more rows ...",))
+            if tail:
+                rows.extend(self.tail(table_name, tail))
+        for row in rows:
+            print('\t'.join(str(value) for value in row))
+        print("\n")
+
+
+# Function that shows all data in tables
+def show_table_data(conn, head=None, tail=None):
+    """
+    Show the data in the tables in the database, streamed page by page.
+
+    Args:
+        conn: The SQLite database connection object.
+        head: Only show the first `head` rows of each table.
+        tail: Only show the last `tail` rows of each table.
 
     Returns:
         None
     """
-    # Get valid table names from database schema
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    valid_tables = {row[0] for row in cursor.fetchall()}
-
-    table_names = get_table_names(conn)
-    for table_name in table_names:
-        # Validate table name exists in schema to prevent SQL injection
-        if table_name not in valid_tables:
-            print(f"WARNING: Skipping invalid table name: {table_name}")
-            continue
-
-        # Use identifier quoting for additional safety
-        # SQLite uses double quotes for identifiers
-        quoted_table = f'"{table_name}"'
-        df = pd.read_sql_query(f"SELECT * FROM {quoted_table}", conn)
-        print(f"Table: {table_name}")
-        print(df)
-        print("\n")
+    inspector = TableInspector(conn)
+    for table_name in inspector.schema:
+        inspector.show(table_name, head=head, tail=tail)
 
 def main(path_to_db: str):
     conn = create_database(path_to_db)
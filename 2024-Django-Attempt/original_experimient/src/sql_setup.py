@@ -59,5 +59,33 @@ SQL_SETUP_DICT = {
     created_on DATE,
     created_by TEXT,
     FOREIGN KEY(plant_type_id) REFERENCES plant_types(id)
-)'''
+)''',
+    # existing types keep their created_on; only missing ones are added
+    'plant_types_rows': '''INSERT OR IGNORE INTO plant_types (type, created_on, created_by)
+VALUES ''' + ', '.join(
+        f"('{plant_type}', CURRENT_TIMESTAMP, '{created_by}')"
+        for plant_type, _, created_by in PLANT_TYPES
+    ),
+    # one row per scientific name; lets batch inserts use ON CONFLICT
+    'plants_scientific_name_index': '''CREATE UNIQUE INDEX IF NOT EXISTS
+    plants_scientific_name_idx ON plants (scientific_name)''',
+    # lookups by plant, by type and by common name
+    'plant_urls_plant_id_index': '''CREATE INDEX IF NOT EXISTS
+    plant_urls_plant_id_idx ON plant_urls (plant_id)''',
+    'plants_plant_type_id_index': '''CREATE INDEX IF NOT EXISTS
+    plants_plant_type_id_idx ON plants (plant_type_id)''',
+    'plants_common_name_index': '''CREATE INDEX IF NOT EXISTS
+    plants_common_name_idx ON plants (common_name)''',
 }
+
+# Forward schema migrations, tracked in PRAGMA user_version:
+# MIGRATIONS[n - 1] lists the SQL_SETUP_DICT keys that take a database from
+# version n - 1 to n. Every statement is idempotent (IF NOT EXISTS / OR
+# IGNORE), so a database created before versioning, or left half set up, is
+# repaired by running them all from version 0. Only append new versions.
+MIGRATIONS = [
+    ['plant_types', 'plant_types_rows', 'plants', 'plant_urls'],
+    ['plants_scientific_name_index'],
+    ['plant_urls_plant_id_index', 'plants_plant_type_id_index', 'plants_common_name_index'],
+]
+SCHEMA_VERSION = len(MIGRATIONS)
@@ -1,7 +1,15 @@
+import contextlib
+import datetime
+import io
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
 import sqlite3
 from unittest import mock
-from src.main import create_database
+from src.main import (PlantNameCache, TableInspector, connect, create_database,
+                      insert_into_plants_table, insert_plants, SCHEMA_VERSION)
 
 class TestCreateDatabase(unittest.TestCase):
     def test_create_database(self):
@@ -35,5 +43,242 @@ class TestCreateDatabase(unittest.TestCase):
         mock_conn.cursor.assert_called()
         mock_conn.cursor.return_value.execute.assert_called_with("SELECT name FROM sqlite_master WHERE type='table'")
 
+class TestInsertPlants(unittest.TestCase):
+    def setUp(self):
+        self.conn = create_database(':memory:')
+
+    def tearDown(self):
+        self.conn.close()
+
+    def plant(self, name, description='A plant.'):
+        return (1, name, 'Common', description, 7, 14, 70, 75, 5, 9, 60, 90,
+                datetime.datetime.now().isoformat(), 'Tester')
+
+    def test_skips_duplicates(self):
+        plants = [self.plant(f'Plantus {i}') for i in range(2500)]
+        report = insert_plants(self.conn, plants, batch_size=1000)
+        self.assertEqual(report, {'inserted': 2500, 'updated': 0, 'skipped': 0})
+
+        report = insert_plants(self.conn, plants[:10] + [self.plant('Novus')])
+        self.assertEqual(report, {'inserted': 1, 'updated': 0, 'skipped': 10})
+        count = self.conn.execute('SELECT COUNT(*) FROM plants').fetchone()[0]
+        self.assertEqual(count, 2501)
+
+    def test_updates_duplicates(self):
+        insert_plants(self.conn, [self.plant('Rosa chinensis')])
+        report = insert_plants(
+            self.conn,
+            [self.plant('Rosa chinensis', 'Red petals.'), self.plant('Novus')],
+            on_conflict='update',
+        )
+        self.assertEqual(report, {'inserted': 1, 'updated': 1, 'skipped': 0})
+        description = self.conn.execute(
+            "SELECT description FROM plants WHERE scientific_name='Rosa chinensis'"
+        ).fetchone()[0]
+        self.assertEqual(description, 'Red petals.')
+
+    def test_batch_holds_write_lock(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'gardening.db')
+            conn = create_database(path)
+            other = sqlite3.connect(path, timeout=0)
+            blocked = []
+
+            def other_writer(statement):
+                # another process tries to insert while the batch runs
+                if statement.startswith('INSERT INTO plants'):
+                    try:
+                        with other:
+                            other.execute("INSERT INTO plants (scientific_name) "
+                                          "VALUES ('Intruder')")
+                    except sqlite3.OperationalError:
+                        blocked.append(statement)
+
+            conn.set_trace_callback(other_writer)
+            report = insert_plants(conn, [self.plant('Rosa chinensis')])
+            conn.set_trace_callback(None)
+            other.close()
+            conn.close()
+        self.assertTrue(blocked)
+        self.assertEqual(report['inserted'], 1)
+
+    def test_failed_batch_is_rolled_back(self):
+        plants = [self.plant('Good'), (1, 'Too short')]
+        with self.assertRaises(sqlite3.ProgrammingError):
+            insert_plants(self.conn, plants)
+        count = self.conn.execute('SELECT COUNT(*) FROM plants').fetchone()[0]
+        self.assertEqual(count, 0)
+
+    def test_name_cache_invalidated_by_batches(self):
+        cache = PlantNameCache(self.conn, max_size=2)
+        self.assertIsNone(cache.get_plant_id('Rosa chinensis'))
+        self.assertNotIn('Rosa chinensis', cache)  # misses are not cached
+        insert_plants(self.conn, [self.plant('Rosa chinensis')])
+        rose_id = cache.get_plant_id('Rosa chinensis')
+        self.assertIsNotNone(rose_id)
+        self.assertEqual(cache.get_plant('Rosa chinensis')[0], rose_id)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        insert_plants(self.conn, [self.plant('Rosa chinensis', 'Red petals.')],
+                      on_conflict='update', name_cache=cache)
+        self.assertEqual(cache.get_plant('Rosa chinensis')[4], 'Red petals.')
+
+        insert_plants(self.conn, [self.plant('Novus'), self.plant('Alter')])
+        cache.get_plant_id('Novus')
+        cache.get_plant_id('Alter')
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn('Rosa chinensis', cache)  # least recently used
+
+    def test_name_cache_answers_duplicate_checks(self):
+        cache = PlantNameCache(self.conn)
+        plants = [self.plant(f'Plantus {i}') for i in range(10)]
+        insert_plants(self.conn, plants, name_cache=cache)
+        for plant in plants:
+            cache.get_plant_id(plant[1])
+
+        statements = []
+        self.conn.set_trace_callback(statements.append)
+        report = insert_plants(self.conn, plants, name_cache=cache)
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            insert_into_plants_table(self.conn, plants[0], name_cache=cache)
+        self.conn.set_trace_callback(None)
+        self.assertEqual(report, {'inserted': 0, 'updated': 0, 'skipped': 10})
+        self.assertIn('already exists', stdout.getvalue())
+        self.assertEqual(statements, [])
+
+class TestTableInspector(unittest.TestCase):
+    def setUp(self):
+        self.conn = create_database(':memory:')
+        self.conn.executemany(
+            'INSERT INTO plant_urls (plant_id, url) VALUES (?, ?)',
+            [(i, f'https://example.com/{i}') for i in range(1, 1001)],
+        )
+        self.inspector = TableInspector(self.conn, page_size=64)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_schema_is_cached(self):
+        schema = self.inspector.schema
+        self.assertIn('plants', schema)
+        self.assertEqual(schema['plant_urls'][:3], ['id', 'plant_id', 'url'])
+        self.conn.execute('CREATE TABLE extra (id INTEGER)')
+        self.assertNotIn('extra', self.inspector.schema)
+        self.inspector.refresh_schema()
+        self.assertIn('extra', self.inspector.schema)
+
+    def test_iter_rows_pages_through_table(self):
+        ids = [row[0] for row in self.inspector.iter_rows('plant_urls')]
+        self.assertEqual(ids, list(range(1, 1001)))
+        with self.assertRaises(ValueError):
+            list(self.inspector.iter_rows('plants; DROP TABLE plants'))
+
+    def test_show_head_and_tail(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            self.inspector.show('plant_urls', head=2, tail=1)
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(lines[0], 'Table: plant_urls')
+        self.assertEqual([line.split('\t')[0] for line in lines[2:6]],
+                         ['1', '2', '... 997 more rows ...', '1000'])
+
+    def test_pandas_only_imported_for_dataframe(self):
+        src_dir = os.path.join(os.path.dirname(__file__), '..', 'src')
+        code = "import sys, main; print('pandas' in sys.modules)"
+        result = subprocess.run([sys.executable, '-c', code], cwd=src_dir,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), 'False')
+        self.assertEqual(len(self.inspector.to_dataframe('plant_urls')), 1000)
+
+class TestConnect(unittest.TestCase):
+    def test_performance_profile(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conn = connect(os.path.join(tmp_dir, 'gardening.db'))
+            pragmas = {name: conn.execute(f'PRAGMA {name}').fetchone()[0]
+                       for name in ('journal_mode', 'synchronous', 'busy_timeout')}
+            conn.close()
+        self.assertEqual(pragmas, {'journal_mode': 'wal', 'synchronous': 1,
+                                   'busy_timeout': 5000})
+
+    def test_defaults_kept_with_empty_profile(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            conn = connect(os.path.join(tmp_dir, 'gardening.db'), pragmas={})
+            journal_mode = conn.execute('PRAGMA journal_mode').fetchone()[0]
+            conn.close()
+        self.assertEqual(journal_mode, 'delete')
+
+    def test_rejects_unknown_pragmas_and_bad_values(self):
+        bad_profiles = [
+            {'foreign_keys': 1},
+            {'journal_mode': 'wal; DROP TABLE plants'},
+            {'busy_timeout': '5000'},
+            {'mmap_size': True},
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'gardening.db')
+            for pragmas in bad_profiles:
+                with self.subTest(pragmas=pragmas):
+                    with self.assertRaises(ValueError):
+                        connect(path, pragmas=pragmas)
+            self.assertFalse(os.path.exists(path))
+
+class TestSchemaMigrations(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'gardening.db')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_new_database_is_at_latest_version(self):
+        conn = create_database(self.path)
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        types = conn.execute('SELECT type FROM plant_types ORDER BY id').fetchall()
+        conn.close()
+        self.assertEqual(version, SCHEMA_VERSION)
+        self.assertEqual([row[0] for row in types],
+                         ['flower', 'fruit', 'vegetable', 'tree'])
+
+    def test_partial_database_is_repaired(self):
+        # an unversioned database where only plant_types was created
+        conn = sqlite3.connect(self.path)
+        conn.execute('CREATE TABLE plant_types (id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                     'type TEXT UNIQUE, created_on DATE, created_by TEXT)')
+        conn.execute("INSERT INTO plant_types (type, created_on, created_by) "
+                     "VALUES ('flower', '2024-01-01', 'Tester')")
+        conn.commit()
+        conn.close()
+
+        conn = create_database(self.path)
+        tables = conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+        flower = conn.execute("SELECT created_on FROM plant_types WHERE type='flower'").fetchone()
+        count = conn.execute('SELECT COUNT(*) FROM plant_types').fetchone()[0]
+        conn.close()
+        self.assertTrue({'plants', 'plant_urls'} <= {row[0] for row in tables})
+        self.assertEqual(flower[0], '2024-01-01')
+        self.assertEqual(count, 4)
+
+    def test_up_to_date_database_runs_no_migrations(self):
+        create_database(self.path).close()
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            create_database(self.path).close()
+        self.assertEqual(stdout.getvalue(), '')
+
+    def test_lookups_use_indexes(self):
+        conn = create_database(self.path)
+        lookups = [
+            ('SELECT * FROM plants WHERE scientific_name = ?', 'plants_scientific_name_idx'),
+            ('SELECT * FROM plants WHERE common_name = ?', 'plants_common_name_idx'),
+            ('SELECT * FROM plants WHERE plant_type_id = ?', 'plants_plant_type_id_idx'),
+            ('SELECT * FROM plant_urls WHERE plant_id = ?', 'plant_urls_plant_id_idx'),
+        ]
+        for query, index in lookups:
+            with self.subTest(query=query):
+                plan = conn.execute(f'EXPLAIN QUERY PLAN {query}', (1,)).fetchall()
+                self.assertIn(index, ' '.join(row[-1] for row in plan))
+        conn.close()
+
 if __name__ == '__main__':
     unittest.main()
@@ -22,7 +22,12 @@ from src.utils.logger import create_logger, func_wrapper, sol_wrapper
 
 
 # even in W mode it appends because of the RotatingFileHandler
-log_obj = create_logger(file_name="Template_Repo", file_mode="w")
+# deferred: the log file is only created once something is logged
+log_obj = create_logger(
+    file_name="Template_Repo",
+    file_mode="w",
+    deferred=True,
+)
 
 
 @func_wrapper(log_obj)
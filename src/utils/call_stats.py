@@ -0,0 +1,269 @@
+"""
+Per-function call statistics for the logging decorators.
+
+This module provides:
+- A streaming Histogram of durations (log-linear buckets, constant memory)
+    giving approximate p50/p95/p99 without storing every sample.
+- FunctionStats: call count, wall/CPU totals, min/max and a wall-time
+    histogram for a single function.
+- StatsRegistry: a thread-safe registry of FunctionStats. Every thread
+    records into its own shard, so decorated calls never wait on each other;
+    shards are only merged when a snapshot is taken.
+
+Usage:
+    from src.utils.logger import func_wrapper
+    from src.utils.call_stats import STATS
+
+    @func_wrapper(logger, profile=True)
+    def hot_path(): ...
+
+    print(STATS.format_table())
+    STATS.to_json("logs/stats.json")
+
+Note:
+    - Durations are recorded in nanoseconds (perf_counter_ns and
+        process_time_ns); reports show milliseconds.
+    - Percentiles are accurate to within half a bucket (~3% relative error).
+"""
+
+import json
+import threading
+import weakref
+from typing import Optional
+
+# 16 sub-buckets per power of two -> worst-case ~3% relative error
+SUB_BUCKET_BITS = 4
+PERCENTILES = (50, 95, 99)
+
+
+class Histogram:
+    """
+    Streaming log-linear histogram of non-negative integers.
+
+    Values below 2**(SUB_BUCKET_BITS + 1) get a bucket each; larger values
+    share a bucket with the values that agree on their top
+    SUB_BUCKET_BITS + 1 bits.
+    """
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self):
+        self.counts: dict = {}
+        self.total = 0
+
+    @staticmethod
+    def bucket_of(value: int) -> int:
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        if shift <= 0:
+            return value
+        return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+    @staticmethod
+    def bucket_bounds(bucket: int) -> tuple:
+        """Return the (low, high) values, inclusive, held by `bucket`."""
+        shift = (bucket >> SUB_BUCKET_BITS) - 1
+        if shift <= 0:
+            return bucket, bucket
+        mantissa = bucket - (shift << SUB_BUCKET_BITS)
+        low = mantissa << shift
+        return low, low + (1 << shift) - 1
+
+    def add(self, value: int) -> None:
+        bucket = self.bucket_of(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+
+    def merge(self, other: "Histogram") -> None:
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.total += other.total
+
+    def percentile(self, pct: float) -> int:
+        """Return the approximate value at percentile `pct` (0-100)."""
+        if not self.total:
+            return 0
+        rank = max(1, round(self.total * pct / 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                low, high = self.bucket_bounds(bucket)
+                return (low + high) // 2
+        return 0  # pragma: no cover - rank never exceeds total
+
+
+class FunctionStats:
+    """Aggregated timings for one function, all durations in ns."""
+
+    __slots__ = (
+        "name",
+        "calls",
+        "errors",
+        "wall_total",
+        "wall_min",
+        "wall_max",
+        "cpu_total",
+        "histogram",
+    )
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.wall_total = 0
+        self.wall_min: Optional[int] = None
+        self.wall_max = 0
+        self.cpu_total = 0
+        self.histogram = Histogram()
+
+    def record(self, wall_ns: int, cpu_ns: int, failed: bool = False):
+        self.calls += 1
+        self.errors += failed
+        self.wall_total += wall_ns
+        self.cpu_total += cpu_ns
+        if self.wall_min is None or wall_ns < self.wall_min:
+            self.wall_min = wall_ns
+        if wall_ns > self.wall_max:
+            self.wall_max = wall_ns
+        self.histogram.add(wall_ns)
+
+    def merge(self, other: "FunctionStats") -> None:
+        self.calls += other.calls
+        self.errors += other.errors
+        self.wall_total += other.wall_total
+        self.cpu_total += other.cpu_total
+        if other.wall_min is not None and (
+            self.wall_min is None or other.wall_min < self.wall_min
+        ):
+            self.wall_min = other.wall_min
+        self.wall_max = max(self.wall_max, other.wall_max)
+        self.histogram.merge(other.histogram)
+
+    def as_dict(self) -> dict:
+        data = {
+            "calls": self.calls,
+            "errors": self.errors,
+            "wall_total_ns": self.wall_total,
+            "wall_min_ns": self.wall_min or 0,
+            "wall_max_ns": self.wall_max,
+            "cpu_total_ns": self.cpu_total,
+        }
+        for pct in PERCENTILES:
+            data[f"p{pct}_ns"] = self.histogram.percentile(pct)
+        return data
+
+
+class StatsRegistry:
+    """
+    Thread-safe collection of FunctionStats keyed by function name.
+
+    record() only touches the calling thread's shard (guarded by its own,
+    practically uncontended lock); snapshot() merges all shards. The shards
+    of threads that have exited are folded into one retired shard, so
+    thread-pool churn does not grow the registry.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        # [(weakref to the owning thread, lock, {name: FunctionStats})]
+        self._shards: list = []
+        self._retired = (threading.Lock(), {})
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = (threading.Lock(), {})
+            self._local.shard = shard
+            owner = weakref.ref(threading.current_thread())
+            with self._lock:
+                self._prune_locked()
+                self._shards.append((owner, *shard))
+        return shard
+
+    def _prune_locked(self) -> None:
+        """Fold the shards of exited threads into the retired shard."""
+        live = []
+        retired_lock, retired = self._retired
+        for owner, lock, stats in self._shards:
+            thread = owner()
+            if thread is not None and thread.is_alive():
+                live.append((owner, lock, stats))
+                continue
+            with lock, retired_lock:
+                for name, func_stats in stats.items():
+                    if name not in retired:
+                        retired[name] = FunctionStats(name)
+                    retired[name].merge(func_stats)
+        self._shards = live
+
+    def record(
+        self, name: str, wall_ns: int, cpu_ns: int, failed: bool = False
+    ) -> None:
+        lock, stats = self._shard()
+        with lock:
+            func_stats = stats.get(name)
+            if func_stats is None:
+                func_stats = stats[name] = FunctionStats(name)
+            func_stats.record(wall_ns, cpu_ns, failed)
+
+    def merged(self) -> dict:
+        """Return {name: FunctionStats} merged across every thread."""
+        with self._lock:
+            self._prune_locked()
+            shards = [(lock, stats) for _, lock, stats in self._shards]
+        shards.append(self._retired)
+        merged = {}
+        for lock, stats in shards:
+            with lock:
+                for name, func_stats in stats.items():
+                    if name not in merged:
+                        merged[name] = FunctionStats(name)
+                    merged[name].merge(func_stats)
+        return merged
+
+    def snapshot(self) -> dict:
+        """Return {name: stats dict}, sorted by total wall time."""
+        merged = sorted(
+            self.merged().values(), key=lambda s: s.wall_total, reverse=True
+        )
+        return {func_stats.name: func_stats.as_dict() for func_stats in merged}
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """Return the snapshot as JSON, also writing it to `path` if given."""
+        data = json.dumps(self.snapshot(), indent=2)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as json_file:
+                json_file.write(data)
+        return data
+
+    def format_table(self) -> str:
+        """Return the snapshot as a fixed-width table, times in ms."""
+        columns = ["calls", "errors", "total", "cpu", "min", "max"]
+        columns += [f"p{pct}" for pct in PERCENTILES]
+        header = f"{'function':<40}" + "".join(f"{c:>10}" for c in columns)
+        lines = [header, "-" * len(header)]
+        for name, data in self.snapshot().items():
+            times = [
+                data["wall_total_ns"],
+                data["cpu_total_ns"],
+                data["wall_min_ns"],
+                data["wall_max_ns"],
+            ]
+            times += [data[f"p{pct}_ns"] for pct in PERCENTILES]
+            row = f"{name[-40:]:<40}{data['calls']:>10}{data['errors']:>10}"
+            row += "".join(f"{t / 1e6:>10.3f}" for t in times)
+            lines.append(row)
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        """Forget every recorded call."""
+        with self._lock:
+            shards = [(lock, stats) for _, lock, stats in self._shards]
+            for lock, stats in [*shards, self._retired]:
+                with lock:
+                    stats.clear()
+
+
+# Default registry used by func_wrapper(profile=True)
+STATS = StatsRegistry()
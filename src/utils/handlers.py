@@ -0,0 +1,179 @@
+"""
+Logging handlers used by create_logger in src/utils/logger.py.
+
+This module provides:
+- BoundedQueueHandler / FlushingQueueListener: the async mode, a bounded
+    queue with an overflow policy drained by a background listener.
+- DatedRotatingFileHandler: size-rotated "{date}_{file_name}.log" files that
+    move on to a new file at midnight.
+- PerProcessRotatingFileHandler: one dated file per process for
+    multi-worker deployments, merged with src.utils.log_merge.
+
+Note:
+    - src.utils.logger only imports this module (and logging.handlers) when
+        a logger is actually configured, keeping imports cheap.
+"""
+
+import atexit
+import logging
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+)
+import os
+import queue
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+# What BoundedQueueHandler does when its queue is full
+OVERFLOW_POLICIES = ("block", "drop-oldest", "drop-debug")
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler over a bounded queue with a configurable overflow policy.
+
+    Overflow policies:
+        block       wait for the listener to make room (nothing is lost)
+        drop-oldest discard the oldest queued record to make room
+        drop-debug  discard DEBUG (and lower) records, block for the rest
+
+    Attributes:
+        listener (QueueListener): Background listener owning the real handlers.
+        dropped (int): Number of records discarded by the overflow policy.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = "block"):
+        if overflow not in OVERFLOW_POLICIES:
+            msg = f"overflow must be one of {OVERFLOW_POLICIES}"
+            raise ValueError(f"{msg}, got {overflow!r}")
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.listener: Optional[FlushingQueueListener] = None
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.overflow == "drop-debug":
+            if record.levelno <= logging.DEBUG:
+                self.dropped += 1
+            else:
+                self.queue.put(record)
+            return
+        # drop-oldest: make room, racing other producers if need be
+        while True:
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+                return
+            except queue.Full:
+                continue
+
+    def close(self) -> None:
+        """Stop the listener (flushing queued records) before closing."""
+        if self.listener is not None:
+            self.listener.stop()
+            atexit.unregister(self.listener.stop)
+            self.listener = None
+        super().close()
+
+
+class FlushingQueueListener(QueueListener):
+    """
+    QueueListener that can be stopped safely on a bounded queue.
+
+    The stdlib listener enqueues its stop sentinel with put_nowait(), which
+    raises queue.Full when the queue is at capacity; this one waits for room
+    so every record queued before stop() is still written. stop() is also
+    safe to call more than once (e.g. explicitly and again from atexit).
+    """
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        super().stop()
+        for handler in self.handlers:
+            handler.close()
+
+
+class DatedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler writing "{log_loc}/{date}_{file_name}.log".
+
+    On the first record after local midnight it moves on to the new date's
+    file, so a long-running process does not keep writing to the date it
+    was started on. Size-based rotation still applies within a day.
+    """
+
+    def __init__(self, log_loc: str, file_name: str, **kwargs):
+        self.log_loc = os.path.abspath(log_loc)
+        self.file_name = file_name
+        self.set_day(date.today())
+        super().__init__(self.path_for(self.day), **kwargs)
+
+    def path_for(self, day: date) -> str:
+        return os.path.join(self.log_loc, f"{day}_{self.file_name}.log")
+
+    def set_day(self, day: date) -> None:
+        self.day = day
+        tomorrow = day + timedelta(days=1)
+        midnight = datetime(tomorrow.year, tomorrow.month, tomorrow.day)
+        self.rollover_at = midnight.timestamp()
+
+    def switch_to(self, path: str) -> None:
+        """Close the current file; the next record opens `path`."""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        self.baseFilename = path
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.created >= self.rollover_at:
+            self.set_day(date.fromtimestamp(record.created))
+            self.switch_to(self.path_for(self.day))
+        super().emit(record)
+
+
+class PerProcessRotatingFileHandler(DatedRotatingFileHandler):
+    """
+    DatedRotatingFileHandler writing one file per process, for multi-worker
+    deployments (gunicorn, uwsgi) where several processes share a log name.
+
+    Process 1234 writes to "{date}_{file_name}.1234.log" and rotates only
+    that file, so workers never rotate each other's files or interleave
+    partial lines. A handler inherited across fork() (e.g. gunicorn
+    --preload) switches to the child's own file on its first record. Use
+    src.utils.log_merge to merge the files back into one.
+    """
+
+    def __init__(self, log_loc: str, file_name: str, **kwargs):
+        self.pid = os.getpid()
+        kwargs["delay"] = True
+        super().__init__(log_loc, file_name, **kwargs)
+
+    def path_for(self, day: date) -> str:
+        name = f"{day}_{self.file_name}.{self.pid}.log"
+        return os.path.join(self.log_loc, name)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        pid = os.getpid()
+        if pid != self.pid:
+            # forked: the inherited stream belongs to the parent's file
+            self.pid = pid
+            self.switch_to(self.path_for(self.day))
+        super().emit(record)
@@ -0,0 +1,133 @@
+"""
+Structured (one JSON object per line) log formatting.
+
+This module provides:
+- JsonFormatter: a logging.Formatter emitting JSON lines, with static fields
+    (host, app, ...) serialised once instead of on every record.
+- Lazy: a deferred value for log arguments and `extra` fields, only
+    evaluated when a handler actually formats the record.
+- dumps: orjson when it is installed, otherwise the stdlib json encoder.
+
+Usage:
+    from src.utils.logger import create_logger
+    logger = create_logger(file_name="my_log", json_format=True)
+    logger.debug("state: %s", Lazy(pprint.pformat, big_state))
+    logger.info("saved", extra={"plant_id": 7})
+
+Note:
+    - Records carry "ts", "level", "logger", "msg", "module", "func", "line"
+        and "pid", then any `extra` fields, then "exc" when there is one.
+    - "ts" is UTC with a "Z" suffix, so records from hosts in different
+        time zones sort together.
+    - An `extra` field named like a built-in or static field (e.g. "host")
+        is written as "extra_host" instead of producing a duplicate key.
+    - Values that are not JSON types are written with str().
+"""
+
+import json
+import logging
+import socket
+import time
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Attributes every LogRecord has; anything else came from `extra`
+_BLANK_RECORD = logging.LogRecord("", 0, "", 0, "", None, None)
+RECORD_ATTRS = frozenset(vars(_BLANK_RECORD)) | {"message", "asctime"}
+
+
+def dumps(data: dict) -> str:
+    """Serialise `data` to a compact JSON string, using orjson if possible."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode()
+    return json.dumps(data, default=str, separators=(",", ":"))
+
+
+class Lazy:
+    """
+    Defer `func(*args)` until the value is formatted.
+
+    logger.debug("%s", Lazy(pp.pformat, obj)) skips pformat entirely when
+    no handler emits the record.
+    """
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __str__(self) -> str:
+        return str(self.func(*self.args))
+
+    __repr__ = __str__
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as single-line JSON objects.
+
+    Takes in the following:
+        app             STR application name added to every record
+        static_fields   DICT extra constant fields added to every record
+    """
+
+    converter = time.gmtime
+
+    # keys format() writes for every record
+    RECORD_KEYS = frozenset(
+        ["ts", "level", "logger", "msg", "module", "func", "line", "pid"]
+        + ["exc", "stack"]
+    )
+
+    def __init__(self, app: str = "", static_fields: Optional[dict] = None):
+        super().__init__()
+        fields = {"host": socket.gethostname(), "app": app}
+        fields.update(static_fields or {})
+        # pre-serialised once: '"host":"...","app":"..."'
+        self._static = dumps(fields)[1:-1]
+        self._reserved = self.RECORD_KEYS | set(fields)
+        # (second, text) swapped as one tuple so handlers on other threads
+        # never pair one second with another second's text
+        self._second_cache = (None, "")
+
+    def formatTime(self, record, datefmt=None) -> str:
+        # strftime runs at most once per second of log records
+        second = int(record.created)
+        cached_second, text = self._second_cache
+        if second != cached_second:
+            text = time.strftime("%Y-%m-%dT%H:%M:%S", self.converter(second))
+            self._second_cache = (second, text)
+        return f"{text}.{int(record.msecs):03d}Z"
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "module": record.module,
+            "func": record.funcName,
+            "line": record.lineno,
+            "pid": record.process,
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRS:
+                if key in self._reserved:
+                    key = f"extra_{key}"
+                data[key] = str(value) if isinstance(value, Lazy) else value
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+        encoded = dumps(data)
+        if not self._static:
+            return encoded
+        return f"{encoded[:-1]},{self._static}}}"
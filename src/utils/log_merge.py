@@ -0,0 +1,120 @@
+"""
+Merge the per-process log files written by create_logger(process_safe=True).
+
+Every worker process writes "{root}.{pid}{ext}" (plus rotated backups
+"{root}.{pid}{ext}.1" ... ".N"). This module merges them back into a single
+chronological log:
+- each worker's files are read oldest backup first, so its own order holds
+- workers are interleaved by the millisecond timestamp starting each record
+    (text lines, or JSON lines from create_logger(json_format=True))
+- continuation lines (e.g. tracebacks) stay attached to their record
+
+Usage:
+    python -m src.utils.log_merge logs/2025-01-01_App.log
+    python -m src.utils.log_merge logs/2025-01-01_App.log -o merged.log
+
+Note:
+    - Only whole records are merged, so a worker that is still running may
+        have more to write; merge after the workers have stopped.
+"""
+
+import argparse
+import glob
+import heapq
+import os
+import re
+import sys
+from typing import Iterator, Optional
+
+# "2025-01-01 12:00:00.123 " - written by the process_safe text format, or
+# '{"ts":"2025-01-01T12:00:00.123Z"' - written by JsonFormatter
+RECORD_START = re.compile(
+    r'(?:\{"ts": ?")?(\d{4}-\d\d-\d\d)[ T](\d\d:\d\d:\d\d\.\d{3})Z?[ "]'
+)
+
+
+def timestamp(record: str) -> tuple:
+    """Sort key of `record`: its (date, time) or empty strings."""
+    match = RECORD_START.match(record)
+    return match.groups() if match else ("", "")
+
+
+def worker_files(template_path: str) -> dict:
+    """
+    Return {pid: [paths, oldest first]} for the per-process files of
+    `template_path`.
+    """
+    root, ext = os.path.splitext(template_path)
+    pattern = re.compile(
+        re.escape(root) + r"\.(\d+)" + re.escape(ext) + r"(?:\.(\d+))?$"
+    )
+    workers: dict = {}
+    for path in glob.glob(f"{glob.escape(root)}.*{glob.escape(ext)}*"):
+        match = pattern.match(path)
+        if match is None:
+            continue
+        pid, backup = int(match.group(1)), int(match.group(2) or 0)
+        workers.setdefault(pid, []).append((backup, path))
+    # RotatingFileHandler: ".N" is older than ".N-1", the bare file newest
+    return {
+        pid: [path for _, path in sorted(paths, reverse=True)]
+        for pid, paths in sorted(workers.items())
+    }
+
+
+def iter_records(paths: list) -> Iterator[str]:
+    """Yield whole records (with continuation lines) from `paths` in order."""
+    record = ""
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as log_file:
+            for line in log_file:
+                if record and RECORD_START.match(line):
+                    yield record
+                    record = ""
+                record += line
+    if record:
+        yield record
+
+
+def merge_worker_logs(
+    template_path: str,
+    output_path: Optional[str] = None,
+) -> int:
+    """
+    Takes in the following:
+        template_path   STR log path given to create_logger, e.g.
+                        logs/2025-01-01_App.log
+        output_path     STR file to write the merged log to (default stdout)
+
+    Returns the number of records written.
+    """
+    workers = worker_files(template_path).values()
+    streams = [iter_records(paths) for paths in workers]
+    merged = heapq.merge(*streams, key=timestamp)
+
+    out = sys.stdout
+    if output_path is not None:
+        out = open(output_path, "w", encoding="utf-8")
+    count = 0
+    try:
+        for record in merged:
+            out.write(record)
+            count += 1
+    finally:
+        if output_path is not None:
+            out.close()
+    return count
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("template_path", help="log path without the pid")
+    parser.add_argument("-o", "--output", help="write here instead of stdout")
+    args = parser.parse_args(argv)
+    count = merge_worker_logs(args.template_path, args.output)
+    print(f"merged {count} records", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
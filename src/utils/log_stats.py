@@ -0,0 +1,256 @@
+"""
+Log-file analytics for the files written by create_logger.
+
+Reads the current log and its rotated backups ("{path}.5" ... "{path}.1",
+oldest first) through read-only memory maps, one line at a time, so files of
+any size are processed without loading them into memory. Lines are parsed
+as bytes and only the messages of interest are decoded.
+
+Reports, per decorated function (from func_wrapper's "Starting"/"Ending"
+records):
+- calls (Starting records) and completed calls (matched Ending records)
+- errors (CRITICAL records func_wrapper logs before re-raising) and rate
+- duration of each Starting/Ending pair: total, p50/p95/p99 and max
+and the number of records per level.
+
+Usage:
+    python -m src.utils.log_stats logs/2025-01-01_Template_Repo.log
+    python -m src.utils.log_stats logs/*_App.*.log --json
+
+Note:
+    - Text layouts: the default "%(asctime)s %(filename)s %(funcName)s
+        %(levelname)s %(message)s" (1 s resolution) and the process_safe one
+        with milliseconds and the pid (1 ms resolution). JSON lines from
+        create_logger(json_format=True) are read too.
+    - Starting/Ending pairs are matched per process and function, most
+        recent Starting first, so recursion and other functions in between
+        are handled; concurrent threads running the same function are not
+        told apart.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import sys
+from datetime import datetime
+from typing import Iterator, Optional
+
+from src.utils.call_stats import FunctionStats
+
+# funcName of the records func_wrapper emits itself
+WRAPPER_FUNCS = (
+    b"log_func_wrapper",
+    b"log_coro_wrapper",
+    b"log_agen_wrapper",
+)
+STARTING, STARTING_LEN = b"Starting ", len(b"Starting ")
+ENDING, ENDING_LEN = b"Ending ", len(b"Ending ")
+MODULE_SEP = b" from module:"
+BACKUP_COUNT = 5
+
+
+def log_files(path: str, backups: int = BACKUP_COUNT) -> list:
+    """Return `path` and its existing rotated backups, oldest first."""
+    candidates = [f"{path}.{i}" for i in range(backups, 0, -1)] + [path]
+    return [candidate for candidate in candidates if os.path.exists(candidate)]
+
+
+def iter_lines(path: str) -> Iterator[bytes]:
+    """Yield the lines of `path` (without newlines) from a memory map."""
+    if not os.path.getsize(path):
+        return
+    with open(path, "rb") as log_file:
+        with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start, size = 0, len(mm)
+            while start < size:
+                end = mm.find(b"\n", start)
+                if end == -1:
+                    end = size
+                yield mm[start:end]
+                start = end + 1
+
+
+class LogStats:
+    """Accumulates per-function and per-level statistics from log lines."""
+
+    def __init__(self):
+        self.functions: dict = {}
+        self.calls: dict = {}
+        self.errors: dict = {}
+        self.levels: dict = {}
+        self.unparsed = 0
+        # (pid, function) -> start times (ns) of its open calls
+        self._open: dict = {}
+        # pid -> [function, failed] of open calls, innermost last
+        self._stack: dict = {}
+        self._day_text = b""
+        self._day_ns = 0
+
+    def _timestamp_ns(self, day: bytes, clock: bytes) -> int:
+        """Parse "YYYY-MM-DD" and "HH:MM:SS[.mmm]" into epoch ns."""
+        if day != self._day_text:
+            # strptime runs once per day of log records
+            midnight = datetime.strptime(day.decode(), "%Y-%m-%d")
+            self._day_text = day
+            self._day_ns = int(midnight.timestamp()) * 1_000_000_000
+        seconds = int(clock[:2]) * 3600 + int(clock[3:5]) * 60
+        seconds += int(clock[6:8])
+        millis = int(clock[9:12]) if len(clock) > 8 else 0
+        return self._day_ns + seconds * 1_000_000_000 + millis * 1_000_000
+
+    def _parse(self, line: bytes) -> Optional[tuple]:
+        """Return (ns, pid, funcName, level, message) or None."""
+        if line[:1] == b"{":
+            return self._parse_json(line)
+        if not line[:1].isdigit():
+            return None  # traceback or other continuation line
+        clock = line[11:23]
+        if clock[8:9] == b".":
+            # process_safe: date time.ms pid file func level message
+            parts = line.split(None, 6)
+            pid, fields = parts[2], parts[4:]
+        else:
+            # default: date time file func level message
+            parts = line.split(None, 5)
+            pid, fields = b"", parts[3:]
+        if len(fields) < 2:
+            return None
+        func, level = fields[0], fields[1]
+        message = fields[2] if len(fields) > 2 else b""
+        ns = self._timestamp_ns(parts[0], parts[1])
+        return ns, pid, func, level, message
+
+    def _parse_json(self, line: bytes) -> Optional[tuple]:
+        try:
+            record = json.loads(line)
+            day, clock = record["ts"].split("T")
+        except (ValueError, KeyError, AttributeError):
+            return None
+        return (
+            self._timestamp_ns(day.encode(), clock.encode()),
+            str(record.get("pid", "")).encode(),
+            record.get("func", "").encode(),
+            record.get("level", "").encode(),
+            record.get("msg", "").encode(),
+        )
+
+    def add_line(self, line: bytes) -> None:
+        parsed = self._parse(line)
+        if parsed is None:
+            self.unparsed += 1
+            return
+        ns, pid, func, level, message = parsed
+        self.levels[level] = self.levels.get(level, 0) + 1
+        if func not in WRAPPER_FUNCS:
+            return
+
+        stack = self._stack.setdefault(pid, [])
+        if message.startswith(STARTING):
+            name = message.partition(MODULE_SEP)[0][STARTING_LEN:]
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self._open.setdefault((pid, name), []).append(ns)
+            stack.append([name, False])
+        elif message.startswith(ENDING):
+            name = message.partition(MODULE_SEP)[0][ENDING_LEN:]
+            failed = False
+            # unwind to this call, skipping calls whose Ending is missing
+            while stack:
+                top, top_failed = stack.pop()
+                if top == name:
+                    failed = top_failed
+                    break
+            started = self._open.get((pid, name))
+            if started:
+                func_stats = self.functions.get(name)
+                if func_stats is None:
+                    func_stats = FunctionStats(name.decode())
+                    self.functions[name] = func_stats
+                func_stats.record(ns - started.pop(), 0, failed)
+        elif level == b"CRITICAL" and stack:
+            # logged by the innermost open call just before it re-raises
+            stack[-1][1] = True
+            name = stack[-1][0]
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    def add_file(self, path: str) -> None:
+        for line in iter_lines(path):
+            self.add_line(line)
+
+    def snapshot(self) -> dict:
+        """Return {"functions": {...}, "levels": {...}, "unparsed": n}."""
+        functions = {}
+        for name, calls in self.calls.items():
+            func_stats = self.functions.get(name) or FunctionStats("")
+            errors = self.errors.get(name, 0)
+            data = func_stats.as_dict()
+            functions[name.decode()] = {
+                "calls": calls,
+                "completed": data["calls"],
+                "errors": errors,
+                "error_rate": round(errors / calls, 4),
+                "wall_total_ns": data["wall_total_ns"],
+                "wall_min_ns": data["wall_min_ns"],
+                "wall_max_ns": data["wall_max_ns"],
+                "p50_ns": data["p50_ns"],
+                "p95_ns": data["p95_ns"],
+                "p99_ns": data["p99_ns"],
+            }
+        ordered = sorted(
+            functions.items(),
+            key=lambda item: (item[1]["wall_total_ns"], item[1]["calls"]),
+            reverse=True,
+        )
+        return {
+            "functions": dict(ordered),
+            "levels": {k.decode(): v for k, v in sorted(self.levels.items())},
+            "unparsed": self.unparsed,
+        }
+
+    def format_table(self) -> str:
+        """Return the snapshot as fixed-width tables, durations in ms."""
+        snapshot = self.snapshot()
+        columns = ["calls", "errors", "err %", "total", "p50", "p95", "max"]
+        header = f"{'function':<40}" + "".join(f"{c:>10}" for c in columns)
+        lines = [header, "-" * len(header)]
+        for name, data in snapshot["functions"].items():
+            row = f"{name[-40:]:<40}{data['calls']:>10}{data['errors']:>10}"
+            row += f"{data['error_rate'] * 100:>10.1f}"
+            times = ["wall_total_ns", "p50_ns", "p95_ns", "wall_max_ns"]
+            row += "".join(f"{data[t] / 1e6:>10.1f}" for t in times)
+            lines.append(row)
+        lines.append("")
+        for level, count in snapshot["levels"].items():
+            lines.append(f"{level:<40}{count:>10}")
+        return "\n".join(lines)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="+", help="current log file(s)")
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="print a JSON snapshot",
+    )
+    parser.add_argument(
+        "--backups",
+        type=int,
+        default=BACKUP_COUNT,
+        help="rotated backups to read per file (default %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    stats = LogStats()
+    for path in args.paths:
+        for log_file in log_files(path, args.backups):
+            stats.add_file(log_file)
+    if args.json:
+        print(json.dumps(stats.snapshot(), indent=2))
+    else:
+        print(stats.format_table())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
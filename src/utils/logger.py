@@ -6,6 +6,18 @@ This module provides:
     console handlers, each with customizable formats and logging levels.
 - Decorators (func_wrapper, sol_wrapper) for automatic logging of function and
     solution execution.
+- An opt-in profiling mode (func_wrapper(profile=True)) recording per-call
+    wall/CPU time in src.utils.call_stats, reported by sol_wrapper on exit.
+- An optional process-safe mode (process_safe=True) giving every worker
+    process its own rotating file, merged later by src.utils.log_merge.
+- An optional JSON lines file format (json_format=True), see
+    src.utils.json_formatter.
+- An optional in-memory (or mmap'd) ring buffer of the last N records
+    (ring_buffer=N), dumped by sol_wrapper when the solution fails.
+- Deferred setup (deferred=True): the log directory, files and handlers are
+    only created when the first record is logged.
+- An optional async mode (async_mode=True) where records are handed to a
+    background QueueListener, so callers never wait on file or console I/O.
 - Security best practices: avoids logging sensitive data and uses safe string
     formatting.
 
@@ -21,25 +33,146 @@ Note:
 """
 
 import logging
-from logging.handlers import RotatingFileHandler
 import os
-from datetime import date
-from typing import Optional
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional
 import functools
+import itertools
 
-import pprint
+# Heavier modules (pprint, logging.handlers, queue, the optional formatters
+# and handlers) are imported where they are first needed, so importing this
+# module - and every script decorated with it - stays cheap.
+if TYPE_CHECKING:
+    from src.utils.call_stats import StatsRegistry
 
-pp = pprint.PrettyPrinter(indent=4)
+# code object flags, see inspect.CO_COROUTINE / inspect.CO_ASYNC_GENERATOR
+CO_COROUTINE = 0x80
+CO_ASYNC_GENERATOR = 0x200
+
+# Names re-exported from src.utils.handlers on first access
+_HANDLER_NAMES = (
+    "OVERFLOW_POLICIES",
+    "BoundedQueueHandler",
+    "FlushingQueueListener",
+    "DatedRotatingFileHandler",
+    "PerProcessRotatingFileHandler",
+)
+
+
+def __getattr__(name):
+    if name in _HANDLER_NAMES:
+        from src.utils import handlers
+
+        return getattr(handlers, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.cache
+def _pretty_printer():
+    import pprint
+
+    return pprint.PrettyPrinter(indent=4)
+
+
+def _lazy_pformat(obj):
+    """pformat `obj`, but only once a handler actually formats the record."""
+    from src.utils.json_formatter import Lazy
+
+    return Lazy(_pretty_printer().pformat, obj)
+
+
+def _async_kind(func) -> int:
+    """Return CO_COROUTINE, CO_ASYNC_GENERATOR or 0 for `func`."""
+    code = getattr(func, "__code__", None)
+    if code is None:
+        # partials, callable objects, ... - leave it to inspect
+        import inspect
+
+        if inspect.isasyncgenfunction(func):
+            return CO_ASYNC_GENERATOR
+        return CO_COROUTINE if inspect.iscoroutinefunction(func) else 0
+    return code.co_flags & (CO_COROUTINE | CO_ASYNC_GENERATOR)
 
-today = date.today()
 
 # ===========================================================================
 # https://docs.python.org/3.12/howto/logging-cookbook.html#how-to-treat-a-logger-like-an-output-stream
 # could be used when considering creation of a class instead of a function
 # ===========================================================================
 
-# Cache for logger instances to avoid redundant configuration
-_logger_cache = {}
+# Cache for logger instances to avoid redundant configuration; the least
+# recently used logger is dropped once more than LOGGER_CACHE_SIZE exist,
+# and shut down unless a caller still holds it
+LOGGER_CACHE_SIZE = 32
+_logger_cache: OrderedDict = OrderedDict()
+_logger_cache_lock = threading.Lock()
+
+
+def _internal_refs(logger: logging.Logger) -> int:
+    """Count references to `logger` from logging itself beyond loggerDict."""
+    # DeferredSetupHandler points back at its logger
+    refs = sum(getattr(h, "logger", None) is logger for h in logger.handlers)
+    # so do the placeholders of its not-yet-created ancestors
+    name, logger_dict = logger.name, logging.Logger.manager.loggerDict
+    while "." in name:
+        name = name.rpartition(".")[0]
+        node = logger_dict.get(name)
+        if isinstance(node, logging.PlaceHolder) and logger in node.loggerMap:
+            refs += 1
+    return refs
+
+
+def _external_refs(logger: logging.Logger) -> int:
+    return sys.getrefcount(logger) - _internal_refs(logger)
+
+
+def _unheld_refs() -> int:
+    """What _external_refs() returns for a logger only logging holds."""
+    registry = {"probe": logging.Logger("probe")}  # stands in for loggerDict
+    evicted = registry["probe"]
+    return _external_refs(evicted)
+
+
+# anything above this is a caller (e.g. a module-level logger or a
+# func_wrapper closure) still holding the logger
+_UNHELD_REFS = _unheld_refs()
+
+
+# How sol_wrapper reports call statistics on exit
+STATS_REPORTS = (None, "table", "json")
+
+
+def shutdown_logger(logger: logging.Logger) -> None:
+    """
+    Flush and close every handler on `logger`, stopping any background
+    listener first so queued records reach their files.
+    """
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.flush()
+        handler.close()
+
+
+def get_file_handlers(logger: logging.Logger) -> list:
+    """Return the file handlers behind `logger`, including queued ones."""
+    handlers = []
+    for handler in logger.handlers:
+        listener = getattr(handler, "listener", None)  # BoundedQueueHandler
+        if listener is not None:
+            handlers.extend(listener.handlers)
+        else:
+            handlers.append(handler)
+    return [h for h in handlers if isinstance(h, logging.FileHandler)]
+
+
+def get_ring_buffers(logger: logging.Logger) -> list:
+    """Return the ring buffer handlers attached to `logger`."""
+    from src.utils.ring_buffer import BaseRingBufferHandler
+
+    return [h for h in logger.handlers if isinstance(h, BaseRingBufferHandler)]
 
 
 # logging levels:  https://docs.python.org/3/library/logging.html#logging-levels  # noqa: E501
@@ -50,6 +183,15 @@ def create_logger(
     console_lvl: int = logging.WARNING,
     # log_loc:str=f"{os.getcwd()}/logs") -> logging.Logger:
     log_loc: Optional[str] = None,
+    async_mode: bool = False,
+    queue_size: int = 10000,
+    overflow: str = "block",
+    process_safe: bool = False,
+    json_format: bool = False,
+    app: Optional[str] = None,
+    ring_buffer: int = 0,
+    ring_buffer_path: Optional[str] = None,
+    deferred: bool = False,
 ) -> logging.Logger:
     """
     Takes in the following:
@@ -58,10 +200,36 @@ def create_logger(
         file_lvl        INT must tie in to logging level INTs (else raise error)  # noqa: E501
         console_level   INT must tie in to logging level INTs (else raise error)  # noqa: E501
         log_loc         STR by default will use local script's folder/logs
+        async_mode      BOOL route records through a QueueHandler to a
+                        background QueueListener owning the file/console
+                        handlers, so callers never wait on disk
+        queue_size      INT max records waiting in async mode (0 = unbounded)
+        overflow        STR async mode policy when the queue is full:
+                        "block", "drop-oldest" or "drop-debug"
+        process_safe    BOOL write one file per process
+                        ({date}_{file_name}.{pid}.log) for multi-worker
+                        servers; merge them with src.utils.log_merge
+        json_format     BOOL write the log file as JSON lines (JsonFormatter)
+                        instead of text; the console stays human-readable
+        app             STR "app" field of JSON records (default file_name)
+        ring_buffer     INT also keep the last N records (every level) in
+                        a ring buffer, dumped to {file_name}_crash.log in
+                        log_loc by sol_wrapper on an error (0 = off)
+        ring_buffer_path STR keep the ring in this mmap'd file instead of
+                        memory, so it survives a hard crash
+        deferred        BOOL return the logger straight away but only create
+                        the log directory, files and handlers when the
+                        first record is logged
 
     With provided inputs, creates & returns a logger object
     with specific formatting for file and console needs.
 
+    Every distinct configuration gets its own logger namespace and
+    handlers; the log file follows the date, moving to a new file at
+    midnight. The LOGGER_CACHE_SIZE most recently used loggers are cached;
+    older ones are shut down (their files closed) when evicted, unless the
+    caller still holds them.
+
     Returns:
         Logger: Configured logger instance.
 
@@ -76,25 +244,62 @@ def create_logger(
         )  # noqa: E501
 
     # Create cache key from configuration parameters
-    cache_key = (file_name, file_mode, file_lvl, console_lvl, log_loc)
-
-    # Return cached logger if available
-    if cache_key in _logger_cache:
-        return _logger_cache[cache_key]
+    cache_key = (
+        file_name,
+        file_mode,
+        file_lvl,
+        console_lvl,
+        log_loc,
+        async_mode,
+        queue_size,
+        overflow,
+        process_safe,
+        json_format,
+        app,
+        ring_buffer,
+        ring_buffer_path,
+        deferred,
+    )
+
+    with _logger_cache_lock:
+        # Return cached logger if available
+        if cache_key in _logger_cache:
+            _logger_cache.move_to_end(cache_key)
+            return _logger_cache[cache_key]
+
+        logger = _configure_logger(cache_key)
+
+        # Cache the logger before returning
+        _logger_cache[cache_key] = logger
+        while len(_logger_cache) > LOGGER_CACHE_SIZE:
+            _, evicted = _logger_cache.popitem(last=False)
+            # closing a held logger would send its records to lastResort;
+            # create_logger() with the same configuration returns it again
+            if _external_refs(evicted) <= _UNHELD_REFS:
+                shutdown_logger(evicted)
+    return logger
 
-    # if file for writing logs does not exist, create it
-    if not os.path.exists(log_loc):
-        os.makedirs(log_loc)
 
-    log_path = os.path.join(log_loc, f"{today}_{file_name}.log")
+def _configure_logger(cache_key: tuple) -> logging.Logger:
+    """Return the logger for one create_logger() configuration."""
+    file_name, deferred = cache_key[0], cache_key[-1]
+    file_lvl, console_lvl = cache_key[2], cache_key[3]
+    ring_buffer = cache_key[11]
 
     # =======================================================================
     # logging to multiple locations
     # https://docs.python.org/3.12/howto/logging-cookbook.html#logging-to-multiple-destinations
     # =======================================================================
 
-    logger = logging.getLogger(__name__)  # root logger from main script
-    logger.setLevel(logging.DEBUG)
+    # one logger namespace per configuration, so configurations never
+    # share handlers; the digest keeps the name stable across evictions
+    digest = f"{zlib.crc32(repr(cache_key).encode()):08x}"
+    logger = logging.getLogger(f"{__name__}.{file_name}.{digest}")
+    # the lowest level any handler wants, so disabled levels (and the
+    # func_wrapper fast path) skip record creation entirely; the ring
+    # buffer keeps every level
+    level = min(file_lvl, console_lvl)
+    logger.setLevel(min(level, logging.DEBUG) if ring_buffer else level)
     logger.propagate = False
 
     # logging_buffer = io.StringIO()
@@ -102,44 +307,245 @@ def create_logger(
 
     # Prevent duplicate handlers
     if not logger.handlers:
-        # File handler - max 5 files of 1MB each
-        # file_handler = logging.FileHandler(log_path, mode=file_mode, encoding="utf-8")  # noqa: E501
-        file_handler = RotatingFileHandler(
-            log_path,
-            mode=file_mode,
-            maxBytes=1024 * 1024,
-            backupCount=5,
-            encoding="utf-8",
-        )
-        file_handler.setLevel(file_lvl)
+        setup = functools.partial(_build_handlers, cache_key)
+        if deferred:
+            logger.addHandler(DeferredSetupHandler(logger, setup))
+        else:
+            for handler in setup():
+                logger.addHandler(handler)
+    return logger
+
+
+def _build_handlers(cache_key: tuple) -> list:
+    """Create the log directory and the handlers for a configuration."""
+    (
+        file_name,
+        file_mode,
+        file_lvl,
+        console_lvl,
+        log_loc,
+        async_mode,
+        queue_size,
+        overflow,
+        process_safe,
+        json_format,
+        app,
+        ring_buffer,
+        ring_buffer_path,
+        _,
+    ) = cache_key
+    from src.utils import handlers
+
+    # if file for writing logs does not exist, create it
+    if not os.path.exists(log_loc):
+        os.makedirs(log_loc)
+
+    # File handler - max 5 files of 1MB each
+    # file_handler = logging.FileHandler(log_path, mode=file_mode, encoding="utf-8")  # noqa: E501
+    handler_class = handlers.DatedRotatingFileHandler
+    file_fmt = "%(asctime)s %(filename)-15s %(funcName)-18s %(levelname)-8s %(message)s"  # noqa: E501
+    if process_safe:
+        # millisecond timestamps + pid so log_merge can order workers
+        handler_class = handlers.PerProcessRotatingFileHandler
+        file_fmt = "%(asctime)s.%(msecs)03d %(process)-7d %(filename)-15s %(funcName)-18s %(levelname)-8s %(message)s"  # noqa: E501
+    file_handler = handler_class(
+        log_loc,
+        file_name,
+        mode=file_mode,
+        maxBytes=1024 * 1024,
+        backupCount=5,
+        encoding="utf-8",
+    )
+    file_handler.setLevel(file_lvl)
+    if json_format:
+        from src.utils.json_formatter import JsonFormatter
+
+        file_format = JsonFormatter(app=app or file_name)
+    else:
         file_format = logging.Formatter(
-            "%(asctime)s %(filename)-15s %(funcName)-18s %(levelname)-8s %(message)s",  # noqa: E501
+            file_fmt,
             datefmt="%Y-%m-%d %H:%M:%S",
         )
-        file_handler.setFormatter(file_format)
-        logger.addHandler(file_handler)
-
-        # Console handler - log to console (sys.stderr)
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(console_lvl)
-        console_format = logging.Formatter(
-            "%(name)-12s line %(lineno)-s %(levelname)-8s | %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
+    file_handler.setFormatter(file_format)
+
+    # Console handler - log to console (sys.stderr)
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(console_lvl)
+    console_format = logging.Formatter(
+        "%(name)-12s line %(lineno)-s %(levelname)-8s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    console_handler.setFormatter(console_format)
+
+    if async_mode:
+        import atexit
+        import queue
+
+        # only the queue handler runs in the caller's thread; the
+        # listener thread does the formatting-to-disk and console I/O
+        queue_handler = handlers.BoundedQueueHandler(
+            queue.Queue(maxsize=queue_size), overflow
+        )
+        queue_handler.setLevel(min(file_lvl, console_lvl))
+        queue_handler.listener = handlers.FlushingQueueListener(
+            queue_handler.queue,
+            file_handler,
+            console_handler,
+            respect_handler_level=True,
+        )
+        queue_handler.listener.start()
+        atexit.register(queue_handler.listener.stop)
+        built = [queue_handler]
+    else:
+        built = [file_handler, console_handler]
+
+    if ring_buffer:
+        from src.utils.ring_buffer import (
+            MmapRingBufferHandler,
+            RingBufferHandler,
         )
-        console_handler.setFormatter(console_format)
-        logger.addHandler(console_handler)
 
-    # Cache the logger before returning
-    _logger_cache[cache_key] = logger
-    return logger
+        # kept out of the queue: storing a record is cheaper than
+        # handing it to the listener thread
+        dump_path = os.path.join(log_loc, f"{file_name}_crash.log")
+        if ring_buffer_path:
+            ring_handler = MmapRingBufferHandler(
+                ring_buffer_path, ring_buffer, dump_path=dump_path
+            )
+        else:
+            ring_handler = RingBufferHandler(ring_buffer, dump_path)
+        ring_handler.setFormatter(file_format)
+        built.append(ring_handler)
+    return built
+
+
+class DeferredSetupHandler(logging.Handler):
+    """
+    Placeholder handler of a create_logger(deferred=True) logger.
+
+    The first record to reach it builds the real handlers (creating the log
+    directory and opening files), swaps them in for this placeholder and
+    passes the record on, so a logger that is never used costs no I/O.
+    """
+
+    def __init__(self, logger: logging.Logger, setup):
+        super().__init__()
+        self.logger = logger
+        self.setup = setup
+        self.done = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not self.done:
+            self.done = True
+            others = [h for h in self.logger.handlers if h is not self]
+            # a new list: Logger.callHandlers may be iterating the old one
+            self.logger.handlers = others + self.setup()
+        for handler in self.logger.handlers:
+            if handler is not self and record.levelno >= handler.level:
+                handler.handle(record)
+
 
+def _timed(func, name: str, registry: "StatsRegistry"):
+    """
+    Wrap `func` so every call's wall and CPU time land in `registry`.
 
-def func_wrapper(logger):
+    Coroutine functions are timed from first step to completion, and async
+    generators from first item to exhaustion. CPU time is process-wide, so
+    under asyncio it includes other tasks running while `func` awaits.
+    """
+
+    def record(wall_start, cpu_start, failed):
+        registry.record(
+            name,
+            time.perf_counter_ns() - wall_start,
+            time.process_time_ns() - cpu_start,
+            failed,
+        )
+
+    kind = _async_kind(func)
+    if kind == CO_ASYNC_GENERATOR:
+
+        @functools.wraps(func)
+        async def timed_agen(*args, **kwargs):
+            failed = False
+            wall_start = time.perf_counter_ns()
+            cpu_start = time.process_time_ns()
+            try:
+                async for item in func(*args, **kwargs):
+                    yield item
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                record(wall_start, cpu_start, failed)
+
+        return timed_agen
+
+    if kind == CO_COROUTINE:
+
+        @functools.wraps(func)
+        async def timed_coro(*args, **kwargs):
+            failed = False
+            wall_start = time.perf_counter_ns()
+            cpu_start = time.process_time_ns()
+            try:
+                return await func(*args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                record(wall_start, cpu_start, failed)
+
+        return timed_coro
+
+    @functools.wraps(func)
+    def timed_func(*args, **kwargs):
+        failed = False
+        wall_start = time.perf_counter_ns()
+        cpu_start = time.process_time_ns()
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            record(wall_start, cpu_start, failed)
+
+    return timed_func
+
+
+def func_wrapper(
+    logger,
+    sample_rate: int = 1,
+    profile: bool = False,
+    registry: Optional["StatsRegistry"] = None,
+):
     """
     Wrapper function to provide start and end logging
     when running functions without interfering with
     other arguments or returned data.
+
+    Takes in the following:
+        logger          Logger to write to
+        sample_rate     INT log start/end for 1 in every N calls (default
+                        every call); exceptions are always logged
+        profile         BOOL record wall/CPU time of every call (sampled or
+                        not) in `registry`
+        registry        StatsRegistry to record into, default call_stats.STATS
+
+    When the logger is not enabled for DEBUG, calls skip the start/end
+    logging entirely and only pay for one cached isEnabledFor() check.
+
+    Coroutine functions and async generators get an `async def` wrapper, so
+    "Ending" is logged once the coroutine finishes (or the generator is
+    exhausted) and exceptions raised while awaiting are logged too.
     """
+    if sample_rate < 1:
+        raise ValueError(f"sample_rate must be >= 1, got {sample_rate}")
+    if profile and registry is None:
+        from src.utils.call_stats import STATS
+
+        registry = STATS
 
     def decorator(func):
         """
@@ -147,39 +553,142 @@ def func_wrapper(logger):
         It logs the start and end of the function execution,
         and handles exceptions by logging them as critical errors.
         """
+        name, module = func.__qualname__, func.__module__
+        kind = _async_kind(func)
+        calls = itertools.count()
+        call = _timed(func, f"{module}.{name}", registry) if profile else func
+
+        def log_start():
+            """Log "Starting" if this call is logged; return whether it is."""
+            if not logger.isEnabledFor(logging.DEBUG) or (
+                sample_rate > 1 and next(calls) % sample_rate
+            ):
+                return False
+            logger.debug("Starting %s from module:\t%s", name, module)
+            return True
+
+        def log_end():
+            logger.debug("Ending %s from module:\t%s", name, module)
+
+        if kind == CO_ASYNC_GENERATOR:
+
+            @functools.wraps(func)
+            async def log_agen_wrapper(*args, **kwargs):
+                logged = log_start()
+                try:
+                    async for item in call(*args, **kwargs):
+                        yield item
+                except Exception as err:
+                    logger.critical("%s", _lazy_pformat(err))
+                    raise
+                finally:
+                    if logged:
+                        log_end()
+
+            return log_agen_wrapper
+
+        if kind == CO_COROUTINE:
+
+            @functools.wraps(func)
+            async def log_coro_wrapper(*args, **kwargs):
+                logged = log_start()
+                try:
+                    return await call(*args, **kwargs)
+                except Exception as err:
+                    logger.critical("%s", _lazy_pformat(err))
+                    raise
+                finally:
+                    if logged:
+                        log_end()
+
+            return log_coro_wrapper
 
         @functools.wraps(func)
         def log_func_wrapper(*args, **kwargs):
             # logger = [arg for arg in args if isinstance(arg, logging.Logger)][0]  # noqa: E501
-            logger.debug(
-                "Starting %s from module:\t%s",
-                func.__qualname__,
-                func.__module__,  # noqa: E501
-            )
+            if not logger.isEnabledFor(logging.DEBUG) or (
+                sample_rate > 1 and next(calls) % sample_rate
+            ):
+                # fast path - no start/end records to build
+                try:
+                    return call(*args, **kwargs)
+                except Exception as err:
+                    logger.critical("%s", _lazy_pformat(err))
+                    raise
+
+            logger.debug("Starting %s from module:\t%s", name, module)
             try:
-                rtn_data = func(*args, **kwargs)
+                rtn_data = call(*args, **kwargs)
             except Exception as err:
-                logger.critical(pp.pformat(err))
-                raise err
+                logger.critical("%s", _lazy_pformat(err))
+                raise
             else:
                 return rtn_data
             finally:
-                logger.debug(
-                    "Ending %s from module:\t%s",
-                    func.__qualname__,
-                    func.__module__,  # noqa: E501
-                )
+                logger.debug("Ending %s from module:\t%s", name, module)
 
         return log_func_wrapper
 
     return decorator
 
 
-def sol_wrapper(logger):
+def sol_wrapper(
+    logger,
+    stats_report: Optional[str] = None,
+    registry: Optional["StatsRegistry"] = None,
+):
     """
     Wrapper function to provide start and end logging
     for entire solution - meant to only run ONCE.
+
+    Takes in the following:
+        logger          Logger to write to
+        stats_report    STR on exit, log the call statistics recorded by
+                        func_wrapper(profile=True) as a "table" or a "json"
+                        snapshot (default None = no report)
+        registry        StatsRegistry to report on, default call_stats.STATS
+
+    Coroutine functions (e.g. an asyncio.run() entry point) and async
+    generators are wrapped natively, the same as in func_wrapper.
     """
+    if stats_report not in STATS_REPORTS:
+        msg = f"stats_report must be one of {STATS_REPORTS}"
+        raise ValueError(f"{msg}, got {stats_report!r}")
+    if stats_report and registry is None:
+        from src.utils.call_stats import STATS
+
+        registry = STATS
+
+    def log_error(err):
+        # https://stackoverflow.com/a/7787832/10474024
+        # logger.critical(f"""There's been an ERROR!!! Check your logs:
+        # {", ".join([item.baseFilename
+        #             for item in logger.__dict__['parent'].__dict__['handlers']  # noqa: E501
+        #             if item.__class__.__name__ == "FileHandler"])
+        # }""")
+        file_handlers = get_file_handlers(logger)
+        file_names = [h.baseFilename for h in file_handlers]
+        logger.critical(
+            "There's been an ERROR! Check your logs: %s",
+            ", ".join(file_names),  # noqa: E501
+        )
+        logger.debug("%s", _lazy_pformat(err))
+        for ring_handler in get_ring_buffers(logger):
+            dump_path = ring_handler.dump()
+            if dump_path:
+                logger.critical(
+                    "Dumped the last %d records to %s",
+                    len(ring_handler),
+                    dump_path,
+                )
+
+    def log_end():
+        if stats_report == "table":
+            table = registry.format_table()
+            logger.info("Call statistics:\n%s", table)
+        elif stats_report == "json":
+            logger.info("Call statistics: %s", registry.to_json())
+        logger.debug("===== Ending of Logs =====")
 
     def decorator(func):
         """
@@ -187,6 +696,36 @@ def sol_wrapper(logger):
         It logs the start and end of the function execution,
         and handles exceptions by logging them as critical errors.
         """
+        kind = _async_kind(func)
+
+        if kind == CO_ASYNC_GENERATOR:
+
+            @functools.wraps(func)
+            async def log_agen_wrapper(*args, **kwargs):
+                logger.debug("===== Starting of Logs =====")
+                try:
+                    async for item in func(*args, **kwargs):
+                        yield item
+                except Exception as err:
+                    log_error(err)
+                finally:
+                    log_end()
+
+            return log_agen_wrapper
+
+        if kind == CO_COROUTINE:
+
+            @functools.wraps(func)
+            async def log_coro_wrapper(*args, **kwargs):
+                logger.debug("===== Starting of Logs =====")
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as err:
+                    log_error(err)
+                finally:
+                    log_end()
+
+            return log_coro_wrapper
 
         @functools.wraps(func)
         def log_func_wrapper(*args, **kwargs):
@@ -201,26 +740,11 @@ def sol_wrapper(logger):
             try:
                 rtn_data = func(*args, **kwargs)
             except Exception as err:
-                # https://stackoverflow.com/a/7787832/10474024
-                # logger.critical(f"""There's been an ERROR!!! Check your logs:
-                # {", ".join([item.baseFilename
-                #             for item in logger.__dict__['parent'].__dict__['handlers']  # noqa: E501
-                #             if item.__class__.__name__ == "FileHandler"])
-                # }""")
-                file_names = [
-                    h.baseFilename
-                    for h in logger.handlers
-                    if isinstance(h, logging.FileHandler)
-                ]
-                logger.critical(
-                    "There's been an ERROR! Check your logs: %s",
-                    ", ".join(file_names),  # noqa: E501
-                )
-                logger.debug(pp.pformat(err))
+                log_error(err)
             else:
                 return rtn_data
             finally:
-                logger.debug("===== Ending of Logs =====")
+                log_end()
 
         return log_func_wrapper
 
@@ -0,0 +1,229 @@
+"""
+Fixed-size ring buffers of recent log records.
+
+This module provides:
+- BaseRingBufferHandler: the shared interface (lines, clear, dump, len).
+- RingBufferHandler: keeps the last N records in a preallocated list and
+    can return them as LogRecords. Emit stores a slimmed copy of the record,
+    so DEBUG logging can stay on in production; records are formatted when
+    queried or dumped.
+- MmapRingBufferHandler: keeps the last N formatted records in fixed-size
+    slots of a memory-mapped file, so they survive a hard crash (kill -9,
+    segfault) and can be read post-mortem with read_ring_file().
+
+Usage:
+    from src.utils.logger import create_logger
+    logger = create_logger(file_name="my_log", ring_buffer=5000)
+    # sol_wrapper dumps the buffer to logs/my_log_crash.log on an error
+
+Note:
+    - RingBufferHandler merges a record's arguments into its message and
+        renders its traceback when storing it, so buffered records do not
+        keep the arguments, exceptions or stack frames alive.
+    - Records longer than the slot size are truncated by
+        MmapRingBufferHandler.
+"""
+
+import abc
+import copy
+import logging
+import mmap
+import os
+import struct
+from datetime import datetime
+from typing import Optional
+
+# mmap file layout: MAGIC, capacity, slot size, records written, then slots
+MAGIC = b"LOGRING1"
+HEADER = struct.Struct("<8sQQQ")
+
+
+class BaseRingBufferHandler(logging.Handler, abc.ABC):
+    """
+    Interface of the ring buffers: the last `capacity` records, as lines.
+
+    Subclasses must implement emit(), lines() and clear().
+
+    Takes in the following:
+        capacity        INT number of records kept
+        dump_path       STR file dump() appends to by default (None = none)
+    """
+
+    def __init__(self, capacity: int, dump_path: Optional[str] = None):
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1, got {capacity}")
+        super().__init__()
+        self.capacity = capacity
+        self.dump_path = dump_path
+        self._written = 0
+
+    def __len__(self) -> int:
+        return min(self._written, self.capacity)
+
+    @abc.abstractmethod
+    def emit(self, record: logging.LogRecord) -> None:
+        """Store `record`, overwriting the oldest once the buffer is full."""
+
+    @abc.abstractmethod
+    def lines(self) -> list:
+        """Return the buffered records formatted, oldest first."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Drop every buffered record."""
+
+    def dump(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Append the buffered records to `path` (default self.dump_path).
+
+        Returns the path written to, or None if there was nowhere to write.
+        """
+        path = path or self.dump_path
+        if path is None:
+            return None
+        lines = self.lines()
+        stamp = datetime.now().isoformat(timespec="seconds")
+        with open(path, "a", encoding="utf-8") as dump_file:
+            dump_file.write(f"===== Ring buffer dump {stamp}: ")
+            dump_file.write(f"last {len(lines)} records =====\n")
+            for line in lines:
+                dump_file.write(f"{line}\n")
+        return path
+
+
+class RingBufferHandler(BaseRingBufferHandler):
+    """
+    Keep the last `capacity` records in memory.
+
+    Takes in the following:
+        capacity        INT number of records kept
+        dump_path       STR file dump() appends to by default (None = none)
+    """
+
+    def __init__(self, capacity: int, dump_path: Optional[str] = None):
+        super().__init__(capacity, dump_path)
+        self._slots: list = [None] * capacity
+
+    def _detach(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Return `record`, or a copy without its args and exc_info."""
+        if not record.args and not record.exc_info:
+            return record
+        # a copy: the other handlers still see the original record
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            if not record.exc_text:
+                formatter = self.formatter or logging.Formatter()
+                record.exc_text = formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            record = self._detach(record)
+        except Exception:
+            self.handleError(record)
+            return
+        self._slots[self._written % self.capacity] = record
+        self._written += 1
+
+    def records(self, level: int = logging.NOTSET) -> list:
+        """Return the buffered records at `level` or above, oldest first."""
+        with self.lock:
+            slots, capacity = self._slots, self.capacity
+            indexes = range(self._written - len(self), self._written)
+            ordered = [slots[i % capacity] for i in indexes]
+        return [record for record in ordered if record.levelno >= level]
+
+    def lines(self) -> list:
+        return [self.format(record) for record in self.records()]
+
+    def clear(self) -> None:
+        with self.lock:
+            self._slots = [None] * self.capacity
+            self._written = 0
+
+
+class MmapRingBufferHandler(BaseRingBufferHandler):
+    """
+    Keep the last `capacity` formatted records in a memory-mapped file.
+
+    Takes in the following:
+        path            STR file backing the ring (created or reset)
+        capacity        INT number of records kept
+        slot_size       INT bytes per record; longer records are truncated
+        dump_path       STR file dump() appends to by default (None = none)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int,
+        slot_size: int = 512,
+        dump_path: Optional[str] = None,
+    ):
+        super().__init__(capacity, dump_path)
+        self.path = path
+        self.slot_size = slot_size
+        size = HEADER.size + capacity * slot_size
+        with open(path, "wb") as ring_file:
+            ring_file.truncate(size)
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._write_header()
+
+    def _write_header(self) -> None:
+        header = (MAGIC, self.capacity, self.slot_size, self._written)
+        HEADER.pack_into(self._map, 0, *header)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            size = self.slot_size
+            data = self.format(record).encode("utf-8")[:size]
+            offset = HEADER.size + self._written % self.capacity * size
+            self._map.seek(offset)
+            self._map.write(data.ljust(size, b"\0"))
+            self._written += 1
+            self._write_header()
+        except Exception:
+            self.handleError(record)
+
+    def lines(self) -> list:
+        with self.lock:
+            return _read_slots(self._map)
+
+    def clear(self) -> None:
+        with self.lock:
+            self._written = 0
+            self._map.seek(HEADER.size)
+            self._map.write(bytes(len(self._map) - HEADER.size))
+            self._write_header()
+
+    def close(self) -> None:
+        with self.lock:
+            if not self._map.closed:
+                self._map.flush()
+                self._map.close()
+                self._file.close()
+        super().close()
+
+
+def _read_slots(buffer) -> list:
+    magic, capacity, slot_size, written = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("not a log ring file")
+    lines = []
+    for i in range(max(0, written - capacity), written):
+        offset = HEADER.size + i % capacity * slot_size
+        end = offset + slot_size
+        raw = bytes(buffer[offset:end]).rstrip(b"\0")
+        lines.append(raw.decode("utf-8", errors="replace"))
+    return lines
+
+
+def read_ring_file(path: str) -> list:
+    """Return the formatted records saved in an MmapRingBufferHandler file."""
+    if not os.path.getsize(path):
+        return []
+    with open(path, "rb") as ring_file:
+        return _read_slots(ring_file.read())
@@ -0,0 +1,149 @@
+"""
+Unit tests for the call statistics in src/utils/call_stats.py.
+
+Covers the streaming histogram, merging per-thread shards of the registry,
+and profiling through func_wrapper/sol_wrapper.
+
+Tested with unittest and compatible with pytest.
+"""
+
+import json
+import logging
+import threading
+import unittest
+
+from src.utils.call_stats import Histogram, StatsRegistry
+from src.utils.logger import func_wrapper, sol_wrapper
+
+
+def make_logger(name):
+    logger = logging.getLogger(f"{__name__}.{name}")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    if not logger.handlers:
+        logger.addHandler(logging.NullHandler())
+    return logger
+
+
+class TestHistogram(unittest.TestCase):
+    """Bucketing and percentile accuracy."""
+
+    def test_bucket_bounds_contain_value(self):
+        for value in [0, 1, 31, 32, 33, 1000, 123456789]:
+            low, high = Histogram.bucket_bounds(Histogram.bucket_of(value))
+            self.assertLessEqual(low, value)
+            self.assertGreaterEqual(high, value)
+
+    def test_percentiles_within_error(self):
+        histogram = Histogram()
+        for value in range(1, 10001):
+            histogram.add(value * 1000)
+        for pct in (50, 95, 99):
+            expected = pct * 100 * 1000
+            self.assertAlmostEqual(
+                histogram.percentile(pct), expected, delta=expected * 0.04
+            )
+
+    def test_empty(self):
+        self.assertEqual(Histogram().percentile(99), 0)
+
+
+class TestStatsRegistry(unittest.TestCase):
+    """Recording from several threads and exporting snapshots."""
+
+    def test_threads_are_merged(self):
+        registry = StatsRegistry()
+
+        def work():
+            for i in range(1000):
+                registry.record("work", wall_ns=i, cpu_ns=i)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = registry.snapshot()["work"]
+        self.assertEqual(stats["calls"], 4000)
+        self.assertEqual(stats["wall_total_ns"], 4 * sum(range(1000)))
+        self.assertEqual(stats["wall_min_ns"], 0)
+        self.assertEqual(stats["wall_max_ns"], 999)
+
+    def test_exited_threads_are_folded(self):
+        registry = StatsRegistry()
+        for i in range(50):
+            args = ("task", i, i)
+            thread = threading.Thread(target=registry.record, args=args)
+            thread.start()
+            thread.join()
+        registry.record("task", 50, 50)
+
+        stats = registry.snapshot()["task"]
+        self.assertEqual(stats["calls"], 51)
+        self.assertEqual(stats["wall_total_ns"], sum(range(51)))
+        # only the main thread's shard is left
+        self.assertEqual(len(registry._shards), 1)
+
+    def test_exports(self):
+        registry = StatsRegistry()
+        registry.record("fast", 10, 10)
+        registry.record("slow", 5000, 10, failed=True)
+        names = list(json.loads(registry.to_json()))
+        self.assertEqual(names, ["slow", "fast"])
+        table = registry.format_table().splitlines()
+        self.assertEqual(len(table), 4)
+        self.assertTrue(table[2].startswith("slow"))
+
+        registry.reset()
+        self.assertEqual(registry.snapshot(), {})
+
+
+class TestProfiling(unittest.TestCase):
+    """func_wrapper(profile=True) records calls; sol_wrapper reports them."""
+
+    def setUp(self):
+        self.registry = StatsRegistry()
+        self.logger = make_logger(self.id())
+
+    def test_func_wrapper_records_every_call(self):
+        profiled = func_wrapper(
+            self.logger, sample_rate=5, profile=True, registry=self.registry
+        )
+
+        @profiled
+        def maybe_fail(fail):
+            if fail:
+                raise ValueError("fail")
+
+        for _ in range(9):
+            maybe_fail(False)
+        with self.assertRaises(ValueError):
+            maybe_fail(True)
+
+        name = f"{__name__}.{maybe_fail.__qualname__}"
+        stats = self.registry.snapshot()[name]
+        self.assertEqual(stats["calls"], 10)
+        self.assertEqual(stats["errors"], 1)
+
+    def test_sol_wrapper_reports_on_exit(self):
+        @func_wrapper(self.logger, profile=True, registry=self.registry)
+        def step():
+            return 1
+
+        @sol_wrapper(self.logger, stats_report="json", registry=self.registry)
+        def main():
+            return step() + step()
+
+        with self.assertLogs(self.logger, logging.INFO) as logs:
+            self.assertEqual(main(), 2)
+        report = logs.records[-1].getMessage().split(": ", 1)[1]
+        self.assertEqual(list(json.loads(report).values())[0]["calls"], 2)
+
+    def test_invalid_report(self):
+        with self.assertRaises(ValueError):
+            sol_wrapper(self.logger, stats_report="csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
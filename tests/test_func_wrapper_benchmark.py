@@ -0,0 +1,123 @@
+"""
+Micro-benchmark for func_wrapper call overhead.
+
+Compares the per-call cost of:
+- an undecorated function
+- a decorated function whose logger is not enabled for DEBUG (fast path)
+- a decorated function whose logger is enabled for DEBUG
+- a decorated, DEBUG-enabled function sampling 1 in 100 calls
+
+The timing comparison is opt-in, since it takes a few seconds and timings
+can flip on a busy machine: run it with
+`RUN_BENCHMARKS=1 pytest tests/test_func_wrapper_benchmark.py`. It only
+checks the ordering, and shows the per-call table when that fails. The
+other tests check the fast path itself and always run.
+
+Tested with unittest and compatible with pytest.
+"""
+
+import logging
+import os
+import tempfile
+import timeit
+import unittest
+from unittest.mock import patch
+
+from src.utils.logger import create_logger, func_wrapper, shutdown_logger
+
+CALLS = 20000
+RUN_BENCHMARKS = bool(os.environ.get("RUN_BENCHMARKS"))
+
+
+def add(a, b):
+    return a + b
+
+
+def make_logger(name, level):
+    logger = logging.getLogger(f"{__name__}.{name}")
+    logger.setLevel(level)
+    logger.propagate = False
+    if not logger.handlers:
+        logger.addHandler(logging.NullHandler())
+    return logger
+
+
+def per_call_ns(func):
+    best = min(timeit.repeat(lambda: func(1, 2), number=CALLS, repeat=5))
+    return best / CALLS * 1e9
+
+
+class TestFuncWrapperBenchmark(unittest.TestCase):
+    """Relative cost of the func_wrapper fast and slow paths."""
+
+    @unittest.skipUnless(RUN_BENCHMARKS, "set RUN_BENCHMARKS=1 to run")
+    def test_call_overhead(self):
+        disabled = make_logger("disabled", logging.INFO)
+        enabled = make_logger("enabled", logging.DEBUG)
+        timings = {
+            "undecorated": per_call_ns(add),
+            "decorated, DEBUG off": per_call_ns(func_wrapper(disabled)(add)),
+            "decorated, DEBUG on": per_call_ns(func_wrapper(enabled)(add)),
+            "decorated, 1 in 100": per_call_ns(
+                func_wrapper(enabled, sample_rate=100)(add)
+            ),
+        }
+        table = "\n".join(
+            f"{label:<22} {ns:10.1f} ns/call" for label, ns in timings.items()
+        )
+
+        slow = timings["decorated, DEBUG on"]
+        self.assertLess(timings["decorated, DEBUG off"], slow, table)
+        self.assertLess(timings["decorated, 1 in 100"], slow, table)
+
+    def test_create_logger_takes_fast_path(self):
+        with tempfile.TemporaryDirectory() as log_loc:
+            logger = create_logger(
+                file_name="fast_path",
+                log_loc=log_loc,
+                file_lvl=logging.INFO,
+                console_lvl=logging.WARNING,
+            )
+            try:
+                self.assertEqual(logger.level, logging.INFO)
+                wrapped = func_wrapper(logger)(add)
+                with patch.object(logger, "debug") as debug:
+                    wrapped(1, 2)
+                debug.assert_not_called()
+            finally:
+                shutdown_logger(logger)
+
+    def test_create_logger_with_ring_buffer_keeps_debug(self):
+        with tempfile.TemporaryDirectory() as log_loc:
+            logger = create_logger(
+                file_name="fast_path_ring",
+                log_loc=log_loc,
+                file_lvl=logging.INFO,
+                console_lvl=logging.WARNING,
+                ring_buffer=10,
+            )
+            self.assertEqual(logger.level, logging.DEBUG)
+            shutdown_logger(logger)
+
+    def test_sampling_logs_one_in_n(self):
+        logger = make_logger("sampled", logging.DEBUG)
+        with self.assertLogs(logger, logging.DEBUG) as logs:
+            wrapped = func_wrapper(logger, sample_rate=10)(add)
+            for _ in range(30):
+                wrapped(1, 2)
+        self.assertEqual(len(logs.records), 6)
+
+    def test_disabled_still_logs_exceptions(self):
+        logger = make_logger("errors", logging.INFO)
+
+        @func_wrapper(logger)
+        def boom():
+            raise KeyError("missing")
+
+        with self.assertLogs(logger, logging.CRITICAL):
+            with self.assertRaises(KeyError):
+                boom()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Unit tests for the JSON log formatter in src/utils/json_formatter.py.
+
+Covers the record layout (static, extra and exception fields, UTC
+timestamps), deferred evaluation of Lazy arguments, the per-second
+timestamp cache, the stdlib encoder fallback and merging JSON lines written
+by several processes.
+
+Tested with unittest and compatible with pytest.
+"""
+
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from src.utils import json_formatter
+from src.utils.json_formatter import JsonFormatter, Lazy
+from src.utils.log_merge import merge_worker_logs
+
+
+class TestJsonFormatter(unittest.TestCase):
+    """Records are single JSON lines carrying static and extra fields."""
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        handler = logging.StreamHandler(self.stream)
+        handler.setFormatter(JsonFormatter("garden", {"env": "test"}))
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.addHandler(handler)
+
+    def records(self):
+        lines = self.stream.getvalue().splitlines()
+        return [json.loads(line) for line in lines]
+
+    def test_fields(self):
+        self.logger.info("planted %d", 3, extra={"plant_id": 7})
+        (record,) = self.records()
+        self.assertEqual(list(record)[0], "ts")
+        self.assertEqual(record["msg"], "planted 3")
+        self.assertEqual(record["level"], "INFO")
+        self.assertEqual(record["plant_id"], 7)
+        self.assertEqual(record["app"], "garden")
+        self.assertEqual(record["env"], "test")
+        self.assertEqual(record["pid"], os.getpid())
+        self.assertIn("host", record)
+
+    def test_ts_is_utc(self):
+        record = logging.makeLogRecord({"created": 86400.25, "msecs": 250})
+        encoded = json.loads(JsonFormatter().format(record))
+        self.assertEqual(encoded["ts"], "1970-01-02T00:00:00.250Z")
+
+    def test_extra_keeps_fields_named_like_static_ones(self):
+        extra = {"host": "db-1", "app": "worker", "level": "custom"}
+        self.logger.info("moved", extra=extra)
+        line = self.stream.getvalue()
+        self.assertEqual(line.count('"host":'), 1)
+        (record,) = self.records()
+        self.assertEqual(record["app"], "garden")
+        self.assertEqual(record["level"], "INFO")
+        self.assertEqual(record["extra_host"], "db-1")
+        self.assertEqual(record["extra_app"], "worker")
+        self.assertEqual(record["extra_level"], "custom")
+
+    def test_exception(self):
+        try:
+            raise KeyError("missing")
+        except KeyError:
+            self.logger.exception("lookup failed")
+        (record,) = self.records()
+        self.assertIn("KeyError: 'missing'", record["exc"])
+
+    def test_lazy_only_runs_when_emitted(self):
+        calls = []
+
+        def expensive(value):
+            calls.append(value)
+            return f"<{value}>"
+
+        self.logger.debug("%s", Lazy(expensive, "skipped"))
+        self.assertEqual(calls, [])
+        extra = {"x": Lazy(str, 1)}
+        self.logger.info("%s", Lazy(expensive, "kept"), extra=extra)
+        self.assertEqual(calls, ["kept"])
+        (record,) = self.records()
+        self.assertEqual((record["msg"], record["x"]), ("<kept>", "1"))
+
+    def test_time_cache_survives_interleaved_calls(self):
+        formatter = JsonFormatter()
+        early = logging.makeLogRecord({"created": 100.0, "msecs": 0})
+        late = logging.makeLogRecord({"created": 200.0, "msecs": 0})
+        interrupted = []
+
+        def converter(second):
+            # another thread formats a later record mid-way through strftime
+            if second == 100 and not interrupted:
+                interrupted.append(formatter.formatTime(late))
+            return time.gmtime(second)
+
+        formatter.converter = converter
+        early_text = formatter.formatTime(early)
+        self.assertEqual(early_text, "1970-01-01T00:01:40.000Z")
+        self.assertEqual(interrupted, ["1970-01-01T00:03:20.000Z"])
+        self.assertEqual(formatter.formatTime(late), interrupted[0])
+
+    def test_stdlib_fallback_is_compact(self):
+        data = {"a": 1, "b": [1, 2], "c": object}
+        with patch.object(json_formatter, "orjson", None):
+            encoded = json_formatter.dumps(data)
+        self.assertEqual(json.loads(encoded)["b"], [1, 2])
+        self.assertNotIn(" ", encoded.split("class")[0])
+
+
+class TestMergeJsonLines(unittest.TestCase):
+    """log_merge orders JSON lines from several processes by "ts"."""
+
+    def test_merge(self):
+        with tempfile.TemporaryDirectory() as log_loc:
+            lines = {
+                11: ["12:00:00.100", "12:00:00.300"],
+                22: ["12:00:00.200", "12:00:00.400"],
+            }
+            for pid, stamps in lines.items():
+                path = os.path.join(log_loc, f"app.{pid}.log")
+                with open(path, "w", encoding="utf-8") as log_file:
+                    for stamp in stamps:
+                        record = {"ts": f"2025-01-01T{stamp}Z", "pid": pid}
+                        log_file.write(json.dumps(record) + "\n")
+
+            merged_path = os.path.join(log_loc, "merged.log")
+            template_path = os.path.join(log_loc, "app.log")
+            self.assertEqual(merge_worker_logs(template_path, merged_path), 4)
+            with open(merged_path, encoding="utf-8") as merged:
+                pids = [json.loads(line)["pid"] for line in merged]
+            self.assertEqual(pids, [11, 22, 11, 22])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+Unit tests for the log analytics CLI in src/utils/log_stats.py.
+
+Covers Starting/Ending pairing (durations, nesting, errors), rotated backups
+read oldest first, JSON lines, and logs written by a real create_logger.
+
+Tested with unittest and compatible with pytest.
+"""
+
+import contextlib
+import io
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from src.utils.log_stats import LogStats, log_files, main
+from src.utils.logger import create_logger, func_wrapper, shutdown_logger
+
+WRAPPER = "logger.py       log_func_wrapper  "
+
+
+def line(clock, level, message, func=WRAPPER):
+    return f"2025-01-01 {clock} {func} {level:<8} {message}\n"
+
+
+class TestLogStats(unittest.TestCase):
+    """Statistics from hand-written log lines."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "app.log")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, path, lines):
+        with open(path, "w", encoding="utf-8") as log_file:
+            log_file.writelines(lines)
+
+    def test_pairs_nesting_and_errors(self):
+        self.write(
+            self.path,
+            [
+                line("12:00:00", "DEBUG", "Starting outer from module:\tm"),
+                line("12:00:01", "DEBUG", "Starting inner from module:\tm"),
+                line("12:00:03", "CRITICAL", "KeyError('x')"),
+                "Traceback (most recent call last):\n",
+                line("12:00:03", "DEBUG", "Ending inner from module:\tm"),
+                line("12:00:04", "INFO", "plain", func="tmp.py main"),
+                line("12:00:05", "DEBUG", "Ending outer from module:\tm"),
+            ],
+        )
+        stats = LogStats()
+        stats.add_file(self.path)
+        snapshot = stats.snapshot()
+        inner = snapshot["functions"]["inner"]
+        outer = snapshot["functions"]["outer"]
+        self.assertEqual(list(snapshot["functions"]), ["outer", "inner"])
+        self.assertEqual((inner["calls"], inner["errors"]), (1, 1))
+        self.assertEqual((outer["calls"], outer["errors"]), (1, 0))
+        self.assertEqual(inner["wall_max_ns"], 2_000_000_000)
+        self.assertEqual(outer["wall_max_ns"], 5_000_000_000)
+        self.assertEqual(snapshot["levels"]["CRITICAL"], 1)
+        self.assertEqual(snapshot["unparsed"], 1)
+
+    def test_backups_read_oldest_first(self):
+        self.write(
+            f"{self.path}.2",
+            [line("12:00:00", "DEBUG", "Starting f from module:\tm")],
+        )
+        self.write(f"{self.path}.1", [])
+        ending = line("12:00:02", "DEBUG", "Ending f from module:\tm")
+        self.write(self.path, [ending])
+        expected = [f"{self.path}.2", f"{self.path}.1", self.path]
+        self.assertEqual(log_files(self.path), expected)
+
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            main([self.path, "--json"])
+        function = json.loads(stdout.getvalue())["functions"]["f"]
+        self.assertEqual(function["completed"], 1)
+        self.assertEqual(function["wall_total_ns"], 2_000_000_000)
+
+    def test_json_lines(self):
+        records = [
+            ("12:00:00.250", "Starting f from module:\tm"),
+            ("12:00:00.750", "Ending f from module:\tm"),
+        ]
+        self.write(
+            self.path,
+            [
+                json.dumps(
+                    {
+                        "ts": f"2025-01-01T{clock}",
+                        "level": "DEBUG",
+                        "func": "log_func_wrapper",
+                        "msg": msg,
+                        "pid": 1,
+                    }
+                )
+                + "\n"
+                for clock, msg in records
+            ],
+        )
+        stats = LogStats()
+        stats.add_file(self.path)
+        function = stats.snapshot()["functions"]["f"]
+        self.assertEqual(function["wall_total_ns"], 500_000_000)
+
+
+class TestLogStatsOnRealLogs(unittest.TestCase):
+    """Files written by create_logger(process_safe=True) parse fully."""
+
+    def test_process_safe_log(self):
+        with tempfile.TemporaryDirectory() as log_loc:
+            logger = create_logger(
+                file_name="stats",
+                log_loc=log_loc,
+                console_lvl=logging.CRITICAL + 1,
+                process_safe=True,
+            )
+
+            @func_wrapper(logger)
+            def fails():
+                raise ValueError("nope")
+
+            @func_wrapper(logger)
+            def works():
+                with contextlib.suppress(ValueError):
+                    fails()
+
+            for _ in range(3):
+                works()
+            shutdown_logger(logger)
+
+            stats = LogStats()
+            for name in os.listdir(log_loc):
+                stats.add_file(os.path.join(log_loc, name))
+        functions = stats.snapshot()["functions"]
+        works_name = [name for name in functions if name.endswith("works")]
+        fails_name = [name for name in functions if name.endswith("fails")]
+        self.assertEqual(functions[works_name[0]]["errors"], 0)
+        self.assertEqual(functions[fails_name[0]]["calls"], 3)
+        self.assertEqual(functions[fails_name[0]]["error_rate"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
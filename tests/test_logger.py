@@ -0,0 +1,244 @@
+"""
+Unit tests for the logger utility in src/utils/logger.py.
+
+Covers the async (QueueHandler/QueueListener) mode: overflow policies of the
+bounded queue and flushing queued records on shutdown, func_wrapper /
+sol_wrapper applied to coroutine functions and async generators, and the
+create_logger cache (separate loggers per configuration, LRU eviction,
+midnight rollover).
+
+Tested with unittest and compatible with pytest.
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import queue
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from src.utils import logger as logger_module
+from src.utils.logger import (
+    BoundedQueueHandler,
+    DatedRotatingFileHandler,
+    FlushingQueueListener,
+    create_logger,
+    func_wrapper,
+    shutdown_logger,
+    sol_wrapper,
+)
+from src.utils.call_stats import StatsRegistry
+
+
+def make_record(level=logging.INFO, msg="message"):
+    return logging.LogRecord("test", level, __file__, 1, msg, None, None)
+
+
+class TestBoundedQueueHandler(unittest.TestCase):
+    """Overflow policies, exercised without a running listener."""
+
+    def test_invalid_overflow(self):
+        with self.assertRaises(ValueError):
+            BoundedQueueHandler(queue.Queue(maxsize=1), overflow="explode")
+
+    def test_drop_oldest_keeps_newest_records(self):
+        handler = BoundedQueueHandler(queue.Queue(maxsize=2), "drop-oldest")
+        for i in range(5):
+            handler.handle(make_record(msg=f"record {i}"))
+        kept = [handler.queue.get_nowait().msg for _ in range(2)]
+        self.assertEqual(kept, ["record 3", "record 4"])
+        self.assertEqual(handler.dropped, 3)
+
+    def test_drop_debug_discards_only_debug(self):
+        handler = BoundedQueueHandler(queue.Queue(maxsize=1), "drop-debug")
+        handler.handle(make_record(logging.WARNING, "kept"))
+        handler.handle(make_record(logging.DEBUG, "dropped"))
+        self.assertEqual(handler.dropped, 1)
+        self.assertEqual(handler.queue.get_nowait().msg, "kept")
+
+
+class TestAsyncLogging(unittest.TestCase):
+    """Records reach the listener's handlers and are flushed on shutdown."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmp_dir.name, "async.log")
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+
+    def tearDown(self):
+        shutdown_logger(self.logger)
+        self.tmp_dir.cleanup()
+
+    def test_shutdown_flushes_queued_records(self):
+        file_handler = logging.FileHandler(self.log_path, encoding="utf-8")
+        handler = BoundedQueueHandler(queue.Queue(maxsize=10), "block")
+        handler.listener = FlushingQueueListener(handler.queue, file_handler)
+        handler.listener.start()
+        self.logger.addHandler(handler)
+
+        for i in range(100):
+            self.logger.info("line %d", i)
+        shutdown_logger(self.logger)
+
+        with open(self.log_path, encoding="utf-8") as log_file:
+            lines = log_file.read().splitlines()
+        self.assertEqual(lines, [f"line {i}" for i in range(100)])
+        self.assertIsNone(handler.listener)
+
+
+class TestAsyncWrappers(unittest.IsolatedAsyncioTestCase):
+    """Decorated coroutines log "Ending" and errors after they have run."""
+
+    def setUp(self):
+        self.logger = logging.getLogger(f"{__name__}.{self.id()}")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+
+    def messages(self, logs):
+        return [record.getMessage().split(" from")[0] for record in logs]
+
+    async def test_coroutine_logs_after_await(self):
+        registry = StatsRegistry()
+
+        @func_wrapper(self.logger, profile=True, registry=registry)
+        async def fetch():
+            self.logger.info("inside")
+            await asyncio.sleep(0.01)
+            return 42
+
+        self.assertTrue(inspect.iscoroutinefunction(fetch))
+        with self.assertLogs(self.logger, logging.DEBUG) as logs:
+            self.assertEqual(await fetch(), 42)
+        messages = self.messages(logs.records)
+        self.assertEqual(messages[1], "inside")
+        self.assertTrue(messages[2].startswith("Ending"))
+        stats = list(registry.snapshot().values())[0]
+        self.assertGreaterEqual(stats["wall_total_ns"], 10_000_000)
+
+    async def test_coroutine_exception_is_logged(self):
+        @func_wrapper(self.logger)
+        async def broken():
+            await asyncio.sleep(0)
+            raise KeyError("missing")
+
+        with self.assertLogs(self.logger, logging.CRITICAL):
+            with self.assertRaises(KeyError):
+                await broken()
+
+    async def test_async_generator(self):
+        @func_wrapper(self.logger)
+        async def numbers():
+            for i in range(3):
+                await asyncio.sleep(0)
+                self.logger.info("yield %d", i)
+                yield i
+
+        with self.assertLogs(self.logger, logging.DEBUG) as logs:
+            self.assertEqual([i async for i in numbers()], [0, 1, 2])
+        messages = self.messages(logs.records)
+        self.assertEqual(len(messages), 5)
+        self.assertTrue(messages[-1].startswith("Ending"))
+
+    async def test_sol_wrapper_swallows_and_ends_once(self):
+        @sol_wrapper(self.logger)
+        async def main():
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        with self.assertLogs(self.logger, logging.DEBUG) as logs:
+            self.assertIsNone(await main())
+        messages = [record.getMessage() for record in logs.records]
+        self.assertEqual(messages[0], "===== Starting of Logs =====")
+        self.assertEqual(messages[-1], "===== Ending of Logs =====")
+        self.assertEqual(logs.records[1].levelno, logging.CRITICAL)
+
+
+class TestLoggerCache(unittest.TestCase):
+    """create_logger keeps configurations apart and bounds its cache."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_loc = self.tmp_dir.name
+
+    def tearDown(self):
+        for key in list(logger_module._logger_cache):
+            if key[4] == self.log_loc:
+                logger = logger_module._logger_cache.pop(key)
+                shutdown_logger(logger)
+        self.tmp_dir.cleanup()
+
+    def make(self, file_name, **kwargs):
+        kwargs.setdefault("console_lvl", logging.CRITICAL)
+        kwargs.setdefault("log_loc", self.log_loc)
+        return create_logger(file_name=file_name, **kwargs)
+
+    def test_distinct_configurations_get_distinct_files(self):
+        first, second = self.make("first"), self.make("second")
+        self.assertIsNot(first, second)
+        self.assertIs(self.make("first"), first)
+        first.info("to first")
+        second.info("to second")
+        files = sorted(os.listdir(self.log_loc))
+        self.assertEqual(
+            files, [f"{date.today()}_first.log", f"{date.today()}_second.log"]
+        )
+
+    def test_lru_eviction_closes_handlers(self):
+        with patch.object(logger_module, "LOGGER_CACHE_SIZE", 2):
+            oldest = self.make("oldest")
+            handler = oldest.handlers[0]
+            self.assertIsNotNone(handler.stream)
+            self.make("middle")
+            self.make("oldest")  # refreshes "oldest"
+            self.make("newest")  # evicts "middle"
+            self.assertTrue(oldest.handlers)
+            del oldest
+            self.make("latest")  # evicts "oldest"
+        self.assertIsNone(handler.stream)
+
+    def test_eviction_keeps_held_loggers_open(self):
+        with patch.object(logger_module, "LOGGER_CACHE_SIZE", 1):
+            held = self.make("held")
+            self.make("other")  # evicts "held"
+        self.assertTrue(held.handlers)
+        held.warning("still logged")
+        shutdown_logger(held)
+        log_path = os.path.join(self.log_loc, f"{date.today()}_held.log")
+        with open(log_path, encoding="utf-8") as log_file:
+            self.assertIn("still logged", log_file.read())
+
+    def test_deferred_setup_on_first_record(self):
+        self.log_loc = os.path.join(self.tmp_dir.name, "deferred")
+        logger = self.make("lazy", deferred=True)
+        self.assertFalse(os.path.exists(self.log_loc))
+        logger.warning("first")
+        logger.warning("second")
+        shutdown_logger(logger)
+        log_path = os.path.join(self.log_loc, f"{date.today()}_lazy.log")
+        with open(log_path, encoding="utf-8") as log_file:
+            lines = log_file.read().splitlines()
+        messages = [line.split()[-1] for line in lines]
+        self.assertEqual(messages, ["first", "second"])
+
+    def test_midnight_rollover(self):
+        handler = DatedRotatingFileHandler(self.log_loc, "daily", delay=True)
+        try:
+            record = logging.LogRecord(
+                "test", logging.INFO, __file__, 1, "late", None, None
+            )
+            record.created = handler.rollover_at + 1
+            handler.emit(record)
+        finally:
+            handler.close()
+        tomorrow = date.today() + timedelta(days=1)
+        self.assertEqual(os.listdir(self.log_loc), [f"{tomorrow}_daily.log"])
+        self.assertEqual(handler.day, tomorrow)
+
+
+if __name__ == "__main__":
+    unittest.main()
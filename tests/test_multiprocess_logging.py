@@ -0,0 +1,142 @@
+"""
+Stress tests for process-safe logging (create_logger(process_safe=True)).
+
+Several processes hammer the same log name at once; after merging the
+per-process files with src.utils.log_merge, every line must be present,
+exactly once, and in each worker's own order. Covers both workers that
+configure their own logger (spawn) and workers inheriting the parent's
+handler across fork() (gunicorn --preload).
+
+Tested with unittest and compatible with pytest.
+"""
+
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import unittest
+from datetime import date
+
+from src.utils.log_merge import merge_worker_logs, worker_files
+from src.utils.logger import (
+    PerProcessRotatingFileHandler,
+    create_logger,
+    shutdown_logger,
+)
+
+WORKERS = 4
+# ~110 bytes per line, so each worker rotates its 1MB file at least once
+LINES = 12000
+LINE = re.compile(r"worker (\d+) line (\d+)$")
+
+
+def spawned_worker(log_loc, lines):
+    logger = create_logger(
+        file_name="stress",
+        log_loc=log_loc,
+        console_lvl=logging.CRITICAL,
+        process_safe=True,
+    )
+    for i in range(lines):
+        logger.info("worker %d line %d", os.getpid(), i)
+    shutdown_logger(logger)
+
+
+def forked_worker(logger_name, lines):
+    logger = logging.getLogger(logger_name)
+    for i in range(lines):
+        logger.info("worker %d line %d", os.getpid(), i)
+    for handler in logger.handlers:
+        handler.close()
+
+
+class TestProcessSafeLogging(unittest.TestCase):
+    """No lines lost or duplicated when N processes share a log name."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_loc = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def run_workers(self, context, target, args):
+        processes = []
+        for _ in range(WORKERS):
+            processes.append(context.Process(target=target, args=args))
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=120)
+            self.assertEqual(process.exitcode, 0)
+        return {process.pid for process in processes}
+
+    def assert_merged(self, template_path, pids, lines):
+        self.assertEqual(set(worker_files(template_path)), pids)
+        merged_path = os.path.join(self.log_loc, "merged.log")
+        count = merge_worker_logs(template_path, merged_path)
+        self.assertEqual(count, len(pids) * lines)
+
+        seen = {pid: [] for pid in pids}
+        with open(merged_path, encoding="utf-8") as merged:
+            for line in merged:
+                match = LINE.search(line.rstrip("\n"))
+                self.assertIsNotNone(match, line)
+                seen[int(match.group(1))].append(int(match.group(2)))
+        for pid in pids:
+            self.assertEqual(seen[pid], list(range(lines)))
+
+    def test_spawned_workers(self):
+        context = multiprocessing.get_context("spawn")
+        args = (self.log_loc, LINES)
+        pids = self.run_workers(context, spawned_worker, args)
+        today = date.today()
+        template_path = os.path.join(self.log_loc, f"{today}_stress.log")
+        rotated = [
+            path
+            for paths in worker_files(template_path).values()
+            for path in paths
+            if not path.endswith(".log")
+        ]
+        self.assertTrue(rotated, "expected the workers to rotate")
+        self.assert_merged(template_path, pids, LINES)
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "needs fork()"
+    )
+    def test_forked_workers_share_parent_handler(self):
+        handler = PerProcessRotatingFileHandler(
+            self.log_loc, "forked", maxBytes=64 * 1024, backupCount=1000
+        )
+        template_path = os.path.join(self.log_loc, f"{handler.day}_forked.log")
+        handler.setFormatter(
+            logging.Formatter(
+                "%(asctime)s.%(msecs)03d %(message)s",
+                datefmt="%Y-%m-%d %H:%M:%S",
+            )
+        )
+        logger = logging.getLogger(f"{__name__}.{self.id()}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+        # the parent writes before forking, as a --preload master would
+        logger.info("worker %d line %d", os.getpid(), 0)
+        try:
+            context = multiprocessing.get_context("fork")
+            args = (logger.name, 2000)
+            pids = self.run_workers(context, forked_worker, args)
+        finally:
+            shutdown_logger(logger)
+
+        self.assertIn(os.getpid(), worker_files(template_path))
+        # the parent's own file keeps only the parent's line
+        parent_path = handler.path_for(handler.day)
+        with open(parent_path, encoding="utf-8") as parent_file:
+            self.assertEqual(len(parent_file.readlines()), 1)
+        os.remove(parent_path)
+        self.assert_merged(template_path, pids, 2000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+Unit tests for the ring-buffer log handlers in src/utils/ring_buffer.py.
+
+Covers wrap-around and querying of the in-memory buffer, the mmap'd buffer
+read back post-mortem, and sol_wrapper dumping the buffer on an error.
+
+Tested with unittest and compatible with pytest.
+"""
+
+import logging
+import os
+import tempfile
+import unittest
+
+from src.utils.logger import create_logger, shutdown_logger, sol_wrapper
+from src.utils.ring_buffer import (
+    BaseRingBufferHandler,
+    MmapRingBufferHandler,
+    RingBufferHandler,
+    read_ring_file,
+)
+
+
+def make_logger(name, handler):
+    logger = logging.getLogger(f"{__name__}.{name}")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.addHandler(handler)
+    return logger
+
+
+class TestRingBufferHandler(unittest.TestCase):
+    """Only the last N records are kept, oldest first."""
+
+    def setUp(self):
+        self.handler = RingBufferHandler(3)
+        self.logger = make_logger(self.id(), self.handler)
+
+    def tearDown(self):
+        shutdown_logger(self.logger)
+
+    def test_wraps_around(self):
+        for i in range(5):
+            self.logger.debug("record %d", i)
+        self.assertEqual(len(self.handler), 3)
+        expected = ["record 2", "record 3", "record 4"]
+        self.assertEqual(self.handler.lines(), expected)
+
+    def test_query_by_level(self):
+        self.logger.debug("quiet")
+        self.logger.error("loud")
+        errors = self.handler.records(logging.ERROR)
+        self.assertEqual([r.getMessage() for r in errors], ["loud"])
+
+        self.handler.clear()
+        self.assertEqual(self.handler.records(), [])
+
+    def test_stored_records_drop_args_and_exc_info(self):
+        seen = []
+        other = logging.Handler()
+        other.emit = seen.append
+        self.logger.addHandler(other)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            self.logger.exception("failed on %s", [1, 2])
+        (stored,) = self.handler.records()
+        self.assertEqual((stored.msg, stored.args), ("failed on [1, 2]", None))
+        self.assertIsNone(stored.exc_info)
+        self.assertIn("ValueError: boom", self.handler.lines()[0])
+        # other handlers still get the original record
+        self.assertIsNotNone(seen[0].exc_info)
+        self.assertEqual(seen[0].args, ([1, 2],))
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            RingBufferHandler(0)
+
+
+class TestMmapRingBufferHandler(unittest.TestCase):
+    """Formatted records live in the mapped file and survive the process."""
+
+    def test_read_back(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "ring.bin")
+            handler = MmapRingBufferHandler(path, capacity=4, slot_size=16)
+            logger = make_logger(self.id(), handler)
+            for i in range(6):
+                logger.info("record %d", i)
+            logger.info("a much longer record than the slot")
+            # readable while the handler is still open, as after a crash
+            expected = ["record 3", "record 4", "record 5", "a much longer re"]
+            self.assertEqual(read_ring_file(path), expected)
+            shutdown_logger(logger)
+            self.assertEqual(read_ring_file(path), expected)
+            self.assertIsInstance(handler, BaseRingBufferHandler)
+            self.assertFalse(hasattr(handler, "records"))
+
+    def test_incomplete_subclass_fails_on_instantiation(self):
+        class NoLines(BaseRingBufferHandler):
+            def emit(self, record):
+                self._written += 1
+
+            def clear(self):
+                self._written = 0
+
+        with self.assertRaises(TypeError):
+            NoLines(capacity=4)
+
+
+class TestCrashDump(unittest.TestCase):
+    """sol_wrapper writes the ring buffer out when the solution fails."""
+
+    def test_sol_wrapper_dumps_on_error(self):
+        with tempfile.TemporaryDirectory() as log_loc:
+            logger = create_logger(
+                file_name="ring",
+                file_lvl=logging.ERROR,
+                console_lvl=logging.CRITICAL + 1,
+                log_loc=log_loc,
+                ring_buffer=50,
+            )
+
+            @sol_wrapper(logger)
+            def main():
+                logger.debug("context before the failure")
+                raise RuntimeError("boom")
+
+            main()
+            shutdown_logger(logger)
+            dump_path = os.path.join(log_loc, "ring_crash.log")
+            with open(dump_path, encoding="utf-8") as dump_file:
+                dump = dump_file.read()
+        self.assertIn("Ring buffer dump", dump)
+        self.assertIn("context before the failure", dump)
+        self.assertIn("RuntimeError('boom')", dump)
+
+
+if __name__ == "__main__":
+    unittest.main()
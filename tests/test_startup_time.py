@@ -0,0 +1,68 @@
+"""
+Startup-time regression tests for the entry points (main.py, src.tmp).
+
+Each entry point is imported in a fresh interpreter and the modules it
+pulled in are checked, rather than wall-clock import time: a heavy import
+creeping in (pandas, Django, an eager logger setup) shows up as a module in
+sys.modules on any machine, however loaded the CI runner is.
+
+Tested with unittest and compatible with pytest.
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = ("main", "src.tmp")
+
+# modules no entry point may import at startup
+HEAVY_MODULES = ("pandas", "numpy", "django", "logging.handlers")
+
+# modules src.tmp must not import until they are needed
+DEFERRED_MODULES = ("pprint", "logging.handlers", "inspect", "queue", "socket")
+
+
+def run_python(*args):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def loaded_after_import(module, candidates):
+    """Return which of `candidates` importing `module` loads."""
+    code = (
+        f"import sys, {module}; "
+        f"print([m for m in {candidates!r} if m in sys.modules])"
+    )
+    return run_python("-c", code).stdout.strip()
+
+
+class TestStartupTime(unittest.TestCase):
+    """Importing an entry point stays cheap."""
+
+    def test_entry_points_skip_heavy_imports(self):
+        for module in ENTRY_POINTS:
+            with self.subTest(module=module):
+                loaded = loaded_after_import(module, HEAVY_MODULES)
+                self.assertEqual(loaded, "[]")
+
+    def test_tmp_defers_logger_setup(self):
+        code = (
+            "import sys, src.tmp; "
+            f"print([m for m in {DEFERRED_MODULES!r} if m in sys.modules]); "
+            "print([type(h).__name__ for h in src.tmp.log_obj.handlers])"
+        )
+        loaded, handlers = run_python("-c", code).stdout.splitlines()
+        self.assertEqual(loaded, "[]")
+        self.assertEqual(handlers, "['DeferredSetupHandler']")
+
+
+if __name__ == "__main__":
+    unittest.main()